@@ -0,0 +1,140 @@
+import numpy as np
+
+# Column order of the state array. Matches initialize_attributes() and the
+# feature order the model was trained on.
+ATTRIBUTES = [
+    "Battery_Level",
+    "Battery_Health",
+    "Signal_Strength",
+    "Power_Consumption_Rate",
+    "Component_Health",
+    "CPU_GPU_Usage",
+    "Solar_Panel_Efficiency",
+    "Temperature",
+    "Data_Storage_Used",
+    "Debris_Risk_Level"
+]
+
+BATTERY_LEVEL = 0
+BATTERY_HEALTH = 1
+SIGNAL_STRENGTH = 2
+POWER_CONSUMPTION_RATE = 3
+COMPONENT_HEALTH = 4
+CPU_GPU_USAGE = 5
+SOLAR_PANEL_EFFICIENCY = 6
+TEMPERATURE = 7
+DATA_STORAGE_USED = 8
+DEBRIS_RISK_LEVEL = 9
+
+events = [
+    "Battery Drain",
+    "Overheating",
+    "Solar Panel Misalignment",
+    "Signal Interference",
+    "Data Storage Overload",
+    "Component Wear",
+    "Thruster Misfire",
+    "Debris Near Miss",
+    "Debris Collision",
+    "Solar Storm"
+]
+
+
+def _event_row(**changes):
+    row = np.zeros(len(ATTRIBUTES))
+    for name, delta in changes.items():
+        row[ATTRIBUTES.index(name)] = delta
+    return row
+
+# One row per event (same order as `events`), one column per attribute.
+# Direct and secondary effects, same deltas as mainfuncUsingPandas.apply_event.
+EVENT_DELTAS = np.array([
+    _event_row(Battery_Level=-12, Battery_Health=-2,
+               Power_Consumption_Rate=3, CPU_GPU_Usage=5),  # Battery Drain
+    _event_row(Temperature=15, Battery_Level=-5, Power_Consumption_Rate=8,
+               CPU_GPU_Usage=7, Component_Health=-3),  # Overheating
+    _event_row(Solar_Panel_Efficiency=-18, Battery_Level=-8,
+               Power_Consumption_Rate=4, CPU_GPU_Usage=6),  # Solar Panel Misalignment
+    _event_row(Signal_Strength=-25, CPU_GPU_Usage=12,
+               Power_Consumption_Rate=7, Battery_Level=-4),  # Signal Interference
+    _event_row(Data_Storage_Used=25, CPU_GPU_Usage=15, Power_Consumption_Rate=8,
+               Battery_Level=-5, Temperature=4),  # Data Storage Overload
+    _event_row(Component_Health=-8, Power_Consumption_Rate=6, CPU_GPU_Usage=7,
+               Battery_Level=-3, Temperature=3),  # Component Wear
+    _event_row(Component_Health=-12, Temperature=8, Power_Consumption_Rate=10,
+               Battery_Level=-7, CPU_GPU_Usage=9),  # Thruster Misfire
+    _event_row(Debris_Risk_Level=15, CPU_GPU_Usage=14,
+               Power_Consumption_Rate=8, Battery_Level=-5),  # Debris Near Miss
+    _event_row(Component_Health=-18, Solar_Panel_Efficiency=-15, Temperature=6,
+               Debris_Risk_Level=20, Battery_Level=-12, Power_Consumption_Rate=12,
+               CPU_GPU_Usage=15, Signal_Strength=-10),  # Debris Collision
+    _event_row(Signal_Strength=-20, Temperature=12, Solar_Panel_Efficiency=5,
+               Battery_Health=-3, Component_Health=-5, Battery_Level=-8,
+               Power_Consumption_Rate=10, CPU_GPU_Usage=12),  # Solar Storm
+])
+
+# Boundaries enforced after every event
+LOWER_BOUNDS = np.zeros(len(ATTRIBUTES))
+LOWER_BOUNDS[TEMPERATURE] = -50
+UPPER_BOUNDS = np.full(len(ATTRIBUTES), 100.0)
+
+
+def initialize_batch(num_satellites, rng=None):
+    """
+    Returns an (num_satellites, 10) array of fresh satellites, one row per
+    satellite, built the same way as initialize_attributes().
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # Independent Attributes (Set to Good Condition)
+    battery_health = 90.00  # %
+    solar_panel_efficiency = 85.00  # %
+    temperature = 25.00  # °C
+    signal_strength = 80.00  # %
+    component_health = 90.00  # %
+
+    # Derived Attributes (Using Formulas)
+    battery_level = min(100, solar_panel_efficiency - (100 - battery_health) * 0.3)
+    power_consumption_rate = max(5, (100 - component_health) * 0.2 + temperature * 0.1)
+    cpu_gpu_usage = max(10, (100 - component_health) * 0.5 + temperature * 0.3)
+
+    state = np.empty((num_satellites, len(ATTRIBUTES)))
+    state[:, BATTERY_LEVEL] = round(battery_level, 2)
+    state[:, BATTERY_HEALTH] = battery_health
+    state[:, SIGNAL_STRENGTH] = signal_strength
+    state[:, POWER_CONSUMPTION_RATE] = round(power_consumption_rate, 2)
+    state[:, COMPONENT_HEALTH] = component_health
+    state[:, CPU_GPU_USAGE] = round(cpu_gpu_usage, 2)
+    state[:, SOLAR_PANEL_EFFICIENCY] = solar_panel_efficiency
+    state[:, TEMPERATURE] = temperature
+    state[:, DATA_STORAGE_USED] = np.round(rng.uniform(10, 30, num_satellites), 2)  # Starts low
+    state[:, DEBRIS_RISK_LEVEL] = np.round(rng.uniform(1, 3, num_satellites), 2)  # Low risk initially
+    return state
+
+
+def random_events(num_satellites, rng=None):
+    """Draws one event index per satellite, uniformly like random.choice(events)."""
+    if rng is None:
+        rng = np.random.default_rng()
+    return rng.integers(0, len(events), num_satellites)
+
+
+def apply_events(state, event_indices):
+    """
+    Applies one event per satellite (indices into `events`) to an (N, 10)
+    state array, in place. Same result as calling apply_event on each row.
+    """
+    state += EVENT_DELTAS[event_indices]
+
+    # Enforce boundaries on all values
+    np.clip(state, LOWER_BOUNDS, UPPER_BOUNDS, out=state)
+
+    # Round all values to 2 decimal places
+    np.round(state, 2, out=state)
+    return state
+
+
+def to_records(state):
+    """Converts a state array back to the per-satellite dicts apply_event works with."""
+    return [dict(zip(ATTRIBUTES, row)) for row in state.tolist()]
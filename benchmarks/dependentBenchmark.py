@@ -0,0 +1,89 @@
+"""
+The vectorized dependent-attribute solver (dependentAttributes.py) against
+the per-satellite dict versions it replaces: same values with
+settle='once', time for a fleet, and how far 'iterate' and 'closed_form'
+move the derived attributes away from the single ordered pass.
+
+Run from the repository root (mainFuncPANDASBACKUP.py loads model.pkl on import):
+    python benchmarks/dependentBenchmark.py [--satellites 100000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batchSimulation import ATTRIBUTES, TEMPERATURE
+from dependentAttributes import SETTLE, VARIANTS, DependentSolver
+import mainFunction
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import mainFuncPANDASBACKUP
+
+
+def solar_weighted(attributes):
+    # The commented-out version in mainFuncPANDASBACKUP.py
+    solar_input = attributes["Solar_Panel_Efficiency"] * (attributes["Battery_Health"] / 100)
+    attributes["Battery_Level"] = min(100, max(0,
+        attributes["Battery_Level"] + solar_input * 0.6 - attributes["Power_Consumption_Rate"]
+    ))
+    attributes["Power_Consumption_Rate"] = max(2,
+        attributes["CPU_GPU_Usage"] * 0.3 + (100 - attributes["Component_Health"]) * 0.15 + attributes["Temperature"] * 0.05
+    )
+    attributes["CPU_GPU_Usage"] = max(10,
+        (100 - attributes["Component_Health"]) * 0.3 + attributes["Temperature"] * 0.1 + attributes["Data_Storage_Used"] * 0.2
+    )
+    return attributes
+
+
+LEGACY = {
+    'basic': mainFunction.recalculate_dependent_attributes,
+    'solar_weighted': solar_weighted,
+    'charge_rate': mainFuncPANDASBACKUP.recalculate_dependent_attributes,
+}
+
+
+def legacy(function, state):
+    return np.array([[function(dict(zip(ATTRIBUTES, row)))[name] for name in ATTRIBUTES] for row in state.tolist()])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--satellites', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    state = rng.uniform(0, 100, (args.satellites, len(ATTRIBUTES)))
+    state[:, TEMPERATURE] = rng.uniform(-50, 100, args.satellites)
+
+    print(f"{args.satellites} satellites")
+    print(f"{'variant':<16}{'dicts ms':>10}{'once ms':>10}{'speedup':>10}  same values")
+    for variant in VARIANTS:
+        start = time.perf_counter()
+        expected = legacy(LEGACY[variant], state)
+        legacy_time = time.perf_counter() - start
+
+        solved = state.copy()
+        start = time.perf_counter()
+        DependentSolver(variant).solve(solved)
+        solver_time = time.perf_counter() - start
+        print(f"{variant:<16}{legacy_time * 1e3:>10.1f}{solver_time * 1e3:>10.2f}{legacy_time / solver_time:>9.0f}x"
+              f"  {np.array_equal(solved, expected)}")
+
+    print(f"\n{'variant':<16}{'settle':<13}{'ms':>8}{'passes':>8}{'max change vs once':>20}")
+    for variant in VARIANTS:
+        once = DependentSolver(variant).solve(state.copy())
+        for settle in SETTLE[1:]:
+            solver = DependentSolver(variant, settle)
+            solved = state.copy()
+            start = time.perf_counter()
+            solver.solve(solved)
+            elapsed = time.perf_counter() - start
+            passes = solver.iterations if settle == 'iterate' else 1
+            print(f"{variant:<16}{settle:<13}{elapsed * 1e3:>8.2f}{passes:>8}{np.abs(solved - once).max():>20.3f}")
@@ -0,0 +1,73 @@
+"""
+Downsampled history queries (downsample.py): a long window brought down to
+a plotting budget with minmax and lttb, cold (rollups built) and warm
+(rollups cached), against reading every record of the window and reducing
+it in memory. Also checks that minmax returns real records and keeps the
+extremes of every window.
+
+    python benchmarks/downsampleBenchmark.py [--ticks 2000000] [--points 1000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsample import Downsampler, lttb, minmax
+from telemetryStore import TelemetryStore
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=2_000_000)
+    parser.add_argument('--points', type=int, default=1000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='downsample-')
+    try:
+        store = TelemetryStore(directory)
+        rng = np.random.default_rng(0)
+        walk = np.cumsum(rng.normal(0, 1, (args.ticks, 10)), axis=0).astype(np.float32)
+        for tick in range(args.ticks):
+            store.append('sat', walk[tick], 1.7e9 + tick)
+        store.flush()
+
+        # The whole history, then a zoom into its second half and a pan back
+        windows = [(0, args.ticks), (args.ticks // 2, args.ticks), (args.ticks // 4, 3 * args.ticks // 4)]
+        print(f"{args.ticks:,} ticks down to {args.points} points per attribute")
+        print(f"{'window':<22}{'method':<8}{'read all ms':>12}{'cold ms':>10}{'warm ms':>10}")
+        for method in ('minmax', 'lttb'):
+            downsampler = Downsampler(store)
+            for first, last in windows:
+                def read_all():
+                    ticks, records = store.window('sat', first, last)
+                    if method == 'minmax':
+                        return minmax(ticks, records['values'], args.points // 2)
+                    return lttb(ticks, records['values'], args.points)
+                _, full = timed(read_all)
+                (ticks, _, values), cold = timed(lambda: downsampler.query('sat', first, last, points=args.points,
+                                                                           method=method))
+                _, warm = timed(lambda: downsampler.query('sat', first, last, points=args.points, method=method))
+                print(f"{f'{first:,}-{last:,}':<22}{method:<8}{full:>12.1f}{cold:>10.1f}{warm:>10.1f}")
+
+                if method == 'minmax':
+                    # Whatever tier each bucket came from, the values are real records of the window
+                    # and the extremes of the window are among them
+                    assert (walk[ticks, np.arange(10)] == values).all()
+                    assert (values.min(axis=0) == walk[first:last].min(axis=0)).all()
+                    assert (values.max(axis=0) == walk[first:last].max(axis=0)).all()
+            print(f"  rollup cache: {downsampler.snapshot()}")
+        print("minmax kept the extremes of every window")
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,60 @@
+"""
+Scaling of the parallel shard generator ("model Training/chunkedGenerator.py")
+from 1 to N worker processes, and a check that every worker count writes the
+same dataset for the same seed.
+
+    python benchmarks/generatorScaling.py [--num-samples 8000000] [--max-workers 8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'model Training'))
+
+from chunkedGenerator import generate_parallel
+
+
+def read_dataset(paths):
+    return pd.concat((pd.read_parquet(path) for path in paths), ignore_index=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-samples', type=int, default=8_000_000)
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{args.num_samples} rows in chunks of {args.chunk_size}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>14}{'speedup':>10}{'efficiency':>12}")
+    reference = None
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        output_dir = tempfile.mkdtemp(prefix='shards-')
+        try:
+            start = time.perf_counter()
+            paths, _ = generate_parallel(args.num_samples, output_dir, args.chunk_size, args.seed, workers)
+            elapsed = time.perf_counter() - start
+
+            dataset = read_dataset(paths)
+            if reference is None:
+                reference = dataset
+            else:
+                pd.testing.assert_frame_equal(dataset, reference)
+        finally:
+            shutil.rmtree(output_dir)
+
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{args.num_samples / elapsed:>14,.0f}{speedup:>10.2f}"
+              f"{speedup / workers:>12.0%}")
+        workers *= 2
+    print("Every worker count wrote the same dataset")
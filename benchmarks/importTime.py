@@ -0,0 +1,76 @@
+"""
+`python -X importtime` of the server module and of a simulator-only
+consumer, with the slowest modules and the heavy packages each one pulls in.
+
+Run from the repository root:
+    python benchmarks/importTime.py [--top 8] [--baseline <git rev>]
+
+--baseline also measures the same imports in a checkout of an older
+revision (model.pkl is copied into it), to compare against.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ('numpy', 'pandas', 'sklearn', 'fastapi', 'scipy')
+
+CONSUMERS = {
+    'server': 'import main',
+    'simulator': 'from simulator import initialize_attributes, apply_event, events',
+    # What a simulator-only consumer had to import before the package existed
+    'simulator (module)': 'from mainfuncUsingPandas import initialize_attributes, apply_event, events',
+}
+
+
+def import_times(code, cwd):
+    """(total microseconds, [(cumulative us, self us, module)], heavy packages loaded)."""
+    probe = code + f"\nimport sys\nprint([m for m in {HEAVY!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe], cwd=cwd, capture_output=True,
+                            text=True, env={**os.environ, 'WORKER_KIND': 'inline'})
+    if result.returncode != 0:
+        return None
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+    # Top-level imports are the ones that are not indented
+    total = sum(cumulative for cumulative, _, name in modules if not name.startswith('  '))
+    return total, modules, result.stdout.strip().splitlines()[-1]
+
+
+def report(label, cwd, top):
+    for consumer, code in CONSUMERS.items():
+        measured = import_times(code, cwd)
+        if measured is None:
+            print(f"\n[{label}] {consumer}: import failed")
+            continue
+        total, modules, heavy = measured
+        print(f"\n[{label}] {consumer}: {total / 1e3:.1f} ms, heavy packages {heavy}")
+        for cumulative, self_us, name in sorted(modules, key=lambda m: m[1], reverse=True)[:top]:
+            print(f"  {self_us / 1e3:>8.1f} ms self {cumulative / 1e3:>9.1f} ms cumulative  {name.strip()}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--baseline', help="git revision to compare against")
+    args = parser.parse_args()
+
+    report('current', ROOT, args.top)
+    if args.baseline:
+        checkout = tempfile.mkdtemp(prefix='importtime-')
+        try:
+            archive = subprocess.run(['git', 'archive', args.baseline], cwd=ROOT, capture_output=True, check=True)
+            subprocess.run(['tar', '-x', '-C', checkout], input=archive.stdout, check=True)
+            if os.path.exists(os.path.join(ROOT, 'model.pkl')):
+                shutil.copyfile(os.path.join(ROOT, 'model.pkl'), os.path.join(checkout, 'model.pkl'))
+            report(args.baseline, checkout, args.top)
+        finally:
+            shutil.rmtree(checkout)
@@ -0,0 +1,99 @@
+"""
+The per-action MultiOutputClassifier (11 forests) against a single native
+multi-output RandomForestClassifier, both trained by train.build_model on the
+same split of issDockingadded.csv: artifact size, load time, single-row
+latency and batch throughput (sklearn and FlatForest), and held-out accuracy.
+
+Run from the repository root:
+    python benchmarks/modelComparison.py [--n-estimators 100]
+"""
+import argparse
+import io
+import os
+import pickle
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datasetCache import load_dataset
+from fastForest import FlatForest
+from train import MODEL_KINDS, build_model
+
+SINGLE_ROWS = 200
+
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def single_row_ms(predict, X):
+    latencies = []
+    for row in X[:SINGLE_ROWS]:
+        start = time.perf_counter()
+        predict(row.reshape(1, -1))
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies) * 1e3
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', default=os.path.join(ROOT, 'issDockingadded.csv'))
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    # Benchmarked on plain arrays, as the server does
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    dataset = load_dataset(args.data)
+    X_train, X_test, Y_train, Y_test = train_test_split(dataset.features_frame(), dataset.labels_frame(),
+                                                        test_size=0.2, random_state=args.seed)
+    X_test, Y_test = X_test.to_numpy(np.float64), Y_test.to_numpy()
+
+    rows = []
+    for kind in MODEL_KINDS:
+        model = build_model(kind, args.n_estimators, tree_jobs=-1, seed=args.seed)
+        fit_seconds, _ = timed(lambda: model.fit(X_train, Y_train))
+
+        pickled = pickle.dumps(model)
+        load_seconds, model = timed(lambda: pickle.load(io.BytesIO(pickled)))
+        flat = FlatForest.from_model(model)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model_flat.npz')
+            flat.save(path)
+            flat_bytes = os.path.getsize(path)
+            flat_load_seconds, _ = timed(lambda: FlatForest.load(path))
+
+        sklearn_batch, predictions = timed(lambda: model.predict(X_test))
+        flat_batch, flat_predictions = timed(lambda: flat.predict(X_test))
+        assert np.array_equal(predictions, flat_predictions)
+        rows.append((kind, {
+            'fit s': fit_seconds,
+            'pickle MB': len(pickled) / 1e6,
+            'npz MB': flat_bytes / 1e6,
+            'unpickle ms': load_seconds * 1e3,
+            'npz load ms': flat_load_seconds * 1e3,
+            'sklearn 1-row ms': single_row_ms(model.predict, X_test),
+            'flat 1-row ms': single_row_ms(flat.predict, X_test),
+            'sklearn rows/s': len(X_test) / sklearn_batch,
+            'flat rows/s': len(X_test) / flat_batch,
+            'exact match': (predictions == Y_test).all(axis=1).mean(),
+            'micro F1': f1_score(Y_test, predictions, average='micro'),
+            'macro F1': f1_score(Y_test, predictions, average='macro', zero_division=0),
+        }))
+
+    print(f"{len(X_train)} training rows, {len(X_test)} held-out rows, {args.n_estimators} trees per forest")
+    print(f"{'':<18}" + ''.join(f"{kind:>14}" for kind, _ in rows))
+    for metric in rows[0][1]:
+        print(f"{metric:<18}" + ''.join(f"{values[metric]:>14,.0f}" if values[metric] >= 1000
+                                        else f"{values[metric]:>14.4g}" for _, values in rows))
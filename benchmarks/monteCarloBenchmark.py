@@ -0,0 +1,76 @@
+"""
+Trajectory-ticks per second of the Monte Carlo runner (monteCarlo.py)
+against stepping every trajectory one at a time with apply_event and
+Fixes.apply_fixes, and its scaling from 1 to N worker processes.
+
+Run from the repository root (needs model.pkl for --mode hybrid / model):
+    python benchmarks/monteCarloBenchmark.py [--trajectories 8192] [--ticks 500] [--mode rules]
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mainfuncUsingPandas import initialize_attributes, apply_event, events
+from fixes import Fixes
+from modelRegistry import ModelRegistry
+from ruleEngine import MODES, RuleEngine
+import monteCarlo
+
+# Trajectories of the one-at-a-time loop, it is too slow for more
+SCALAR_TRAJECTORIES = 20
+
+
+def scalar_rate(ticks, mode):
+    engine = RuleEngine(mode)
+    model = ModelRegistry()
+    fixes = Fixes()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(SCALAR_TRAJECTORIES):
+            state = initialize_attributes()
+            for _ in range(ticks):
+                state = apply_event(random.choice(events), state)
+                if state['Battery_Level'] <= 0 or state['Component_Health'] <= 0:
+                    break
+                state = fixes.apply_fixes(state, engine.combine(state.as_row(), model))
+    return SCALAR_TRAJECTORIES * ticks / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trajectories', type=int, default=8192)
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--mode', choices=MODES, default='rules')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{args.trajectories} trajectories x {args.ticks} ticks, mode {args.mode}, {os.cpu_count()} CPUs")
+    scalar = scalar_rate(args.ticks, args.mode)
+    print(f"{'one at a time':<16}{scalar:>16,.0f} trajectory-ticks/s")
+
+    reference = None
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        result = monteCarlo.run(args.trajectories, args.ticks, seed=42, workers=workers, mode=args.mode,
+                                fix_success=0.6)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = result.failures
+        else:
+            np.testing.assert_array_equal(result.failures, reference)
+
+        rate = args.trajectories * args.ticks / elapsed
+        baseline = baseline or rate
+        print(f"{f'{workers} workers':<16}{rate:>16,.0f} trajectory-ticks/s  {rate / scalar:>7.0f}x one at a time"
+              f"  {rate / baseline:>5.2f}x 1 worker")
+        workers *= 2
+    print(f"Every worker count gave the same failure counts, P(fail) {result.failure_probability():.2%}")
@@ -0,0 +1,67 @@
+"""
+Latency and agreement of the inference modes of ruleEngine.RuleEngine on
+issDockingadded.csv: rules only, model only, and hybrid (the model only for
+rows near a threshold).
+
+Agreement is the share of rows whose 11 predicted actions all equal the
+dataset labels, and all equal what the model alone predicts.
+
+Run from the repository root (needs model.pkl, like the server):
+    python benchmarks/ruleEngineBenchmark.py [--margin 0.25]
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from batchSimulation import ATTRIBUTES
+from fastForest import FlatForest
+from ruleEngine import ACTIONS, BOUNDARY_MARGIN, MODES, RuleEngine
+
+SINGLE_ROWS = 2000
+
+
+def single_row_latencies(engine, model, X):
+    # One state per call, like one websocket tick
+    latencies = []
+    for row in X[:SINGLE_ROWS]:
+        start = time.perf_counter()
+        engine.combine(row, model)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', default=os.path.join(ROOT, 'issDockingadded.csv'))
+    parser.add_argument('--model', default=os.path.join(ROOT, 'model.pkl'))
+    parser.add_argument('--margin', type=float, default=BOUNDARY_MARGIN)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    X = df[ATTRIBUTES].to_numpy(dtype=np.float64)
+    labels = df[ACTIONS].to_numpy()
+    with open(args.model, 'rb') as f:
+        model = FlatForest.from_model(pickle.load(f))
+    model_only = model.predict(X)
+
+    print(f"{len(X)} rows, boundary margin {args.margin}")
+    print(f"{'mode':<8}{'to model':>10}{'p50 us':>10}{'p99 us':>10}{'batch ms':>10}"
+          f"{'vs labels':>11}{'vs model':>10}")
+    for mode in MODES:
+        engine = RuleEngine(mode, args.margin)
+        latencies = single_row_latencies(engine, model, X)
+        start = time.perf_counter()
+        predictions = engine.combine(X, model)
+        batch = time.perf_counter() - start
+        print(f"{mode:<8}{engine.needs_model(X).mean():>10.1%}"
+              f"{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 99):>10.1f}{batch * 1e3:>10.1f}"
+              f"{(predictions == labels).all(axis=1).mean():>11.2%}"
+              f"{(predictions == model_only).all(axis=1).mean():>10.2%}")
@@ -0,0 +1,82 @@
+"""
+Server startup and first-prediction cost, each measured in a fresh Python
+process:
+
+  eager pickle x2   what importing main.py used to do: unpickle and flatten
+                    model.pkl in mainfuncUsingPandas and again in main
+  import main       importing the server module now (no model work)
+  first predict     ModelRegistry's first prediction, cold (unpickle, flatten,
+                    export the arrays) and warm (memory-map the exported arrays)
+
+Run from the repository root (needs model.pkl):
+    python benchmarks/startupBenchmark.py [--repeat 5]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER = """
+import pickle, time
+start = time.perf_counter()
+from fastForest import FlatForest
+for _ in range(2):
+    with open({model!r}, 'rb') as f:
+        FlatForest.from_model(pickle.load(f))
+print(time.perf_counter() - start)
+"""
+
+IMPORT_MAIN = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+FIRST_PREDICT = """
+import time
+start = time.perf_counter()
+from modelRegistry import ModelRegistry
+ModelRegistry({model!r}).predict([[50.0] * 10])
+print(time.perf_counter() - start)
+"""
+
+
+def run(code, cwd, **env):
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': ROOT, **env})
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=os.path.join(ROOT, 'model.pkl'))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='startup-')
+    try:
+        model = os.path.join(workdir, 'model.pkl')
+        shutil.copyfile(args.model, model)
+        flat_dir = os.path.join(workdir, 'model_flat')
+
+        timings = {'eager pickle x2': [], 'import main': [], 'first predict cold': [], 'first predict warm': []}
+        for _ in range(args.repeat):
+            timings['eager pickle x2'].append(run(EAGER.format(model=model), ROOT))
+            timings['import main'].append(run(IMPORT_MAIN, workdir, MODEL_PATH=model, WORKER_KIND='inline'))
+            shutil.rmtree(flat_dir, ignore_errors=True)
+            timings['first predict cold'].append(run(FIRST_PREDICT.format(model=model), workdir))
+            timings['first predict warm'].append(run(FIRST_PREDICT.format(model=model), workdir))
+    finally:
+        shutil.rmtree(workdir)
+
+    print(f"{'':<20}{'median ms':>12}{'min ms':>10}")
+    for name, values in timings.items():
+        values = np.array(values) * 1e3
+        print(f"{name:<20}{np.median(values):>12.1f}{values.min():>10.1f}")
@@ -0,0 +1,76 @@
+"""
+Per-tick cost of the simulator + Fixes loop with SatelliteState versus the
+old one-row DataFrame round-trip that every stage used to do.
+
+Run from the repository root (needs model.pkl, like the simulator):
+    python benchmarks/stateBenchmark.py
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mainfuncUsingPandas import initialize_attributes, apply_event, events
+from fixes import Fixes
+from satelliteState import SatelliteState
+
+TICKS = 2000
+# Every tick fires three actions, like a typical prediction row
+PREDICTION = np.array([[1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0]])
+
+
+def _through_dataframe(func):
+    # What each stage did before: one-row DataFrame in, iloc[0].to_dict(), DataFrame out
+    def stage(attributes_df, *args):
+        state = SatelliteState.from_dict(attributes_df.iloc[0].to_dict())
+        return pd.DataFrame([func(state, *args).to_dict()])
+    return stage
+
+
+def run(tick, data):
+    fixes = Fixes()
+    event_sequence = [random.choice(events) for _ in range(TICKS)]
+
+    tracemalloc.start()
+    peaks = []
+    start = time.perf_counter()
+    for event in event_sequence:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        data = tick(fixes, event, data)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return elapsed / TICKS, sum(peaks) / len(peaks)
+
+
+def state_tick(fixes, event, data):
+    data = apply_event(event, data)
+    return fixes.apply_fixes(data, PREDICTION)
+
+
+def dataframe_tick(fixes, event, data):
+    data = _through_dataframe(lambda state: apply_event(event, state))(data)
+    for selected, action in zip(PREDICTION[0], fixes.actions.values()):
+        if selected == 1:
+            data = _through_dataframe(action)(data)
+    return data
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        df_time, df_peak = run(dataframe_tick, initialize_attributes().to_frame())
+        state_time, state_peak = run(state_tick, initialize_attributes())
+
+    print(f"{'path':<12}{'us/tick':>12}{'peak bytes/tick':>18}")
+    print(f"{'DataFrame':<12}{df_time * 1e6:>12.1f}{df_peak:>18.0f}")
+    print(f"{'State':<12}{state_time * 1e6:>12.1f}{state_peak:>18.0f}")
+    print(f"speedup {df_time / state_time:.1f}x, allocation drop {df_peak / max(state_peak, 1):.1f}x")
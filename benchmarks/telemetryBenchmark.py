@@ -0,0 +1,68 @@
+"""
+Telemetry store (telemetryStore.py): append rate, and the cost of a short
+time-range query as the history grows, against loading the whole history
+and filtering it.
+
+    python benchmarks/telemetryBenchmark.py [--ticks 4000000] [--window 3600]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetryStore import RECORD, TelemetryStore
+
+
+def load_all(store, satellite):
+    directory = store._stream(satellite).directory
+    return np.concatenate([np.fromfile(os.path.join(directory, name), dtype=RECORD)
+                           for name in sorted(os.listdir(directory))])
+
+
+def median_ms(func, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e3
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=4_000_000)
+    parser.add_argument('--window', type=int, default=3600, help="ticks (seconds at 1 Hz) per query")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix='telemetry-')
+    try:
+        store = TelemetryStore(directory)
+        rng = np.random.default_rng(0)
+        values = rng.uniform(0, 100, (1000, 10))
+        print(f"{'stored ticks':>13}{'append/s':>12}{'query ms':>10}{'load all ms':>13}")
+        stored = 0
+        checkpoint = 10_000
+        while checkpoint <= args.ticks:
+            start = time.perf_counter()
+            for tick in range(stored, checkpoint):
+                store.append('sat', values[tick % 1000], 1.7e9 + tick)
+            store.flush()
+            rate = (checkpoint - stored) / (time.perf_counter() - start)
+            stored = checkpoint
+
+            # A window in the middle of the history, by time
+            middle = 1.7e9 + stored // 2
+            query = median_ms(lambda: store.window('sat', middle, middle + args.window, by='time'))
+            full = median_ms(lambda: (lambda r: r[(r['timestamp'] >= middle)
+                                                  & (r['timestamp'] < middle + args.window)])(load_all(store, 'sat')),
+                             repeat=3)
+            print(f"{stored:>13,}{rate:>12,.0f}{query:>10.3f}{full:>13.1f}")
+            checkpoint *= 4
+    finally:
+        shutil.rmtree(directory)
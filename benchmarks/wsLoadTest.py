@@ -0,0 +1,87 @@
+"""
+Load test for the /ws endpoint: opens N concurrent connections, each with
+its own simulation session (/ws/<id>), and measures how late each tick
+arrives. Ticks are scheduled 1 s apart (TICK_RATE=1), so
+any gap above 1 s is time spent simulating, predicting, fixing and waiting
+for the event loop. With the work offloaded to the worker pool the tail
+should stay flat as N grows.
+
+Run from the repository root (needs model.pkl):
+    python benchmarks/wsLoadTest.py --connections 10,100,500 --worker-kind thread
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _client(url, duration, gaps):
+    async with websockets.connect(url, max_queue=None) as ws:
+        await ws.recv()
+        last = time.perf_counter()
+        end = last + duration
+        while last < end:
+            await ws.recv()
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+
+async def _run_level(url, connections, duration, shared):
+    gaps = []
+    # One simulation per connection (/ws/<id>), or all of them watching /ws
+    urls = [url if shared else f"{url}/load-{connections}-{i}" for i in range(connections)]
+    await asyncio.gather(*[_client(url, duration, gaps) for url in urls])
+    # Time past the 1 s tick period, in ms
+    return (np.array(gaps) - 1.0) * 1000
+
+
+async def _wait_for_server(port, timeout=30):
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def main(args):
+    env = dict(os.environ, WORKER_KIND=args.worker_kind)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', ROOT, '--port', str(args.port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        await _wait_for_server(args.port)
+        url = f"ws://127.0.0.1:{args.port}/ws"
+        print(f"worker kind: {args.worker_kind}")
+        print(f"{'connections':>12}{'ticks':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for connections in args.connections:
+            late = await _run_level(url, connections, args.duration, args.shared)
+            print(f"{connections:>12}{len(late):>8}{np.percentile(late, 50):>10.1f}"
+                  f"{np.percentile(late, 99):>10.1f}{late.max():>10.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', default='10,100,500',
+                        type=lambda value: [int(n) for n in value.split(',')])
+    parser.add_argument('--duration', type=float, default=10, help="seconds per level")
+    parser.add_argument('--worker-kind', default='thread', choices=['thread', 'process', 'inline'])
+    parser.add_argument('--shared', action='store_true',
+                        help="every connection watches the one /ws session instead of running its own")
+    parser.add_argument('--port', type=int, default=8765)
+    asyncio.run(main(parser.parse_args()))
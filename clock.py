@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+# Fastest supported tick rate, 10 ms per tick
+MAX_TICK_RATE = 100.0
+
+
+class SimulationClock:
+    """
+    Fixed-timestep schedule: tick n is due at start + n * interval on the
+    monotonic clock, however long each tick's work takes, so the period does
+    not drift. A tick that starts after its deadline is an overrun; deadlines
+    that passed entirely while the previous tick was still working are
+    skipped and counted as missed, rather than run back to back.
+
+    `interval` is the simulated time per tick. `speed` scales it to wall
+    time: 1 is real time, 10 runs ten times faster, and 0 runs ticks back to
+    back with no sleeping at all (replay and soak tests).
+    """
+
+    def __init__(self, interval=1.0, speed=1.0):
+        if interval < 1 / MAX_TICK_RATE:
+            raise ValueError(f"tick interval {interval} s is below {1 / MAX_TICK_RATE} s ({MAX_TICK_RATE:g} Hz)")
+        if speed < 0:
+            raise ValueError(f"speed must be >= 0, got {speed}")
+        self.interval = interval
+        self.speed = speed
+        self.wall_interval = interval / speed if speed else 0.0
+        self.ticks = 0
+        self.overruns = 0
+        self.missed = 0
+        self.max_lateness = 0.0
+        self._origin = None
+        self._wall_origin = None
+        self._due = 0
+
+    def start(self):
+        self._origin = time.monotonic()
+        self._wall_origin = time.time()
+        self._due = 0
+
+    @property
+    def timestamp(self):
+        """Unix time of the current tick on the simulated timeline."""
+        return self._wall_origin + (self._due - 1) * self.interval
+
+    async def wait(self):
+        """Sleeps until the next tick is due."""
+        if self._origin is None:
+            self.start()
+        if self.wall_interval:
+            now = time.monotonic()
+            deadline = self._origin + self._due * self.wall_interval
+            if now < deadline:
+                await asyncio.sleep(deadline - now)
+            elif self._due:
+                lateness = now - deadline
+                self.overruns += 1
+                self.max_lateness = max(self.max_lateness, lateness)
+                missed = int(lateness // self.wall_interval)
+                self.missed += missed
+                self._due += missed
+        else:
+            # Never sleeps, but still lets the event loop serve the websockets
+            await asyncio.sleep(0)
+        self._due += 1
+        self.ticks += 1
+
+    def snapshot(self):
+        return {
+            "interval": self.interval,
+            "speed": self.speed,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "missed": self.missed,
+            "max_lateness_ms": self.max_lateness * 1000,
+        }
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from batchSimulation import ATTRIBUTES
+from ruleEngine import ACTIONS
+
+CACHE_DIR = '.dataset_cache'
+# Bump when the layout of the cached files changes
+CACHE_VERSION = 1
+
+
+class Dataset:
+    """
+    Features (N, 10) float32 in ATTRIBUTES order and labels (N, 11) uint8 in
+    ACTIONS order. Loaded from the cache they are read-only memory maps.
+    """
+
+    def __init__(self, features, labels, feature_names=ATTRIBUTES, action_names=ACTIONS):
+        self.features = features
+        self.labels = labels
+        self.feature_names = list(feature_names)
+        self.action_names = list(action_names)
+
+    def __len__(self):
+        return len(self.features)
+
+    def features_frame(self):
+        return pd.DataFrame(self.features, columns=self.feature_names, copy=False)
+
+    def labels_frame(self):
+        return pd.DataFrame(self.labels, columns=self.action_names, copy=False)
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_csv_dataset(csv_path):
+    """Parses a labeled dataset CSV (issDockingadded.csv layout) into a Dataset."""
+    columns = ATTRIBUTES + ACTIONS
+    dtypes = {**{name: np.float32 for name in ATTRIBUTES}, **{name: np.uint8 for name in ACTIONS}}
+    # Only the typed columns, Recommended_Actions is the same information as the labels
+    df = pd.read_csv(csv_path, usecols=columns, dtype=dtypes)
+    return Dataset(np.ascontiguousarray(df[ATTRIBUTES].to_numpy()),
+                   np.ascontiguousarray(df[ACTIONS].to_numpy()))
+
+
+def _cache_paths(csv_path, cache_dir):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    directory = os.path.join(cache_dir, name)
+    return (directory, os.path.join(directory, 'features.npy'), os.path.join(directory, 'labels.npy'),
+            os.path.join(directory, 'meta.json'))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_array(path, array):
+    # Written next to the final file and renamed, so a reader never sees half an array
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def load_dataset(csv_path='issDockingadded.csv', cache_dir=CACHE_DIR):
+    """
+    Dataset of `csv_path`, parsed once and then memory-mapped from .npy files
+    in cache_dir. The cache is rebuilt when the CSV's SHA-256 changes.
+    """
+    directory, features_path, labels_path, meta_path = _cache_paths(csv_path, cache_dir)
+    source_hash = file_hash(csv_path)
+    meta = {
+        'version': CACHE_VERSION,
+        'source_sha256': source_hash,
+        'feature_names': ATTRIBUTES,
+        'action_names': ACTIONS,
+    }
+
+    cached = _read_meta(meta_path)
+    if cached is not None and all(cached.get(key) == value for key, value in meta.items()):
+        try:
+            return Dataset(np.load(features_path, mmap_mode='r'), np.load(labels_path, mmap_mode='r'))
+        except (OSError, ValueError):
+            pass  # incomplete cache, rebuild it below
+
+    dataset = read_csv_dataset(csv_path)
+    os.makedirs(directory, exist_ok=True)
+    # Without a meta file the arrays count as incomplete while they are rewritten
+    try:
+        os.remove(meta_path)
+    except FileNotFoundError:
+        pass
+    _save_array(features_path, dataset.features)
+    _save_array(labels_path, dataset.labels)
+    meta['rows'] = len(dataset)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f, indent=2)
+    # The meta file goes last, it marks the arrays as complete
+    os.replace(meta_path + '.tmp', meta_path)
+    return Dataset(np.load(features_path, mmap_mode='r'), np.load(labels_path, mmap_mode='r'))
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'issDockingadded.csv'
+    start = time.perf_counter()
+    pd.read_csv(csv_path)
+    parse = time.perf_counter() - start
+
+    load_dataset(csv_path)  # builds the cache if needed
+    start = time.perf_counter()
+    dataset = load_dataset(csv_path)
+    cached = time.perf_counter() - start
+    print(f"{len(dataset)} rows: read_csv {parse * 1e3:.1f} ms, cached load {cached * 1e3:.2f} ms")
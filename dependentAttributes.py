@@ -0,0 +1,185 @@
+"""
+Derived attributes (battery level, power consumption, CPU/GPU usage)
+recomputed for a whole (N, 10) state array at once.
+
+The simulator grew three versions of recalculate_dependent_attributes, all
+per satellite on dicts, and each one reads values it has just overwritten
+earlier in the same call. They are kept here as VARIANTS, each an explicit,
+ordered list of steps:
+
+  basic           mainFunction.py
+  solar_weighted  the commented-out version in mainFuncPANDASBACKUP.py,
+                  solar input scaled by battery health
+  charge_rate     mainFuncPANDASBACKUP.py, with slower charging above 80 %
+                  and faster charging below 20 %
+
+A step is either 'algebraic', a relation between attributes within one tick
+(power consumption from CPU usage, ...), or 'integrating', an update that
+accumulates every tick (battery level += net power). DependentSolver settles
+the algebraic steps and then applies the integrating ones once:
+
+  settle='once'         one pass in the variant's order, what the dict
+                        versions do (same floats)
+  settle='iterate'      repeat the algebraic steps until no value moves by
+                        more than `tol`, so every derived value is
+                        consistent with the others whatever the order
+  settle='closed_form'  the fixed point of the algebraic steps computed
+                        directly, the limit 'iterate' converges to
+"""
+import numpy as np
+
+from batchSimulation import (BATTERY_LEVEL, BATTERY_HEALTH, POWER_CONSUMPTION_RATE, COMPONENT_HEALTH, CPU_GPU_USAGE,
+                             SOLAR_PANEL_EFFICIENCY, TEMPERATURE, DATA_STORAGE_USED)
+
+SETTLE = ('once', 'iterate', 'closed_form')
+
+
+# basic / solar_weighted
+
+def _basic_battery(s):
+    return np.clip(s[:, BATTERY_LEVEL] + s[:, SOLAR_PANEL_EFFICIENCY] * 0.8 - s[:, POWER_CONSUMPTION_RATE], 0, 100)
+
+
+def _solar_weighted_battery(s):
+    # Degraded batteries charge less efficiently
+    solar_input = s[:, SOLAR_PANEL_EFFICIENCY] * (s[:, BATTERY_HEALTH] / 100)
+    return np.clip(s[:, BATTERY_LEVEL] + solar_input * 0.6 - s[:, POWER_CONSUMPTION_RATE], 0, 100)
+
+
+def _basic_power(s):
+    return np.maximum(2, s[:, CPU_GPU_USAGE] * 0.3 + (100 - s[:, COMPONENT_HEALTH]) * 0.15 + s[:, TEMPERATURE] * 0.05)
+
+
+def _basic_cpu_load(s):
+    # Everything CPU/GPU usage depends on, it does not depend on itself
+    return (100 - s[:, COMPONENT_HEALTH]) * 0.3 + s[:, TEMPERATURE] * 0.1 + s[:, DATA_STORAGE_USED] * 0.2
+
+
+def _basic_cpu(s):
+    return np.maximum(10, _basic_cpu_load(s))
+
+
+def _basic_fixed_point(s):
+    # CPU/GPU usage only depends on independent attributes, power on CPU/GPU usage
+    s[:, CPU_GPU_USAGE] = _basic_cpu(s)
+    s[:, POWER_CONSUMPTION_RATE] = _basic_power(s)
+
+
+# charge_rate
+
+def _charge_rate_power(s):
+    base_power = 10  # Minimum power draw when idle
+    cpu_factor = s[:, CPU_GPU_USAGE] * 0.3
+    health_factor = (100 - s[:, COMPONENT_HEALTH]) * 0.15
+    temp_factor = np.maximum(0, (s[:, TEMPERATURE] - 20) * 0.2)  # Temperature above 20°C increases power
+    return np.minimum(100, base_power + cpu_factor + health_factor + temp_factor)
+
+
+def _charge_rate_cpu_impacts(s):
+    health_impact = (100 - s[:, COMPONENT_HEALTH]) * 0.3
+    temp_impact = np.maximum(0, (s[:, TEMPERATURE] - 25) * 0.25)  # Performance degrades above optimal temp
+    storage_impact = s[:, DATA_STORAGE_USED] * 0.2
+    return health_impact, temp_impact, storage_impact
+
+
+def _charge_rate_cpu(s):
+    base_cpu = 8  # Minimum CPU usage for system operations
+    health_impact, temp_impact, storage_impact = _charge_rate_cpu_impacts(s)
+    # Summed in the same order as the dict version, so the floats match
+    return np.minimum(100, np.maximum(base_cpu, s[:, CPU_GPU_USAGE] * 0.7 + health_impact + temp_impact
+                                      + storage_impact))
+
+
+def _charge_rate_battery(s):
+    max_solar_input = 25  # Maximum power generation per cycle
+    solar_input = max_solar_input * (s[:, SOLAR_PANEL_EFFICIENCY] / 100) * (s[:, BATTERY_HEALTH] / 100)
+    power_balance = solar_input - s[:, POWER_CONSUMPTION_RATE]
+    # Slower charging at high levels, faster at low levels
+    level = s[:, BATTERY_LEVEL]
+    charge_rate = np.where(level > 80, 0.5, np.where(level < 20, 1.5, 1.0))
+    return np.clip(level + (power_balance * charge_rate * 0.1), 0, 100)
+
+
+def _charge_rate_fixed_point(s):
+    # x = clip(0.7 x + impacts, 8, 100) is solved by x = clip(impacts / 0.3, 8, 100)
+    s[:, CPU_GPU_USAGE] = np.clip(sum(_charge_rate_cpu_impacts(s)) / 0.3, 8, 100)
+    s[:, POWER_CONSUMPTION_RATE] = _charge_rate_power(s)
+
+
+# name -> (ordered steps as (column, 'algebraic' or 'integrating', function), closed-form fixed point)
+VARIANTS = {
+    'basic': ([
+        (BATTERY_LEVEL, 'integrating', _basic_battery),
+        (POWER_CONSUMPTION_RATE, 'algebraic', _basic_power),
+        (CPU_GPU_USAGE, 'algebraic', _basic_cpu),
+    ], _basic_fixed_point),
+    'solar_weighted': ([
+        (BATTERY_LEVEL, 'integrating', _solar_weighted_battery),
+        (POWER_CONSUMPTION_RATE, 'algebraic', _basic_power),
+        (CPU_GPU_USAGE, 'algebraic', _basic_cpu),
+    ], _basic_fixed_point),
+    'charge_rate': ([
+        (POWER_CONSUMPTION_RATE, 'algebraic', _charge_rate_power),
+        (CPU_GPU_USAGE, 'algebraic', _charge_rate_cpu),
+        (BATTERY_LEVEL, 'integrating', _charge_rate_battery),
+    ], _charge_rate_fixed_point),
+}
+
+
+class DependentSolver:
+    """
+    Recomputes the derived attributes of (N, 10) state arrays in place with
+    one of the VARIANTS and a settle mode (see the module docstring).
+
+    With settle='iterate', `iterations` is the number of passes the last
+    solve() needed; it stops after max_iterations even if some row has not
+    settled, and `converged` says whether it did.
+    """
+
+    def __init__(self, variant='basic', settle='once', tol=1e-9, max_iterations=200):
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown variant {variant!r}, expected one of {tuple(VARIANTS)}")
+        if settle not in SETTLE:
+            raise ValueError(f"unknown settle mode {settle!r}, expected one of {SETTLE}")
+        self.variant = variant
+        self.settle = settle
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.steps, self._fixed_point = VARIANTS[variant]
+        self.algebraic = [(column, step) for column, kind, step in self.steps if kind == 'algebraic']
+        self.integrating = [(column, step) for column, kind, step in self.steps if kind == 'integrating']
+        self.iterations = 0
+        self.converged = True
+
+    def solve(self, state):
+        state = np.atleast_2d(state)
+        if self.settle == 'once':
+            # Every step sees the values the steps before it wrote, like the dict versions
+            for column, _, step in self.steps:
+                state[:, column] = step(state)
+            return state
+
+        if self.settle == 'closed_form':
+            self._fixed_point(state)
+        else:
+            self._iterate(state)
+        for column, step in self.integrating:
+            state[:, column] = step(state)
+        return state
+
+    def _iterate(self, state):
+        self.converged = False
+        for self.iterations in range(1, self.max_iterations + 1):
+            change = 0.0
+            for column, step in self.algebraic:
+                updated = step(state)
+                change = max(change, np.abs(updated - state[:, column]).max(initial=0.0))
+                state[:, column] = updated
+            if change <= self.tol:
+                self.converged = True
+                break
+
+
+def recalculate_dependent(state, variant='basic', settle='once', **kwargs):
+    """Recomputes the derived attributes of an (N, 10) state array in place and returns it."""
+    return DependentSolver(variant, settle, **kwargs).solve(state)
@@ -0,0 +1,251 @@
+"""
+Downsampling of telemetry history for plotting, per attribute column:
+
+  minmax  the window is cut into buckets of equal tick width and each bucket
+          is replaced by its minimum and its maximum, in tick order, so no
+          spike disappears from the plot
+  lttb    Largest-Triangle-Three-Buckets, `points` points per attribute that
+          keep the visual shape of the series
+
+Long windows are not read record by record. Rollups, the min and max of
+every block of TIERS[k] ticks, are built once per ROLLUP_CHUNK blocks (each
+tier from the one below it) and cached, so zooming and panning around the
+same history only reads the rollup rows it needs plus the ragged ends of the
+window. The history is append-only, so a cached chunk never goes stale; the
+chunk still being filled is rebuilt from the tier below on each query.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+METHODS = ('stride', 'minmax', 'lttb')
+# Smallest points count each method can answer with
+MIN_POINTS = {'stride': 1, 'minmax': 2, 'lttb': 3}
+
+# Ticks per rollup block, each tier a multiple of the previous one
+TIERS = (16, 256, 4096, 65536)
+ROLLUP_CHUNK = 256  # blocks built and cached together
+ROLLUP_CACHE_CHUNKS = 512  # about 60 kB each
+
+# A bucket only reads rollups with at least this many blocks per bucket, so
+# rounding its width up to whole blocks adds at most a quarter
+MIN_BLOCKS_PER_BUCKET = 4
+
+# lttb over a long window picks from the minmax of this many times `points` buckets
+LTTB_CANDIDATES = 4
+
+_NO_TICK = np.iinfo(np.int64).max
+
+
+def _group_extrema(xmin, ymin, xmax, ymax, boundaries):
+    """
+    Merges the extrema rows [boundaries[i], boundaries[i + 1]) into one row
+    each: the smallest minimum and largest maximum of every column, with the
+    tick each one was found at.
+    """
+    counts = np.diff(np.append(boundaries, len(ymin)))
+    mins = np.minimum.reduceat(ymin, boundaries, axis=0)
+    maxs = np.maximum.reduceat(ymax, boundaries, axis=0)
+    # The first tick where the group's extremum occurs
+    at_min = np.minimum.reduceat(np.where(ymin == np.repeat(mins, counts, axis=0), xmin, _NO_TICK), boundaries, axis=0)
+    at_max = np.minimum.reduceat(np.where(ymax == np.repeat(maxs, counts, axis=0), xmax, _NO_TICK), boundaries, axis=0)
+    return at_min, mins, at_max, maxs
+
+
+def _interleave(xmin, ymin, xmax, ymax):
+    """Extrema rows as two points per row and column, the earlier one first: (2 * rows, columns) x and y."""
+    min_first = xmin <= xmax
+    x = np.stack([np.where(min_first, xmin, xmax), np.where(min_first, xmax, xmin)], axis=1)
+    y = np.stack([np.where(min_first, ymin, ymax), np.where(min_first, ymax, ymin)], axis=1)
+    return x.reshape(-1, x.shape[2]), y.reshape(-1, y.shape[2])
+
+
+def _as_columns(x, y):
+    y = np.asarray(y)
+    x = np.asarray(x)
+    if not len(y):
+        # reshape(0, -1) cannot infer the column count
+        return np.empty(y.shape, dtype=x.dtype), y
+    return np.broadcast_to(x.reshape(len(y), -1), y.shape), y
+
+
+def minmax(x, y, buckets):
+    """
+    Min/max buckets of an (n, columns) series `y` at positions `x` ((n,) or
+    (n, columns)): runs of ceil(n / buckets) points each become their minimum
+    and maximum. Returns (x, y), each (2 * buckets, columns) at most.
+    """
+    x, y = _as_columns(x, y)
+    if not len(y):
+        return x, y
+    width = -(-len(y) // max(1, buckets))
+    return _interleave(*_group_extrema(x, y, x, y, np.arange(0, len(y), width)))
+
+
+def lttb(x, y, points):
+    """
+    Largest-Triangle-Three-Buckets of every column of an (n, columns) series
+    `y` at positions `x` ((n,) or (n, columns)). Keeps the first and last
+    point and, for each of points - 2 buckets in between, the point making
+    the largest triangle with the point kept before it and the average of
+    the next bucket. The buckets are walked in order, all columns at once.
+    Returns (x, y), each (points, columns); series of at most `points` points
+    are returned as they are.
+    """
+    x, y = _as_columns(x, y)
+    n, columns = y.shape
+    if points < 3:
+        raise ValueError(f"lttb needs at least 3 points, got {points}")
+    if n <= points:
+        return x, y
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    cols = np.arange(columns)
+
+    # Bucket i of the middle points is [edges[i], edges[i + 1])
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.intp) + 1
+    edges[-1] = n - 1
+    picked = np.empty((points, columns), dtype=np.intp)
+    picked[0] = 0
+    picked[-1] = n - 1
+    for i in range(points - 2):
+        xa = xf[picked[i], cols]
+        ya = yf[picked[i], cols]
+        if i < points - 3:
+            xc = xf[edges[i + 1]:edges[i + 2]].mean(axis=0)
+            yc = yf[edges[i + 1]:edges[i + 2]].mean(axis=0)
+        else:
+            xc, yc = xf[-1], yf[-1]
+        xb = xf[edges[i]:edges[i + 1]]
+        yb = yf[edges[i]:edges[i + 1]]
+        # Twice the triangle area, the constant factor does not change the argmax
+        area = np.abs((xa - xc) * (yb - ya) - (xa - xb) * (yc - ya))
+        picked[i + 1] = edges[i] + np.argmax(area, axis=0)
+    return x[picked, cols], y[picked, cols]
+
+
+class Downsampler:
+    """
+    minmax and lttb queries over a TelemetryStore, reading long windows
+    through the cached rollup tiers.
+    """
+
+    def __init__(self, store, tiers=TIERS, chunk=ROLLUP_CHUNK, cache_chunks=ROLLUP_CACHE_CHUNKS):
+        if any(upper % lower for lower, upper in zip(tiers, tiers[1:])):
+            raise ValueError(f"every rollup tier must be a multiple of the one before it, got {tiers}")
+        self.store = store
+        self.tiers = tiers
+        self.chunk = chunk
+        self.cache_chunks = cache_chunks
+        self._cache = OrderedDict()  # (satellite, tier index, chunk) -> extrema rows
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _raw(self, satellite, first, last):
+        ticks, records = self.store.window(satellite, first, last)
+        x = np.broadcast_to(ticks[:, None], records['values'].shape)
+        return x, records['values'], x, records['values']
+
+    def _chunk(self, satellite, tier_index, number, count):
+        """Extrema rows of the complete blocks of one rollup chunk."""
+        tier = self.tiers[tier_index]
+        first = number * self.chunk * tier
+        last = min(first + self.chunk * tier, count // tier * tier)
+        key = (satellite, tier_index, number)
+        complete = last == first + self.chunk * tier
+        with self._lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return rows
+            self.misses += 1
+
+        if tier_index == 0:
+            source = self._raw(satellite, first, last)
+            width = tier
+        else:
+            lower = self.tiers[tier_index - 1]
+            source = self._rollup(satellite, tier_index - 1, first // lower, last // lower, count)
+            width = tier // lower
+        rows = _group_extrema(*source, np.arange(0, len(source[1]), width))
+        if complete:
+            with self._lock:
+                self._cache[key] = rows
+                while len(self._cache) > self.cache_chunks:
+                    self._cache.popitem(last=False)
+        return rows
+
+    def _rollup(self, satellite, tier_index, first_block, last_block, count):
+        """Extrema rows of blocks [first_block, last_block) of a tier, all of them complete."""
+        parts = []
+        for number in range(first_block // self.chunk, -(-last_block // self.chunk)):
+            rows = self._chunk(satellite, tier_index, number, count)
+            offset = number * self.chunk
+            lo = max(first_block - offset, 0)
+            hi = min(last_block - offset, self.chunk)
+            parts.append([array[lo:hi] for array in rows])
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    def extrema(self, satellite, first, last, width):
+        """
+        Min and max of every attribute in the buckets [k * width, (k + 1) *
+        width) that overlap ticks [first, last), as (at_min, mins, at_max,
+        maxs), one row per bucket. width is rounded up to a whole number of
+        rollup blocks when MIN_BLOCKS_PER_BUCKET of them fit, so rollup rows
+        never straddle a bucket.
+        """
+        count = self.store.count(satellite)
+        tier_index = max((i for i, tier in enumerate(self.tiers) if tier * MIN_BLOCKS_PER_BUCKET <= width),
+                         default=None)
+        if tier_index is not None:
+            tier = self.tiers[tier_index]
+            width = -(-width // tier) * tier
+            body_first = -(-first // tier) * tier
+            body_last = last // tier * tier
+        if tier_index is None or body_first >= body_last:
+            x, y, _, _ = self._raw(satellite, first, last)
+            starts = x[:, 0]
+            pieces = [(x, y, x, y)]
+        else:
+            head = self._raw(satellite, first, body_first)
+            body = self._rollup(satellite, tier_index, body_first // tier, body_last // tier, count)
+            tail = self._raw(satellite, body_last, last)
+            starts = np.concatenate([head[0][:, 0], np.arange(body_first, body_last, tier), tail[0][:, 0]])
+            pieces = [head, body, tail]
+        rows = [np.concatenate(arrays) for arrays in zip(*pieces)]
+        grid = np.arange(first // width * width, last, width)
+        boundaries = np.unique(np.searchsorted(starts, np.maximum(grid, first)))
+        boundaries = boundaries[boundaries < len(starts)]
+        return _group_extrema(*rows, boundaries)
+
+    def query(self, satellite, start=None, stop=None, by='tick', points=1000, method='lttb'):
+        """
+        About `points` points per attribute of a window (see
+        TelemetryStore.tick_range) as (ticks, timestamps, values), each
+        (points, 10): one column per attribute, since every attribute keeps
+        its own ticks. Windows of at most `points` records come back whole.
+        """
+        if method not in ('minmax', 'lttb'):
+            raise ValueError(f"unknown downsampling method {method!r}, expected 'minmax' or 'lttb'")
+        if points is None or points < MIN_POINTS[method]:
+            raise ValueError(f"{method} needs a points count of at least {MIN_POINTS[method]}")
+        first, last = self.store.tick_range(satellite, start, stop, by)
+        if last - first <= points:
+            x, y, _, _ = self._raw(satellite, first, last)
+        elif method == 'minmax':
+            x, y = _interleave(*self.extrema(satellite, first, last, -(-(last - first) // (points // 2))))
+        else:
+            candidates = points * LTTB_CANDIDATES
+            if last - first <= candidates:
+                x, y, _, _ = self._raw(satellite, first, last)
+            else:
+                x, y = _interleave(*self.extrema(satellite, first, last, -(-(last - first) // (candidates // 2))))
+            x, y = lttb(x, y, points)
+        x = np.ascontiguousarray(x, dtype=np.int64)
+        return x, self.store.timestamps(satellite, x), np.asarray(y)
+
+    def snapshot(self):
+        return {"cached_chunks": len(self._cache), "hits": self.hits, "misses": self.misses}
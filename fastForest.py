@@ -0,0 +1,228 @@
+"""
+Flattened, pure-NumPy version of the pickled
+MultiOutputClassifier(RandomForestClassifier) model, or of a single
+multi-output RandomForestClassifier (train.py --model-kind forest).
+
+All trees of all outputs are stored in one set of contiguous node arrays
+(feature, threshold, children, leaf value) and evaluated together, so a tick
+costs a few dozen array operations instead of 11 sklearn forest calls.
+Predictions are identical to model.predict.
+
+Export once:
+    python fastForest.py model.pkl model_flat.npz
+"""
+import os
+import sys
+import pickle
+import numpy as np
+
+# Rows per chunk when walking the trees, bounds the (rows, trees) work arrays
+CHUNK_SIZE = 1024
+
+# Node and output arrays written by save / save_arrays
+ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots', 'tree_output', 'classes')
+
+
+def _sibling_order(children_left, children_right):
+    # Breadth-first node order where the two children of a node are adjacent
+    order = [0]
+    for node in order:
+        if children_left[node] != -1:
+            order.append(children_left[node])
+            order.append(children_right[node])
+    return np.array(order)
+
+
+class FlatForest:
+    """
+    Node arrays of every tree, laid out so that a node's right child always
+    directly follows its left child: `children[node]` is the left child,
+    `children[node] + 1` the right one and -1 marks a leaf.
+
+    `value` is (nodes, classes) when every tree belongs to one output
+    (`tree_output`), and (nodes, outputs, classes) when every tree predicts
+    all outputs, as in a native multi-output forest.
+    """
+    def __init__(self, feature, threshold, children, value, roots, tree_output, classes, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.tree_output = tree_output
+        self.classes = classes
+        self.feature_names = feature_names
+        self.n_outputs = len(classes)
+
+        # Trees of one output are contiguous, remember where each output's slice starts and ends
+        self._output_slices = []
+        for output in range(self.n_outputs if value.ndim == 2 else 0):
+            trees = np.flatnonzero(tree_output == output)
+            self._output_slices.append(slice(trees[0], trees[-1] + 1))
+
+    @staticmethod
+    def _flatten_tree(tree, offset, n_classes, output_classes, normalize):
+        order = _sibling_order(tree.children_left, tree.children_right)
+        new_id = np.empty_like(order)
+        new_id[order] = np.arange(len(order))
+
+        left = tree.children_left[order]
+        children = np.where(left == -1, -1, new_id[left] + offset)
+        feature = np.where(left == -1, 0, tree.feature[order])
+
+        # Same probabilities DecisionTreeClassifier.predict_proba returns, per output
+        value = np.zeros((tree.node_count, len(output_classes), n_classes))
+        for output, classes in enumerate(output_classes):
+            proba = tree.value[order, output, :len(classes)]
+            if normalize:
+                # The same division predict_proba does, so leaves match to the last bit
+                totals = proba.sum(axis=1, keepdims=True)
+                totals[totals == 0] = 1
+                proba = proba / totals
+            value[:, output, :proba.shape[1]] = proba
+        return feature, tree.threshold[order], children, value
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Flattens a fitted MultiOutputClassifier of RandomForestClassifiers, or
+        a RandomForestClassifier fitted on all outputs at once.
+        """
+        import sklearn
+
+        # sklearn < 1.4 stores class counts in the leaves and divides them by
+        # their sum in every predict_proba; later versions store the
+        # probabilities themselves and return them as they are
+        normalize = tuple(int(part) for part in sklearn.__version__.split('.')[:2]) < (1, 4)
+        native = not hasattr(model.estimators_[0], 'estimators_')
+        if native:
+            forests = [model]
+            output_classes = model.classes_ if model.n_outputs_ > 1 else [model.classes_]
+        else:
+            forests = model.estimators_
+            output_classes = [forest.classes_ for forest in forests]
+        n_classes = max(len(classes) for classes in output_classes)
+
+        features, thresholds, children, values = [], [], [], []
+        roots, tree_output = [], []
+        offset = 0
+        for output, forest in enumerate(forests):
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                feature, threshold, child, value = cls._flatten_tree(
+                    tree, offset, n_classes, output_classes if native else [output_classes[output]], normalize)
+                features.append(feature)
+                thresholds.append(threshold)
+                children.append(child)
+                values.append(value if native else value[:, 0])
+
+                roots.append(offset)
+                tree_output.append(output)
+                offset += tree.node_count
+
+        classes = np.zeros((len(output_classes), n_classes), dtype=output_classes[0].dtype)
+        for output, output_class in enumerate(output_classes):
+            classes[output, :len(output_class)] = output_class
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children).astype(np.intp),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.intp),
+            tree_output=np.array(tree_output, dtype=np.intp),
+            classes=classes,
+            feature_names=getattr(model, 'feature_names_in_', None),
+        )
+
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        if self.feature_names is not None:
+            arrays['feature_names'] = np.asarray(self.feature_names, dtype=str)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        return cls(**arrays)
+
+    def save_arrays(self, directory):
+        """One .npy file per array, so load_arrays can memory-map them."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(directory, name + '.npy'), getattr(self, name))
+        if self.feature_names is not None:
+            np.save(os.path.join(directory, 'feature_names.npy'), np.asarray(self.feature_names, dtype=str))
+
+    @classmethod
+    def load_arrays(cls, directory, mmap_mode='r'):
+        """
+        Opens a save_arrays directory. With mmap_mode='r' nothing is read up
+        front and processes opening the same files share their pages.
+        """
+        # Plain ndarray views of the maps: indexing an np.memmap wraps every
+        # result in a new memmap, which dominated tree walks of small batches
+        arrays = {name: np.asarray(np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode))
+                  for name in ARRAYS}
+        names_path = os.path.join(directory, 'feature_names.npy')
+        if os.path.exists(names_path):
+            arrays['feature_names'] = np.load(names_path)
+        return cls(**arrays)
+
+    def _leaves(self, X):
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        leaves = np.empty(n_rows * n_trees, dtype=np.intp)
+
+        # One entry per (row, tree) still walking down; finished ones are dropped each level
+        pending = np.arange(n_rows * n_trees)
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows) * n_features, n_trees)
+        X = X.ravel()
+        while len(pending):
+            at_leaf = self.children[node] < 0
+            if at_leaf.any():
+                leaves[pending[at_leaf]] = node[at_leaf]
+                walking = ~at_leaf
+                pending, node, row_offset = pending[walking], node[walking], row_offset[walking]
+            go_right = ~(X[row_offset + self.feature[node]] <= self.threshold[node])
+            node = self.children[node] + go_right
+        return leaves.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X):
+        """Per-output class probabilities, shape (rows, outputs, classes)."""
+        # sklearn evaluates trees on float32 input
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        proba = np.empty((len(X), self.n_outputs, self.classes.shape[1]))
+        for start in range(0, len(X), CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            leaf_values = self.value[self._leaves(X[chunk])]
+            if self.value.ndim == 3:
+                # Every tree votes for every output
+                proba[chunk] = np.cumsum(leaf_values, axis=1)[:, -1] / len(self.roots)
+            for output, trees in enumerate(self._output_slices):
+                # Sum trees one after another like RandomForestClassifier does,
+                # so the result is bit-for-bit the same
+                total = np.cumsum(leaf_values[:, trees], axis=1)[:, -1]
+                proba[chunk, output] = total / (trees.stop - trees.start)
+        return proba
+
+    def predict(self, X):
+        """Same output as model.predict: one row of action flags per input row."""
+        proba = self.predict_proba(X)
+        best = np.argmax(proba, axis=2)
+        return self.classes[np.arange(self.n_outputs), best]
+
+
+if __name__ == '__main__':
+    source = sys.argv[1] if len(sys.argv) > 1 else 'model.pkl'
+    target = sys.argv[2] if len(sys.argv) > 2 else 'model_flat.npz'
+    with open(source, 'rb') as f:
+        model = pickle.load(f)
+    flat = FlatForest.from_model(model)
+    flat.save(target)
+    print(f"Exported {len(flat.roots)} trees, {len(flat.feature)} nodes to {target}")
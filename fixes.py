@@ -129,283 +129,186 @@
 #     data = fixes.apply_fixes(data, inputs)
 #     print(data)
 import random
+from functools import partial
 import numpy as np
-import pandas as pd
+from batchSimulation import ATTRIBUTES
+from satelliteState import SatelliteState
+
+# Effects of every action, applied in order. Each effect is
+# (attribute, operation, amount, bound):
+#   '+' -> min(bound, value + amount)
+#   '-' -> max(bound, value - amount)
+#   '=' -> amount
+# `amount` is either a fixed number or a (low, high) range drawn with
+# random.randint, so the draws happen in the same order as the effects.
+ACTION_EFFECTS = {
+    'Reroute power to core functions': [
+        ('Power_Consumption_Rate', '-', (10, 25), 5),
+        ('CPU_GPU_Usage', '-', (10, 20), 5),
+        ('Battery_Level', '+', (8, 15), 100),  # Rerouting power INCREASES battery level
+        ('Temperature', '-', 3, 0),  # Less heat from lower power use
+        ('Component_Health', '+', 2, 100),  # Less stress on components
+    ],
+    'Adjust orientation for passive cooling': [
+        ('Temperature', '-', (10, 20), 0),
+        ('Power_Consumption_Rate', '+', (5, 15), 100),
+        ('Battery_Level', '+', (3, 8), 100),  # Reduced power draw from cooling systems
+        ('CPU_GPU_Usage', '+', 5, 100),  # Additional orientation control
+        ('Component_Health', '+', 2, 100),  # Reduced thermal stress
+    ],
+    'Recalibrate position, tweak pitch, roll, yaw': [
+        ('Debris_Risk_Level', '-', (5, 10), 0),
+        ('Power_Consumption_Rate', '+', (10, 20), 100),
+        ('CPU_GPU_Usage', '+', (8, 15), 100),
+        ('Battery_Level', '-', (1, 3), 0),  # Still uses battery, but less than before
+        ('Signal_Strength', '+', 3, 100),  # Better antenna alignment
+        ('Temperature', '+', 2, 100),  # Heat from thrusters
+    ],
+    'Initiate Docking sequence to ISS': [
+        ('Battery_Health', '+', (20, 50), 100),
+        ('Component_Health', '+', (30, 60), 100),
+        ('Battery_Level', '+', (80, 100), 100),
+        ('Data_Storage_Used', '-', (30, 70), 0),
+        ('Signal_Strength', '+', 20, 100),  # Connected to ISS comms
+        ('Power_Consumption_Rate', '-', 15, 5),  # External power
+        ('CPU_GPU_Usage', '-', 10, 5),  # Offload to ISS systems
+        ('Temperature', '=', 25, None),  # Climate controlled environment
+        ('Solar_Panel_Efficiency', '+', 15, 100),  # Maintenance
+        ('Debris_Risk_Level', '-', 5, 0),  # ISS protection
+    ],
+    'Increase cooling system power': [
+        ('Temperature', '-', (15, 30), 0),
+        ('Power_Consumption_Rate', '+', (10, 20), 100),
+        ('CPU_GPU_Usage', '+', (8, 15), 100),
+        ('Battery_Level', '-', (2, 5), 0),  # More efficient cooling helps battery performance
+        ('Component_Health', '+', 5, 100),  # Reduced thermal stress
+    ],
+    'Adjust antenna position or switch frequency': [
+        ('Signal_Strength', '+', (15, 30), 100),
+        ('Power_Consumption_Rate', '+', (5, 10), 100),
+        ('CPU_GPU_Usage', '+', 5, 100),  # Signal processing
+        ('Battery_Level', '-', (1, 2), 0),  # More efficient orientation means less battery drain
+        ('Data_Storage_Used', '-', 2, 0),  # Transmit cached data
+    ],
+    'Optimize data transmission': [
+        ('Data_Storage_Used', '-', (10, 25), 0),
+        ('CPU_GPU_Usage', '+', (10, 20), 100),
+        ('Signal_Strength', '-', (5, 10), 0),
+        ('Battery_Level', '+', (1, 4), 100),  # Efficient transmission saves power
+        ('Power_Consumption_Rate', '+', 7, 100),  # Processing power
+    ],
+    'Delete unnecessary data': [
+        ('Data_Storage_Used', '-', (20, 40), 0),
+        ('CPU_GPU_Usage', '+', (5, 15), 100),
+        ('Power_Consumption_Rate', '+', 4, 100),  # Processing overhead
+        ('Battery_Level', '+', (3, 7), 100),
+    ],
+    'Adjust pitch, yaw, roll for sunlight absorption': [
+        ('Solar_Panel_Efficiency', '+', (10, 25), 100),
+        ('Power_Consumption_Rate', '+', (5, 10), 100),
+        ('Battery_Level', '+', (15, 25), 100),  # Much better charging
+        ('CPU_GPU_Usage', '+', 3, 100),  # Orientation calculations
+        ('Temperature', '+', 2, 100),  # More sun exposure
+    ],
+    'Disable non-essential systems': [
+        ('Power_Consumption_Rate', '-', (15, 30), 5),
+        ('CPU_GPU_Usage', '-', (10, 20), 5),
+        ('Battery_Level', '+', (10, 20), 100),  # Much more battery savings
+        ('Temperature', '-', 4, 0),  # Less heat generation
+        ('Signal_Strength', '-', 5, 0),  # Comms partially disabled
+    ],
+    'Redistribute workload, reduce power to affected components': [
+        ('CPU_GPU_Usage', '-', (10, 20), 5),
+        ('Power_Consumption_Rate', '-', (8, 15), 5),
+        ('Component_Health', '+', (5, 10), 100),
+        ('Battery_Level', '+', (5, 12), 100),  # Better power management
+        ('Temperature', '-', 3, 0),  # Better heat distribution
+    ],
+}
+
+# (action index, effect index) of every effect with a (low, high) amount, in
+# order: the columns of the `uniforms` apply_fixes_batch can take
+RANDOM_EFFECTS = [(action_index, effect_index)
+                  for action_index, effects in enumerate(ACTION_EFFECTS.values())
+                  for effect_index, (_, _, amount, _) in enumerate(effects) if isinstance(amount, tuple)]
+_RANDOM_COLUMN = {effect: column for column, effect in enumerate(RANDOM_EFFECTS)}
+
+
+def _apply_effect(value, operation, amount, bound):
+    if operation == '+':
+        return min(bound, value + amount)
+    if operation == '-':
+        return max(bound, value - amount)
+    return amount
+
+
+def _apply_effect_batch(column, operation, amount, bound):
+    if operation == '+':
+        return np.minimum(bound, column + amount)
+    if operation == '-':
+        return np.maximum(bound, column - amount)
+    return np.full_like(column, amount)
 
 
 class Fixes:
     def __init__(self):
-        self.actions = {
-            'Reroute power to core functions': self.reroute_power,
-            'Adjust orientation for passive cooling': self.passive_cooling,
-            'Recalibrate position, tweak pitch, roll, yaw': self.recalibrate_position,
-            'Initiate Docking sequence to ISS': self.initiate_docking,
-            'Increase cooling system power': self.increase_cooling,
-            'Adjust antenna position or switch frequency': self.adjust_antenna,
-            'Optimize data transmission': self.optimize_transmission,
-            'Delete unnecessary data': self.delete_data,
-            'Adjust pitch, yaw, roll for sunlight absorption': self.adjust_sunlight_absorption,
-            'Disable non-essential systems': self.disable_non_essential_systems,
-            'Redistribute workload, reduce power to affected components': self.redistribute_workload
-        }
-
-    def reroute_power(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes
-        power_reduction = random.randint(10, 25)
-        cpu_reduction = random.randint(10, 20)
-        
-        # Apply primary changes - IMPROVED BATTERY IMPACT
-        attributes['Power_Consumption_Rate'] = max(5, attributes['Power_Consumption_Rate'] - power_reduction)
-        attributes['CPU_GPU_Usage'] = max(5, attributes['CPU_GPU_Usage'] - cpu_reduction)
-        # Instead of draining battery, now rerouting power INCREASES battery level
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(8, 15))
-        
-        # Apply secondary effects
-        attributes['Temperature'] = max(0, attributes['Temperature'] - 3)  # Less heat from lower power use
-        attributes['Component_Health'] = min(100, attributes['Component_Health'] + 2)  # Less stress on components
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def passive_cooling(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes
-        temp_reduction = random.randint(10, 20)
-        power_increase = random.randint(5, 15)
-        
-        # Apply primary changes - IMPROVED BATTERY IMPACT
-        attributes['Temperature'] = max(0, attributes['Temperature'] - temp_reduction)
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + power_increase)
-        # Reduced power draw from cooling systems saves more battery
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(3, 8))
-        
-        # Apply secondary effects
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + 5)  # Additional orientation control
-        attributes['Component_Health'] = min(100, attributes['Component_Health'] + 2)  # Reduced thermal stress
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def recalibrate_position(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes
-        debris_reduction = random.randint(5, 10)
-        power_increase = random.randint(10, 20)
-        cpu_increase = random.randint(8, 15)
-        
-        # Apply primary changes - MODERATE BATTERY IMPACT
-        attributes['Debris_Risk_Level'] = max(0, attributes['Debris_Risk_Level'] - debris_reduction)
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + power_increase)
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + cpu_increase)
-        
-        # Still uses battery, but less than before
-        attributes['Battery_Level'] = max(0, attributes['Battery_Level'] - random.randint(1, 3))
-        
-        # Apply secondary effects
-        attributes['Signal_Strength'] = min(100, attributes['Signal_Strength'] + 3)  # Better antenna alignment
-        attributes['Temperature'] = min(100, attributes['Temperature'] + 2)  # Heat from thrusters
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def initiate_docking(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - GREATLY IMPROVED BATTERY IMPACT
-        battery_health_boost = random.randint(20, 50)
-        component_health_boost = random.randint(30, 60)
-        battery_level_boost = random.randint(80, 100)  # Increased from 50-100 to 80-100
-        data_storage_reduction = random.randint(30, 70)
-        
-        # Apply primary changes
-        attributes['Battery_Health'] = min(100, attributes['Battery_Health'] + battery_health_boost)
-        attributes['Component_Health'] = min(100, attributes['Component_Health'] + component_health_boost)
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + battery_level_boost)
-        attributes['Data_Storage_Used'] = max(0, attributes['Data_Storage_Used'] - data_storage_reduction)
-        
-        # Apply secondary effects
-        attributes['Signal_Strength'] = min(100, attributes['Signal_Strength'] + 20)  # Connected to ISS comms
-        attributes['Power_Consumption_Rate'] = max(5, attributes['Power_Consumption_Rate'] - 15)  # External power
-        attributes['CPU_GPU_Usage'] = max(5, attributes['CPU_GPU_Usage'] - 10)  # Offload to ISS systems
-        attributes['Temperature'] = 25  # Climate controlled environment
-        attributes['Solar_Panel_Efficiency'] = min(100, attributes['Solar_Panel_Efficiency'] + 15)  # Maintenance
-        attributes['Debris_Risk_Level'] = max(0, attributes['Debris_Risk_Level'] - 5)  # ISS protection
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def increase_cooling(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes
-        temp_reduction = random.randint(15, 30)
-        power_increase = random.randint(10, 20)
-        cpu_increase = random.randint(8, 15)
-        
-        # Apply primary changes - IMPROVED BATTERY IMPACT
-        attributes['Temperature'] = max(0, attributes['Temperature'] - temp_reduction)
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + power_increase)
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + cpu_increase)
-        
-        # Apply secondary effects - More efficient cooling helps battery performance
-        attributes['Battery_Level'] = max(0, attributes['Battery_Level'] - random.randint(2, 5))  # Reduced from -8
-        attributes['Component_Health'] = min(100, attributes['Component_Health'] + 5)  # Reduced thermal stress
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def adjust_antenna(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes
-        signal_boost = random.randint(15, 30)
-        power_increase = random.randint(5, 10)
-        
-        # Apply primary changes - IMPROVED BATTERY IMPACT
-        attributes['Signal_Strength'] = min(100, attributes['Signal_Strength'] + signal_boost)
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + power_increase)
-        
-        # Apply secondary effects - More efficient orientation means less battery drain
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + 5)  # Signal processing
-        attributes['Battery_Level'] = max(0, attributes['Battery_Level'] - random.randint(1, 2))  # Reduced from -3
-        attributes['Data_Storage_Used'] = max(0, attributes['Data_Storage_Used'] - 2)  # Transmit cached data
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def optimize_transmission(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - IMPROVED BATTERY IMPACT
-        data_reduction = random.randint(10, 25)
-        cpu_increase = random.randint(10, 20)
-        signal_reduction = random.randint(5, 10)
-        
-        # Apply primary changes
-        attributes['Data_Storage_Used'] = max(0, attributes['Data_Storage_Used'] - data_reduction)
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + cpu_increase)
-        attributes['Signal_Strength'] = max(0, attributes['Signal_Strength'] - signal_reduction)
-        
-        # Apply secondary effects - Efficient transmission saves power
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(1, 4))  # Changed from -5 to +1-4
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + 7)  # Processing power
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def delete_data(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - IMPROVED BATTERY IMPACT
-        data_reduction = random.randint(20, 40)
-        cpu_increase = random.randint(5, 15)
-        
-        # Apply primary changes
-        attributes['Data_Storage_Used'] = max(0, attributes['Data_Storage_Used'] - data_reduction)
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + cpu_increase)
-        
-        # Apply secondary effects
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + 4)  # Processing overhead
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(3, 7))  # Changed from -2 to +3-7
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def adjust_sunlight_absorption(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - GREATLY IMPROVED BATTERY IMPACT
-        solar_boost = random.randint(10, 25)
-        power_increase = random.randint(5, 10)
-        
-        # Apply primary changes
-        attributes['Solar_Panel_Efficiency'] = min(100, attributes['Solar_Panel_Efficiency'] + solar_boost)
-        attributes['Power_Consumption_Rate'] = min(100, attributes['Power_Consumption_Rate'] + power_increase)
-        
-        # Apply secondary effects - Much better charging
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(15, 25))  # Increased from +5
-        attributes['CPU_GPU_Usage'] = min(100, attributes['CPU_GPU_Usage'] + 3)  # Orientation calculations
-        attributes['Temperature'] = min(100, attributes['Temperature'] + 2)  # More sun exposure
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def disable_non_essential_systems(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - GREATLY IMPROVED BATTERY IMPACT
-        power_reduction = random.randint(15, 30)
-        cpu_reduction = random.randint(10, 20)
-        
-        # Apply primary changes
-        attributes['Power_Consumption_Rate'] = max(5, attributes['Power_Consumption_Rate'] - power_reduction)
-        attributes['CPU_GPU_Usage'] = max(5, attributes['CPU_GPU_Usage'] - cpu_reduction)
-        
-        # Apply secondary effects - Much more battery savings
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(10, 20))  # Increased from +3
-        attributes['Temperature'] = max(0, attributes['Temperature'] - 4)  # Less heat generation
-        attributes['Signal_Strength'] = max(0, attributes['Signal_Strength'] - 5)  # Comms partially disabled
-        
-        # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
-
-    def redistribute_workload(self, attributes_df: pd.DataFrame) -> pd.DataFrame:
-        attributes = attributes_df.iloc[0].to_dict()
-        # Direct changes - IMPROVED BATTERY IMPACT
-        cpu_reduction = random.randint(10, 20)
-        power_reduction = random.randint(8, 15)
-        component_health_boost = random.randint(5, 10)
-        
-        # Apply primary changes
-        attributes['CPU_GPU_Usage'] = max(5, attributes['CPU_GPU_Usage'] - cpu_reduction)
-        attributes['Power_Consumption_Rate'] = max(5, attributes['Power_Consumption_Rate'] - power_reduction)
-        attributes['Component_Health'] = min(100, attributes['Component_Health'] + component_health_boost)
-        
-        # Apply secondary effects - Better power management
-        attributes['Battery_Level'] = min(100, attributes['Battery_Level'] + random.randint(5, 12))  # Increased from +2
-        attributes['Temperature'] = max(0, attributes['Temperature'] - 3)  # Better heat distribution
-        
+        # partial rather than a closure so a Fixes instance can be sent to worker processes
+        self.actions = {name: partial(self.apply_action, name) for name in ACTION_EFFECTS}
+
+    def apply_action(self, name: str, attributes: SatelliteState) -> SatelliteState:
+        for attribute, operation, amount, bound in ACTION_EFFECTS[name]:
+            if isinstance(amount, tuple):
+                amount = random.randint(*amount)
+            attributes[attribute] = _apply_effect(attributes[attribute], operation, amount, bound)
+
         # Round values
-        for key in attributes:
-            attributes[key] = round(attributes[key], 2)
-            
-        return pd.DataFrame([attributes])
+        return attributes.round(2)
 
-    def apply_fixes(self, data: pd.DataFrame, inputs: np.ndarray) -> pd.DataFrame:
+    def apply_fixes(self, data: SatelliteState, inputs: np.ndarray) -> SatelliteState:
         for i, (action_name, action_func) in zip(inputs[0], self.actions.items()):
             if i == 1:  # Execute only if the inputs value is 1
                 print(f"Executing action: {action_name}")
                 data = action_func(data)
         return data
 
+    def apply_fixes_batch(self, states: np.ndarray, inputs: np.ndarray, rng=None, uniforms=None) -> np.ndarray:
+        """
+        Batched apply_fixes: `states` is an (N, 10) array in ATTRIBUTES order
+        and `inputs` the (N, 11) prediction matrix, one row per satellite.
+        Every selected action is applied to its rows, in action order, in place,
+        and its rows are rounded after it, so each row ends up where
+        apply_fixes would take it with the same amounts.
+
+        The random amounts come from `rng`, or from `uniforms`, an (N,
+        len(RANDOM_EFFECTS)) array of draws in [0, 1), so that each row's
+        amounts can come from its own random stream.
+        """
+        if rng is None and uniforms is None:
+            rng = np.random.default_rng()
+        inputs = np.asarray(inputs).reshape(len(states), len(ACTION_EFFECTS))
+
+        for action_index, effects in enumerate(ACTION_EFFECTS.values()):
+            selected = inputs[:, action_index] == 1
+            if not selected.any():
+                continue
+            for effect_index, (attribute, operation, amount, bound) in enumerate(effects):
+                if isinstance(amount, tuple) and uniforms is not None:
+                    draws = uniforms[:, _RANDOM_COLUMN[action_index, effect_index]]
+                    amount = amount[0] + (draws * (amount[1] - amount[0] + 1)).astype(np.int64)
+                elif isinstance(amount, tuple):
+                    amount = rng.integers(amount[0], amount[1] + 1, len(states))
+                column = ATTRIBUTES.index(attribute)
+                updated = _apply_effect_batch(states[:, column], operation, amount, bound)
+                states[:, column] = np.where(selected, updated, states[:, column])
+
+            # Round values after every action, like apply_action does
+            states[selected] = np.round(states[selected], 2)
+        return states
+
 
 # Example usage
 if __name__ == "__main__":
-    data = pd.DataFrame([{
+    data = SatelliteState.from_dict({
         "Battery_Level": 90.0,
         "Battery_Health": 40.0,
         "Signal_Strength": 80.0,
@@ -416,7 +319,7 @@ if __name__ == "__main__":
         "Temperature": 25.0,
         "Data_Storage_Used": 21.27,
         "Debris_Risk_Level": 2.25
-    }])
+    })
     inputs = np.array([[0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0]])
     fixes = Fixes()
     data = fixes.apply_fixes(data, inputs)
@@ -0,0 +1,118 @@
+import numpy as np
+
+from batchSimulation import ATTRIBUTES, initialize_batch
+from frames import FLEET_FORMATS, FLEET_REDUCE
+
+
+class Fleet:
+    """
+    Every satellite of a fleet as one (satellites, 10) array, advanced a
+    tick at a time by batchSimulation and Fixes.apply_fixes_batch. A
+    satellite's id is its row.
+    """
+    __slots__ = ('values', 'rng')
+
+    def __init__(self, size, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.values = initialize_batch(size, self.rng)
+
+
+class FleetView:
+    """
+    What one /fleet connection asked for: the satellites (None for all), the
+    attribute columns, the format, and `every`, which sends only every n-th
+    tick. With reduce='last' that tick's values are sent and connections with
+    the same view share the encoded message; with reduce='minmax' each
+    message has the minimum and maximum of every value over the ticks since
+    the previous one, so short spikes between messages are not lost.
+    """
+    __slots__ = ('ids', 'columns', 'format', 'every', 'reduce', 'key')
+
+    def __init__(self, ids=None, columns=None, format='json', every=1, reduce='last'):
+        self.ids = None if ids is None else np.asarray(ids, dtype=np.intp)
+        self.columns = list(range(len(ATTRIBUTES))) if columns is None else list(columns)
+        self.format = format
+        self.every = every
+        self.reduce = reduce
+        self.key = (format, None if ids is None else self.ids.tobytes(), tuple(self.columns), reduce)
+
+    def wants(self, frame):
+        return frame.seq % self.every == 0
+
+    def select(self, values):
+        """The view's satellite ids and their rows of the view's columns, from fleet `values`."""
+        ids = self.ids if self.ids is not None else np.arange(len(values))
+        return ids, values[ids][:, self.columns]
+
+
+class FleetExtrema:
+    """Running minimum and maximum of one connection's rows, for reduce='minmax'."""
+    __slots__ = ('mins', 'maxs')
+
+    def __init__(self):
+        self.mins = None
+        self.maxs = None
+
+    def add(self, rows):
+        if self.mins is None:
+            self.mins = rows.copy()
+            self.maxs = rows.copy()
+        else:
+            np.minimum(self.mins, rows, out=self.mins)
+            np.maximum(self.maxs, rows, out=self.maxs)
+
+    def take(self):
+        """(mins, maxs) since the last take, and starts over."""
+        extrema = self.mins, self.maxs
+        self.mins = self.maxs = None
+        return extrema
+
+
+def _parse_ids(text, fleet_size):
+    # "0-99,250,300-310"
+    ids = set()
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if first > last:
+            raise ValueError(f"empty satellite range {part!r}")
+        # Checked before expanding, so a huge range never gets materialized
+        if first < 0 or last >= fleet_size:
+            raise ValueError(f"satellite ids must be between 0 and {fleet_size - 1}")
+        ids.update(range(first, last + 1))
+    return sorted(ids)
+
+
+def parse_view(fleet_size, satellites=None, attributes=None, every=1, format='json', reduce='last'):
+    """
+    FleetView from the /fleet query parameters, e.g.
+    ?satellites=0-99,250&attributes=Battery_Level,Temperature&every=5&format=binary&reduce=minmax.
+    Raises ValueError with a message for the client on bad input.
+    """
+    if format not in FLEET_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FLEET_FORMATS)}")
+    if reduce not in FLEET_REDUCE:
+        raise ValueError(f"reduce must be one of {', '.join(FLEET_REDUCE)}")
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    try:
+        ids = _parse_ids(satellites, fleet_size) if satellites else None
+    except ValueError as e:
+        raise ValueError(f"bad satellites {satellites!r}: {e}") from None
+
+    return FleetView(ids, parse_attributes(attributes), format, every, reduce)
+
+
+def parse_attributes(attributes):
+    """
+    Sorted column indices of a comma-separated list of attribute names, None
+    for all of them. Raises ValueError naming the unknown ones.
+    """
+    if not attributes:
+        return None
+    names = [name.strip() for name in attributes.split(',')]
+    unknown = [name for name in names if name not in ATTRIBUTES]
+    if unknown:
+        raise ValueError(f"unknown attributes {', '.join(unknown)}")
+    return sorted({ATTRIBUTES.index(name) for name in names})
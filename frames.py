@@ -0,0 +1,211 @@
+import json
+import struct
+import time
+
+import numpy as np
+
+from batchSimulation import ATTRIBUTES
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard library encoder
+    orjson = None
+
+FORMATS = ('json', 'binary', 'delta')
+
+# Little-endian: uint32 sequence number, float64 unix timestamp, then the
+# 10 attributes as float32 in ATTRIBUTES order. 52 bytes per frame.
+BINARY_LAYOUT = struct.Struct('<Id' + 'f' * len(ATTRIBUTES))
+
+# 'delta' format: every message starts with a uint8 kind, uint32 seq and
+# float64 timestamp. A keyframe then carries all 10 float32 values, a delta
+# frame a uint16 bitmask of the changed attributes followed by only their
+# float32 values, in ATTRIBUTES order.
+KEYFRAME = 0
+DELTA = 1
+DELTA_HEADER = struct.Struct('<BId')
+DELTA_MASK = struct.Struct('<H')
+KEYFRAME_INTERVAL = 10  # ticks
+
+# Fleet frames (/fleet): formats, and the binary header of uint32 seq,
+# float64 timestamp, uint32 satellite count and a uint16 bitmask of the
+# attributes sent. Then one uint32 id per satellite and the float32 values,
+# row by row, of the masked attributes in ATTRIBUTES order.
+FLEET_FORMATS = ('json', 'binary')
+FLEET_HEADER = struct.Struct('<IdIH')
+# ?reduce=minmax: the top bit of the mask is set and every satellite's row
+# of minimums since the previous message is followed by the rows of maximums
+FLEET_REDUCE = ('last', 'minmax')
+FLEET_MINMAX = 1 << 15
+
+
+def encode_json(record):
+    if orjson is not None:
+        return orjson.dumps(record).decode()
+    return json.dumps(record, separators=(',', ':'))
+
+
+class Frame:
+    """
+    One tick of one satellite. Each format is encoded at most once, so every
+    subscriber of a session is sent the very same str / bytes object.
+    """
+    __slots__ = ('seq', 'timestamp', 'values', 'previous', '_encoded')
+
+    def __init__(self, seq, values, timestamp=None, previous=None):
+        self.seq = seq
+        self.values = np.array(values, dtype=np.float64)
+        self.timestamp = time.time() if timestamp is None else timestamp
+        # Values of frame seq - 1 of the same stream, for the 'delta' format
+        self.previous = previous
+        self._encoded = {}
+
+    def encode(self, fmt='json'):
+        """
+        str for 'json' (sent as a text message), bytes for the others.
+        'delta' is the change against `previous`, or a keyframe every
+        KEYFRAME_INTERVAL ticks; 'keyframe' is always the full frame.
+        """
+        encoded = self._encoded.get(fmt)
+        if encoded is None:
+            seq = self.seq & 0xFFFFFFFF
+            if fmt == 'json':
+                encoded = encode_json(dict(zip(ATTRIBUTES, self.values.tolist())))
+            elif fmt == 'binary':
+                encoded = BINARY_LAYOUT.pack(seq, self.timestamp, *self.values.tolist())
+            elif fmt == 'keyframe' or (fmt == 'delta' and (self.previous is None or self.seq % KEYFRAME_INTERVAL == 0)):
+                encoded = (DELTA_HEADER.pack(KEYFRAME, seq, self.timestamp)
+                           + self.values.astype('<f4').tobytes())
+            elif fmt == 'delta':
+                # Compare what is actually on the wire, float32
+                values = self.values.astype('<f4')
+                changed = values != np.asarray(self.previous).astype('<f4')
+                mask = int(np.dot(changed, 1 << np.arange(len(ATTRIBUTES))))
+                encoded = (DELTA_HEADER.pack(DELTA, seq, self.timestamp) + DELTA_MASK.pack(mask)
+                           + values[changed].tobytes())
+            else:
+                raise ValueError(f"unknown frame format {fmt!r}, expected one of {FORMATS}")
+            self._encoded[fmt] = encoded
+        return encoded
+
+
+class FleetFrame(Frame):
+    """
+    One tick of a whole fleet: `values` is (satellites, 10) and a satellite's
+    id is its row. Each view (satellites, attributes, format) is encoded once
+    per tick, shared by every connection subscribed to that same view.
+    """
+    __slots__ = ()
+
+    def encode_view(self, view):
+        encoded = self._encoded.get(view.key)
+        if encoded is None:
+            seq = self.seq & 0xFFFFFFFF
+            ids, rows = view.select(self.values)
+            if view.format == 'json':
+                encoded = encode_json({
+                    "seq": seq,
+                    "timestamp": self.timestamp,
+                    "attributes": [ATTRIBUTES[i] for i in view.columns],
+                    "ids": ids.tolist(),
+                    "rows": rows.tolist(),
+                })
+            elif view.format == 'binary':
+                mask = int(np.sum(1 << np.asarray(view.columns)))
+                encoded = (FLEET_HEADER.pack(seq, self.timestamp, len(ids), mask)
+                           + ids.astype('<u4').tobytes() + rows.astype('<f4').tobytes())
+            else:
+                raise ValueError(f"unknown fleet format {view.format!r}, expected one of {FLEET_FORMATS}")
+            self._encoded[view.key] = encoded
+        return encoded
+
+    def encode_extrema(self, view, mins, maxs):
+        """
+        A ?reduce=minmax message: the minimum and maximum rows of the view's
+        satellites over the ticks since the previous message. Not cached, the
+        extrema are the connection's own.
+        """
+        seq = self.seq & 0xFFFFFFFF
+        ids = view.ids if view.ids is not None else np.arange(len(self.values))
+        if view.format == 'json':
+            return encode_json({
+                "seq": seq,
+                "timestamp": self.timestamp,
+                "attributes": [ATTRIBUTES[i] for i in view.columns],
+                "ids": ids.tolist(),
+                "min": mins.tolist(),
+                "max": maxs.tolist(),
+            })
+        if view.format == 'binary':
+            mask = int(np.sum(1 << np.asarray(view.columns))) | FLEET_MINMAX
+            return (FLEET_HEADER.pack(seq, self.timestamp, len(ids), mask) + ids.astype('<u4').tobytes()
+                    + mins.astype('<f4').tobytes() + maxs.astype('<f4').tobytes())
+        raise ValueError(f"unknown fleet format {view.format!r}, expected one of {FLEET_FORMATS}")
+
+
+class DeltaStream:
+    """
+    Per-connection side of the 'delta' format. Sends the frame's shared delta
+    bytes while the connection has seen every previous tick, and a keyframe
+    after a gap (first frame, or frames dropped for a slow viewer).
+    """
+
+    def __init__(self):
+        self.last_seq = None
+
+    def encode(self, frame):
+        if self.last_seq is not None and frame.seq == self.last_seq + 1:
+            payload = frame.encode('delta')
+        else:
+            payload = frame.encode('keyframe')
+        self.last_seq = frame.seq
+        return payload
+
+
+def connection_encoder(fmt):
+    """Frame -> payload function for one connection using format `fmt`."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown frame format {fmt!r}, expected one of {FORMATS}")
+    if fmt == 'delta':
+        return DeltaStream().encode
+    return lambda frame: frame.encode(fmt)
+
+
+def decode_binary(payload):
+    """Inverse of Frame.encode('binary'): (seq, timestamp, {attribute: value})."""
+    seq, timestamp, *values = BINARY_LAYOUT.unpack(payload)
+    return seq, timestamp, dict(zip(ATTRIBUTES, values))
+
+
+def decode_delta(payload, current=None):
+    """
+    Applies one 'delta' message to `current` ({attribute: value}, None before
+    the first keyframe). Returns (seq, timestamp, updated record).
+    """
+    kind, seq, timestamp = DELTA_HEADER.unpack_from(payload)
+    body = payload[DELTA_HEADER.size:]
+    if kind == KEYFRAME:
+        return seq, timestamp, dict(zip(ATTRIBUTES, np.frombuffer(body, '<f4').tolist()))
+    (mask,) = DELTA_MASK.unpack_from(body)
+    values = iter(np.frombuffer(body[DELTA_MASK.size:], '<f4').tolist())
+    record = dict(current)
+    for i, name in enumerate(ATTRIBUTES):
+        if mask & (1 << i):
+            record[name] = next(values)
+    return seq, timestamp, record
+
+
+def decode_fleet(payload):
+    """
+    Inverse of FleetFrame.encode_view in 'binary': (seq, timestamp, ids,
+    {id: {attribute: value}}). For a ?reduce=minmax message each value is a
+    (min, max) pair.
+    """
+    seq, timestamp, count, mask = FLEET_HEADER.unpack_from(payload)
+    names = [name for i, name in enumerate(ATTRIBUTES) if mask & (1 << i)]
+    ids = np.frombuffer(payload, '<u4', count, FLEET_HEADER.size)
+    rows = np.frombuffer(payload, '<f4', offset=FLEET_HEADER.size + ids.nbytes).reshape(-1, count, len(names))
+    if mask & FLEET_MINMAX:
+        rows = rows.transpose(1, 2, 0).tolist()
+        return seq, timestamp, ids.tolist(), {i: dict(zip(names, map(tuple, row))) for i, row in zip(ids.tolist(), rows)}
+    return seq, timestamp, ids.tolist(), {i: dict(zip(names, row)) for i, row in zip(ids.tolist(), rows[0].tolist())}
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+
+class InferenceMetrics:
+    """Batch sizes and queue latencies of the most recent `window` batches / rows."""
+
+    def __init__(self, window=1000):
+        self.batches = 0
+        self.rows = 0
+        self.short_circuited = 0
+        self.fallbacks = 0
+        self.batch_sizes = deque(maxlen=window)
+        self.queue_latencies = deque(maxlen=window)
+
+    def record(self, batch_size, latencies):
+        self.batches += 1
+        self.rows += batch_size
+        self.batch_sizes.append(batch_size)
+        self.queue_latencies.extend(latencies)
+
+    def snapshot(self):
+        sizes = np.array(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+        latencies_ms = np.array(self.queue_latencies) * 1000 if self.queue_latencies else np.zeros(1)
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "short_circuited": self.short_circuited,
+            "fallbacks": self.fallbacks,
+            "batch_size_mean": float(sizes.mean()),
+            "batch_size_max": int(sizes.max()),
+            "queue_latency_ms_p50": float(np.percentile(latencies_ms, 50)),
+            "queue_latency_ms_p99": float(np.percentile(latencies_ms, 99)),
+            "queue_latency_ms_max": float(latencies_ms.max()),
+        }
+
+
+class InferenceScheduler:
+    """
+    Collects rows from every websocket into one model.predict call.
+
+    A batch is closed when `max_batch_size` rows are waiting or `max_wait`
+    seconds after its first row arrived, whichever comes first. Each caller
+    awaits predict() and gets back its own (1, n_actions) prediction row.
+    With a `pool` (workers.WorkerPool) the batched predict runs off the event loop.
+
+    With an `engine` (ruleEngine.RuleEngine) rows the rules can answer in its
+    mode return straight away without waiting for a batch, and a batch whose
+    predict fails is answered from the rules instead.
+    """
+
+    def __init__(self, model, max_batch_size=256, max_wait=0.005, pool=None, engine=None):
+        self.model = model
+        self.pool = pool
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = InferenceMetrics()
+        self._queue = None
+        self._full = None
+        self._task = None
+        # Rows _next_batch has already taken off the queue for the batch it is collecting
+        self._taken = 0
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, row):
+        row = np.asarray(row, dtype=np.float64)
+        if self.engine is not None and not self.engine.needs_model(row)[0]:
+            self.metrics.short_circuited += 1
+            return self.engine.predict(row)
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future, time.perf_counter()))
+        if self._taken + self._queue.qsize() >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        self._taken = len(batch)
+        if self.max_wait > 0 and self._taken + self._queue.qsize() < self.max_batch_size:
+            self._full.clear()
+            try:
+                await asyncio.wait_for(self._full.wait(), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+        self._taken = 0
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            await self.run_batch(batch)
+
+    async def run_batch(self, batch):
+        rows, futures, queued_at = zip(*batch)
+        started = time.perf_counter()
+        try:
+            if self.pool is not None:
+                predictions = await self.pool.predict(np.vstack(rows))
+            else:
+                predictions = self.model.predict(np.vstack(rows))
+        except Exception as e:
+            if self.engine is None:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            print(f"Inference Error: {e}, answering {len(batch)} rows from the rules")
+            self.metrics.fallbacks += len(batch)
+            predictions = self.engine.predict(np.vstack(rows))
+
+        self.metrics.record(len(batch), [started - t for t in queued_at])
+        for i, future in enumerate(futures):
+            # Connection may have gone away while its row was queued
+            if not future.done():
+                future.set_result(predictions[i:i + 1])
@@ -1,31 +1,223 @@
-from fastapi import FastAPI, WebSocket
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket
 import asyncio
-from mainfuncUsingPandas import *
 import os
+import random
+import numpy as np
+from mainfuncUsingPandas import apply_event, events, initialize_attributes
 from fixes import Fixes
-import pickle
+from modelRegistry import MODEL_PATH, ModelRegistry
+from inference import InferenceScheduler
+from ruleEngine import RuleEngine, BOUNDARY_MARGIN
+import workers
+from sessions import PubSubHub, SessionManager
+from frames import FORMATS, FleetFrame, connection_encoder
+from batchSimulation import apply_events, random_events
+from fleet import Fleet, FleetExtrema, parse_attributes, parse_view
+from telemetryStore import TelemetryStore
+from downsample import METHODS, MIN_POINTS, Downsampler
+from batchSimulation import ATTRIBUTES
 
-app = FastAPI()
+# Micro-batching of predictions across all connections
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', 256))
+INFERENCE_MAX_WAIT = float(os.environ.get('INFERENCE_MAX_WAIT', 0.005))  # seconds
+# rules / model / hybrid (model only near a rule threshold), see ruleEngine.py
+INFERENCE_MODE = os.environ.get('INFERENCE_MODE', 'hybrid')
+INFERENCE_BOUNDARY_MARGIN = float(os.environ.get('INFERENCE_BOUNDARY_MARGIN', BOUNDARY_MARGIN))
+# Ticks per second of every session (up to 100), and how many times faster
+# than real time they are played, 0 for as fast as possible (replay, soak tests)
+TICK_RATE = float(os.environ.get('TICK_RATE', 1))
+SIMULATION_SPEED = float(os.environ.get('SIMULATION_SPEED', 1))
+# Satellites simulated together for the /fleet endpoint
+FLEET_SIZE = int(os.environ.get('FLEET_SIZE', 500))
+# Where every tick is kept for the history queries. Off unless set: the
+# history grows without bound (about 48 bytes per satellite per tick)
+TELEMETRY_DIR = os.environ.get('TELEMETRY_DIR', '')
 
-with open('model.pkl','rb') as f:
-    model = pickle.load(f)
+# Flattened copy of the forest, memory-mapped on the first prediction that needs it
+model = ModelRegistry(os.environ.get('MODEL_PATH', MODEL_PATH))
 
+# CPU work of every tick runs here instead of on the event loop (WORKER_KIND, WORKER_COUNT)
+pool = workers.from_environment(model, model.model_path)
+engine = RuleEngine(INFERENCE_MODE, INFERENCE_BOUNDARY_MARGIN)
+scheduler = InferenceScheduler(model, INFERENCE_MAX_BATCH_SIZE, INFERENCE_MAX_WAIT, pool, engine)
+fixes = Fixes()
+telemetry = TelemetryStore(TELEMETRY_DIR) if TELEMETRY_DIR else None
+# minmax / lttb history queries, with the rollups cached across queries
+downsampler = Downsampler(telemetry) if telemetry else None
+
+async def advance(data):
+    data = await pool.run(apply_event, random.choice(events), data)
+    pred = await scheduler.predict(data.values)
+    return await pool.run(fixes.apply_fixes, data, pred)
+
+def record_session(session_id, frame):
+    telemetry.append(session_id, frame.values, frame.timestamp)
+
+# One simulation per session id, shared by every websocket watching it
+hub = PubSubHub()
+sessions = SessionManager(hub, initialize_attributes, advance, 1 / TICK_RATE, SIMULATION_SPEED,
+                          record=record_session if telemetry else None)
+
+async def advance_fleet(fleet):
+    values = await pool.run(apply_events, fleet.values, random_events(len(fleet.values), fleet.rng))
+    # The fleet is already a batch, only the rows near a rule threshold go to the model
+    pred = engine.predict(values)
+    needs_model = engine.needs_model(values)
+    if needs_model.any():
+        pred[needs_model] = await pool.predict(values[needs_model])
+    # A child generator per tick, so a process worker does not replay the same draws
+    fleet.values = await pool.run(fixes.apply_fixes_batch, values, pred, fleet.rng.spawn(1)[0])
+    return fleet
+
+# Fleet satellite i is kept in the telemetry history as 'fleet-i'
+FLEET_IDS = [f'fleet-{i}' for i in range(FLEET_SIZE)]
+
+def record_fleet(_, frame):
+    telemetry.append_many(FLEET_IDS, frame.values, frame.timestamp)
+
+# The whole fleet as one simulation, shared by every /fleet connection
+fleet_hub = PubSubHub()
+fleets = SessionManager(fleet_hub, lambda: Fleet(FLEET_SIZE), advance_fleet, 1 / TICK_RATE, SIMULATION_SPEED,
+                        FleetFrame, record_fleet if telemetry else None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler.start()
+    yield
+    await sessions.stop_all()
+    await fleets.stop_all()
+    if telemetry:
+        await asyncio.to_thread(telemetry.close)
+    await scheduler.stop()
+    pool.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get('/metrics')
+async def metrics():
+    return {"inference": scheduler.metrics.snapshot(), "sessions": sessions.snapshot(), "fleet": fleets.snapshot(),
+            "downsampling": downsampler.snapshot() if downsampler else None}
+
+@app.get('/telemetry')
+async def telemetrySatellites():
+    if telemetry is None:
+        raise HTTPException(404, "telemetry history is disabled (TELEMETRY_DIR)")
+    def listing():
+        return [{"id": satellite, "ticks": telemetry.count(satellite)} for satellite in telemetry.satellites()]
+    return {"satellites": await asyncio.to_thread(listing)}
+
+# History of one satellite (a session id, or fleet-<id>): ticks start to stop
+# (?by=tick, default) or unix timestamps start to stop (?by=time), either
+# side open when left out; ?attributes= picks columns like /fleet does.
+# ?points=N brings a longer window down to about N points per attribute:
+# ?method=stride (default) keeps every n-th record, minmax the minimum and
+# maximum of each bucket and lttb the points that best keep the shape.
+# minmax and lttb pick different ticks per attribute, so they answer with
+# one entry per attribute under "series" instead of shared ticks.
+@app.get('/telemetry/{satellite}')
+async def telemetryHistory(satellite: str, start: float = None, stop: float = None, by: str = 'tick',
+                           points: int = None, attributes: str = None, method: str = 'stride'):
+    if telemetry is None:
+        raise HTTPException(404, "telemetry history is disabled (TELEMETRY_DIR)")
+    if method not in METHODS:
+        raise HTTPException(400, f"method must be one of {', '.join(METHODS)}")
+    if points is not None and points < MIN_POINTS[method]:
+        raise HTTPException(400, f"points must be at least {MIN_POINTS[method]} for method={method}")
+    try:
+        columns = parse_attributes(attributes) or list(range(len(ATTRIBUTES)))
+        if method == 'stride':
+            ticks, records = await asyncio.to_thread(telemetry.series, satellite, start, stop, by, points)
+        else:
+            ticks, timestamps, values = await asyncio.to_thread(downsampler.query, satellite, start, stop, by,
+                                                                points, method)
+    except KeyError:
+        raise HTTPException(404, f"no telemetry for {satellite!r}")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    response = {"satellite": satellite, "attributes": [ATTRIBUTES[i] for i in columns]}
+    if method == 'stride':
+        response.update({
+            "ticks": ticks.tolist(),
+            "timestamps": records['timestamp'].tolist(),
+            # Stored as float32, back to the 2 decimals the simulation rounds to
+            "values": records['values'][:, columns].astype(np.float64).round(2).tolist(),
+        })
+    else:
+        response["method"] = method
+        response["series"] = [{
+            "attribute": ATTRIBUTES[i],
+            "ticks": ticks[:, i].tolist(),
+            "timestamps": timestamps[:, i].tolist(),
+            "values": values[:, i].astype(np.float64).round(2).tolist(),
+        } for i in columns]
+    return response
+
+# Frame format per connection: ?format=json (default, text messages),
+# ?format=binary (52-byte messages, see frames.BINARY_LAYOUT) or
+# ?format=delta (changed attributes only, with periodic keyframes)
 @app.websocket('/ws')
-async def websocketEndpoint(websocket: WebSocket):
+async def websocketEndpoint(websocket: WebSocket, format: str = 'json'):
+    await streamSession(websocket, 'default', format)
+
+@app.websocket('/ws/{session_id}')
+async def sessionEndpoint(websocket: WebSocket, session_id: str, format: str = 'json'):
+    await streamSession(websocket, session_id, format)
+
+async def streamSession(websocket: WebSocket, session_id: str, format: str):
+    if format not in FORMATS:
+        await websocket.close(code=1003, reason=f"format must be one of {', '.join(FORMATS)}")
+        return
+    await websocket.accept()
+    encode = connection_encoder(format)
+    try:
+        async with sessions.subscribe(session_id) as frames:
+            while True:
+                payload = encode(await frames.get())
+                if isinstance(payload, bytes):
+                    await websocket.send_bytes(payload)
+                else:
+                    await websocket.send_text(payload)
+    except Exception as e:
+        print(f"WebSocket Error: {e}")
+    finally:
+        await websocket.close()
+
+# Many satellites over one connection, one message per tick with the rows of:
+# ?satellites=0-99,250 (default all), ?attributes=Battery_Level,Temperature
+# (default all), ?every=5 (every 5th tick only), ?format=json or binary
+# (see frames.FLEET_HEADER) and ?reduce=minmax to get the minimum and maximum
+# over the ticks between messages instead of the last tick's values
+@app.websocket('/fleet')
+async def fleetEndpoint(websocket: WebSocket, satellites: str = None, attributes: str = None, every: int = 1,
+                        format: str = 'json', reduce: str = 'last'):
+    try:
+        view = parse_view(FLEET_SIZE, satellites, attributes, every, format, reduce)
+    except ValueError as e:
+        await websocket.close(code=1003, reason=str(e))
+        return
     await websocket.accept()
-    fixes = Fixes()
     try:
-        data = initialize_attributes()
-        while True:
-            data = apply_event(random.choice(events), data)
-            # pred = model.predict(data)
-            # data = fixes.apply_fixes(data,pred)
-            await websocket.send_json(data.to_dict(orient='records')[0])
-            await asyncio.sleep(1)
+        extrema = FleetExtrema() if view.reduce == 'minmax' else None
+        async with fleets.subscribe('fleet') as frames:
+            while True:
+                frame = await frames.get()
+                if extrema is not None:
+                    extrema.add(view.select(frame.values)[1])
+                if not view.wants(frame):
+                    continue
+                if extrema is not None:
+                    payload = frame.encode_extrema(view, *extrema.take())
+                else:
+                    payload = frame.encode_view(view)
+                if isinstance(payload, bytes):
+                    await websocket.send_bytes(payload)
+                else:
+                    await websocket.send_text(payload)
     except Exception as e:
         print(f"WebSocket Error: {e}")
     finally:
         await websocket.close()
 
 if __name__ == '__main__':
-    os.system('uvicorn main:app --reload')
\ No newline at end of file
+    os.system('uvicorn main:app --reload')
@@ -15,7 +15,7 @@ events= ["Battery Drain",
 "Debris Collision",
 "Solar Storm"]
 
-def recalculate_dependent_attributes(attributes: Dict[str:float]) -> Dict[str:float]:
+def recalculate_dependent_attributes(attributes: Dict[str, float]) -> Dict[str, float]:
     attributes["Battery_Level"] = min(100, max(0, 
         attributes["Battery_Level"] + attributes["Solar_Panel_Efficiency"] * 0.8 - attributes["Power_Consumption_Rate"]
     ))
@@ -108,10 +108,14 @@ def apply_event(event, attributes):
 
     return attributes
 
-while True:
-    time.sleep(1)
-    os.system('cls')
-    attributes = initialize_attributes()
-    attributes = apply_event(random.choice(events),attributes)
-    for key, value in attributes.items():
-        print(f"{key}: {value}")
+def main():
+    while True:
+        time.sleep(1)
+        os.system('cls' if os.name == 'nt' else 'clear')
+        attributes = initialize_attributes()
+        attributes = apply_event(random.choice(events),attributes)
+        for key, value in attributes.items():
+            print(f"{key}: {value}")
+
+if __name__ == '__main__':
+    main()
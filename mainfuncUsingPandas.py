@@ -1,8 +1,8 @@
 import random
 import os
 import time
-import pandas as pd
-import pickle
+from modelRegistry import ModelRegistry
+from satelliteState import SatelliteState, predict
 
 events = [
     "Battery Drain",
@@ -17,8 +17,8 @@ events = [
     "Solar Storm"
 ]
 
-with open('model.pkl', 'rb') as f:
-    model = pickle.load(f)
+# Flattened copy of the forest, loaded on the first prediction
+model = ModelRegistry()
 
 def initialize_attributes():
     # Independent Attributes (Set to Good Condition)
@@ -48,15 +48,14 @@ def initialize_attributes():
         "Data_Storage_Used": round(data_storage_used, 2),
         "Debris_Risk_Level": round(debris_risk_level, 2)
     }
-    return pd.DataFrame([dict1])
+    return SatelliteState.from_dict(dict1)
 
-def apply_event(event, attributes_df):
+def apply_event(event, attributes):
     """
     Modifies all affected attributes directly based on the event,
     considering both direct and indirect effects.
+    Updates the SatelliteState in place and returns it.
     """
-    # Extract current values
-    attributes = attributes_df.iloc[0].to_dict()
     print(event)
 
     # Get current values for calculations
@@ -167,20 +166,16 @@ def apply_event(event, attributes_df):
     attributes["Debris_Risk_Level"] = max(0, min(100, debris_risk_level))
     
     # Round all values to 2 decimal places
-    for key in attributes:
-        attributes[key] = round(attributes[key], 2)
-
-    # Update the DataFrame
-    return pd.DataFrame([attributes])
+    return attributes.round(2)
 
 def main():
     attributes = initialize_attributes()
     while True:
         time.sleep(1)
-        os.system('cls')
+        os.system('cls' if os.name == 'nt' else 'clear')
         attributes = apply_event(random.choice(events), attributes)
-        print(attributes.to_string(index=False))
-        y_pred = model.predict(attributes)
+        print(attributes.to_frame().to_string(index=False))
+        y_pred = predict(model, attributes)
         print(y_pred)
 
 if __name__ == '__main__':
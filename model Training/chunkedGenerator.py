@@ -0,0 +1,162 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import psutil
+
+from ruleLabeler import actions, label_actions
+
+# Same uniform draws as claudeV2forMultiClass.generate_satellite_dataset,
+# in the column order the model is trained on
+FEATURE_RANGES = {
+    'Battery_Level': (0, 100),
+    'Battery_Health': (20, 100),
+    'Signal_Strength': (0, 100),
+    'Power_Consumption_Rate': (0, 100),
+    'Component_Health': (40, 100),
+    'CPU_GPU_Usage': (0, 100),
+    'Solar_Panel_Efficiency': (0, 100),
+    'Temperature': (-30, 90),
+    'Data_Storage_Used': (0, 100),
+    'Debris_Risk_Level': (0, 10),
+}
+
+FORMATS = ('parquet', 'feather')
+CHUNK_SIZE = 1_000_000  # rows per chunk / shard
+
+
+def generate_chunk(start, stop, num_samples, rng, time_span_days=365):
+    """
+    Rows start..stop-1 of a num_samples labeled dataset, with float32
+    features and uint8 action columns.
+
+    Each chunk draws its timestamps inside its own share of the time span,
+    so chunks come out in chronological order without sorting the whole
+    dataset. Features and labels are per row, like claudeV2forMultiClass.py.
+    """
+    size = stop - start
+    window = time_span_days / num_samples
+    day_offsets = np.sort(rng.uniform(start * window, stop * window, size))
+    offsets_us = np.rint(day_offsets * 86400e6).astype(np.int64)
+
+    df = pd.DataFrame({
+        'Timestamp': np.datetime64('2024-01-01T00:00:00', 'us') + offsets_us.astype('timedelta64[us]'),
+        'Days_Since_Start': (offsets_us // (86400 * 10**6)).astype(np.uint16),
+    })
+    for col, (low, high) in FEATURE_RANGES.items():
+        df[col] = rng.uniform(low, high, size)
+
+    # Labels come from the unrounded values, as in claudeV2forMultiClass.py
+    labels, _ = label_actions(df)
+    for col in FEATURE_RANGES:
+        df[col] = df[col].round(2).astype(np.float32)
+    df[actions] = labels
+    return df
+
+
+def chunk_seeds(num_samples, chunk_size=CHUNK_SIZE, seed=None):
+    """
+    One independent SeedSequence per chunk, spawned from `seed`. Chunk i
+    always draws from the i-th child, so the dataset only depends on the
+    seed and the chunk size, not on which process generates which chunk.
+    """
+    num_chunks = -(-num_samples // chunk_size)
+    return np.random.SeedSequence(seed).spawn(num_chunks)
+
+
+def generate_chunks(num_samples, chunk_size=CHUNK_SIZE, seed=None, time_span_days=365):
+    """Yields the dataset as DataFrames of at most chunk_size rows, in row order."""
+    for index, seed_seq in enumerate(chunk_seeds(num_samples, chunk_size, seed)):
+        start = index * chunk_size
+        yield generate_chunk(start, min(start + chunk_size, num_samples), num_samples,
+                             np.random.default_rng(seed_seq), time_span_days)
+
+
+def write_shard(df, path, fmt='parquet'):
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'feather':
+        df.to_feather(path)
+    else:
+        raise ValueError(f"unknown shard format {fmt!r}, expected one of {FORMATS}")
+
+
+def shard_path(output_dir, index, fmt='parquet'):
+    return os.path.join(output_dir, f'part-{index:05d}.{fmt}')
+
+
+def write_shards(chunks, output_dir, fmt='parquet'):
+    """
+    Writes every chunk to its own shard file in output_dir as soon as it is
+    generated, so only one chunk is held in memory. Returns the shard paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for index, chunk in enumerate(chunks):
+        path = shard_path(output_dir, index, fmt)
+        write_shard(chunk, path, fmt)
+        paths.append(path)
+    return paths
+
+
+def _write_chunk(index, seed_seq, num_samples, chunk_size, output_dir, fmt, time_span_days):
+    start = index * chunk_size
+    chunk = generate_chunk(start, min(start + chunk_size, num_samples), num_samples,
+                           np.random.default_rng(seed_seq), time_span_days)
+    path = shard_path(output_dir, index, fmt)
+    write_shard(chunk, path, fmt)
+    return path, psutil.Process().memory_info().rss
+
+
+def generate_parallel(num_samples, output_dir, chunk_size=CHUNK_SIZE, seed=None, workers=None,
+                      fmt='parquet', time_span_days=365):
+    """
+    Generates and writes the shards on a pool of `workers` processes, each
+    worker holding one chunk at a time. Same files as
+    write_shards(generate_chunks(...)) for any number of workers.
+    Returns the shard paths and the peak RSS of a worker in bytes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    seeds = chunk_seeds(num_samples, chunk_size, seed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_chunk, index, seed_seq, num_samples, chunk_size, output_dir, fmt,
+                                   time_span_days)
+                   for index, seed_seq in enumerate(seeds)]
+        results = [future.result() for future in futures]
+    paths = [path for path, _ in results]
+    return paths, max(rss for _, rss in results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate the labeled dataset as Parquet / Feather shards")
+    parser.add_argument('--num-samples', type=int, default=10000)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--output-dir', default='satellite_dataset_shards')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes generating shards in parallel, 1 generates in this process")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        paths, peak_rss = generate_parallel(args.num_samples, args.output_dir, args.chunk_size, args.seed,
+                                            args.workers, args.format)
+    else:
+        process = psutil.Process()
+        peak_rss = process.memory_info().rss
+
+        def tracked(chunks):
+            global peak_rss
+            for chunk in chunks:
+                peak_rss = max(peak_rss, process.memory_info().rss)
+                yield chunk
+
+        chunks = generate_chunks(args.num_samples, args.chunk_size, args.seed)
+        paths = write_shards(tracked(chunks), args.output_dir, args.format)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {args.num_samples} rows to {len(paths)} {args.format} shards in {args.output_dir}")
+    print(f"{elapsed:.1f} s, {args.num_samples / elapsed:,.0f} rows/s, peak RSS {peak_rss / 2**20:.0f} MiB per process")
@@ -0,0 +1,163 @@
+import argparse
+import random
+import numpy as np
+import pandas as pd
+
+
+def generate_satellite_dataset(num_samples=1000, time_span_days=365, rng=None, day_offsets=None):
+    """
+    Vectorized version of generate_satellite_dataset in v5.py: same columns,
+    distributions and dependencies, computed on whole columns at once.
+
+    Parameters:
+    -----------
+    num_samples : int
+        Number of data points to generate
+    time_span_days : int
+        Number of days the dataset should span
+    rng : numpy.random.Generator or numpy.random.RandomState
+        Source of randomness. Draws happen in the same order as v5.py, so
+        np.random.RandomState(seed) reproduces np.random.seed(seed) + v5.py.
+    day_offsets : array-like, optional
+        Offset of each sample from the start date in days, before sorting.
+        Drawn from `rng` when not given (v5.py uses the `random` module).
+
+    Returns:
+    --------
+    pandas.DataFrame
+        DataFrame containing the satellite attributes
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if day_offsets is None:
+        day_offsets = rng.uniform(0, time_span_days, num_samples)
+
+    # Timestamps, sorted chronologically (microsecond resolution like timedelta)
+    start_date = np.datetime64('2024-01-01T00:00:00', 'us')
+    offsets_us = np.sort(np.rint(np.asarray(day_offsets) * 86400e6).astype(np.int64))
+    timestamps = start_date + offsets_us.astype('timedelta64[us]')
+    days_since_start = offsets_us // (86400 * 10**6)
+
+    df = pd.DataFrame({'Timestamp': timestamps, 'Days_Since_Start': days_since_start})
+
+    # ------------------------
+    # Independent Attributes
+    # ------------------------
+    df['Solar_Panel_Efficiency'] = rng.uniform(30, 100, num_samples)
+    df['Data_Storage_Used'] = rng.uniform(0, 95, num_samples)
+    debris_risk = rng.uniform(1, 10, num_samples)
+    df['Debris_Risk_Level'] = debris_risk
+
+    # Docking to ISS (binary event, approximately once every 60 days)
+    dock_days = rng.choice(time_span_days, size=time_span_days//60, replace=False)
+    docking = np.isin(days_since_start, dock_days)
+    df['Docking_Event'] = docking.astype(np.float64)
+
+    # Power consumption and temperature
+    base_power = rng.uniform(20, 80, num_samples)
+    base_temp = rng.uniform(-30, 50, num_samples)
+    temperature = np.clip(base_temp + base_power * 0.2 - 10, -40, 80)
+    df['Temperature'] = temperature
+
+    # ------------------------
+    # Dependent Attributes (initial values)
+    # ------------------------
+    power = base_power.copy()
+    battery_level = rng.uniform(40, 100, num_samples)
+    component_health = rng.uniform(85, 100, num_samples)
+    battery_health = rng.uniform(90, 100, num_samples)
+    rng.uniform(50, 100, num_samples)  # Signal Strength, recomputed in the second pass
+    rng.uniform(10, 90, num_samples)  # CPU & GPU Usage, recomputed in the second pass
+
+    # ------------------------
+    # First pass: basic dependent relationships
+    # ------------------------
+    battery_level = np.minimum(100, battery_level + df['Solar_Panel_Efficiency'].to_numpy() * 0.3 - power * 0.5)
+
+    temp_impact = 0.05 * np.maximum(0, temperature - 20)
+    time_impact = days_since_start * 0.01
+    docking_repair = np.where(docking, 5, 0)
+    battery_health = np.clip(battery_health - temp_impact - time_impact + docking_repair, 0, 100)
+
+    comp_temp_impact = 0.03 * np.maximum(0, temperature - 25)
+    comp_time_impact = days_since_start * 0.008
+    comp_docking_repair = np.where(docking, 8, 0)
+    comp_debris_impact = 0.2 * debris_risk
+    component_health = np.clip(component_health - comp_temp_impact - comp_time_impact - comp_debris_impact
+                               + comp_docking_repair, 0, 100)
+
+    # ------------------------
+    # Second pass: interdependent relationships
+    # ------------------------
+    # v5.py draws base signal and CPU noise per row, alternating
+    per_row = rng.uniform(size=(num_samples, 2))
+    base_signal = 40 + 20 * per_row[:, 0]
+    cpu_noise = -10 + 20 * per_row[:, 1]
+
+    battery_signal_impact = np.maximum(0, (battery_level - 20) / 80 * 40)
+    debris_signal_impact = debris_risk * 2
+    signal_strength = np.clip(base_signal + battery_signal_impact - debris_signal_impact, 0, 100)
+
+    temp_power_factor = np.maximum(0, (temperature + 40) / 120 * 20)
+    battery_power_factor = np.maximum(0, (100 - battery_level) / 100 * 15)
+    power = np.clip(power + temp_power_factor - battery_power_factor, 0, 100)
+
+    power_cpu_impact = power * 0.7
+    battery_cpu_factor = np.maximum(0, (100 - battery_level) / 100 * 30)
+    cpu_gpu_usage = np.clip(power_cpu_impact - battery_cpu_factor + cpu_noise, 0, 100)
+
+    # Random noise, then keep everything in range
+    df['Power_Consumption_Rate'] = power
+    df['Battery_Level'] = np.clip(battery_level + rng.normal(0, 2, num_samples), 0, 100)
+    df['Component_Health'] = component_health
+    df['Battery_Health'] = battery_health
+    df['Signal_Strength'] = np.clip(signal_strength + rng.normal(0, 3, num_samples), 0, 100)
+    df['Power_Consumption_Rate'] = np.clip(power + rng.normal(0, 2, num_samples), 0, 100)
+    df['CPU_GPU_Usage'] = np.clip(cpu_gpu_usage + rng.normal(0, 5, num_samples), 0, 100)
+
+    # Round all numeric columns to 2 decimal places for readability
+    for col in df.columns:
+        if col not in ('Timestamp', 'Docking_Event', 'Days_Since_Start'):
+            df[col] = df[col].round(2)
+
+    return df
+
+
+def check_equivalence(num_samples=500, seed=42):
+    """
+    Runs v5.generate_satellite_dataset and the vectorized generator from the
+    same seed and checks that they produce the same DataFrame.
+    """
+    from v5 import generate_satellite_dataset as generate_legacy
+
+    random.seed(seed)
+    np.random.seed(seed)
+    expected = generate_legacy(num_samples=num_samples)
+
+    offsets = random.Random(seed)
+    day_offsets = [offsets.uniform(0, 365) for _ in range(num_samples)]
+    actual = generate_satellite_dataset(num_samples, rng=np.random.RandomState(seed), day_offsets=day_offsets)
+
+    pd.testing.assert_frame_equal(actual.drop(columns='Timestamp'), expected.drop(columns='Timestamp'),
+                                  check_dtype=False)
+    # timedelta and the vectorized path may round a microsecond differently
+    drift = (actual['Timestamp'] - pd.to_datetime(expected['Timestamp'])).abs().max()
+    assert drift <= pd.Timedelta(microseconds=1), drift
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-samples', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='satellite_dataset.csv')
+    parser.add_argument('--check', action='store_true', help="compare against v5.py at small N and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        check_equivalence(seed=args.seed)
+        print("Vectorized generator matches v5.py")
+    else:
+        satellite_data = generate_satellite_dataset(args.num_samples, rng=np.random.default_rng(args.seed))
+        satellite_data.to_csv(args.output, index=False)
+        print(satellite_data.head())
+        print("\nDataset shape:", satellite_data.shape)
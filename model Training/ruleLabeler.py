@@ -0,0 +1,210 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+actions = [
+    'Reroute power to core functions',
+    'Adjust orientation for passive cooling',
+    'Recalibrate position, tweak pitch, roll, yaw',
+    'Initiate Docking sequence to ISS',
+    'Increase cooling system power',
+    'Adjust antenna position or switch frequency',
+    'Optimize data transmission',
+    'Delete unnecessary data',
+    'Adjust pitch, yaw, roll for sunlight absorption',
+    'Disable non-essential systems',
+    'Redistribute workload, reduce power to affected components'
+]
+
+# Define optimal ranges for key attributes
+attribute_ranges = {
+    'Battery_Health':{
+        'critical_low': 30
+    },
+    'Component_Health':{
+        'critical_low': 50
+    },
+    'Battery_Level': {
+        'critical_low': 20,
+        'low': 40,
+        'optimal_min': 60,
+        'optimal_max': 90
+    },
+    'Temperature': {
+        'critical_low': -20,
+        'low': 0,
+        'optimal_min': 10,
+        'optimal_max': 40,
+        'high': 60,
+        'critical_high': 80
+    },
+    'Signal_Strength': {
+        'critical_low': 30,
+        'low': 50,
+        'optimal_min': 70,
+        'optimal_max': 100
+    },
+    'Solar_Panel_Efficiency': {
+        'critical_low': 40,
+        'low': 60,
+        'optimal_min': 80,
+        'optimal_max': 100
+    },
+    'Data_Storage_Used': {
+        'critical_high': 85,
+        'high': 75,
+        'optimal_max': 60
+    },
+    'Debris_Risk_Level': {
+        'critical_high': 8,
+        'high': 6,
+        'optimal_max': 4
+    },
+    'CPU_GPU_Usage': {
+        'critical_high': 90,
+        'high': 80,
+        'optimal_max': 70
+    }
+}
+
+
+# Function to determine actions based on attribute values
+def determine_actions(row):
+    actions = []
+
+    # Battery Health and Component Health Actions
+    if row['Battery_Health'] < attribute_ranges['Battery_Health']['critical_low'] or row['Component_Health'] < attribute_ranges['Component_Health']['critical_low']:
+        actions.append("Initiate Docking sequence to ISS")
+
+    # Battery Level Actions
+    if row['Battery_Level'] < attribute_ranges['Battery_Level']['critical_low']:
+        actions.append('Disable non-essential systems')
+        actions.append('Reroute power to core functions')
+    elif row['Battery_Level'] < attribute_ranges['Battery_Level']['low']:
+        actions.append('Reroute power to core functions')
+
+    # Temperature Actions
+    if row['Temperature'] > attribute_ranges['Temperature']['critical_high']:
+        actions.append('Increase cooling system power')
+        actions.append('Adjust orientation for passive cooling')
+    elif row['Temperature'] > attribute_ranges['Temperature']['high']:
+        actions.append('Increase cooling system power')
+    elif row['Temperature'] < attribute_ranges['Temperature']['critical_low']:
+        actions.append('Adjust orientation for passive cooling')
+
+    # Solar Panel Efficiency Actions
+    if row['Solar_Panel_Efficiency'] < attribute_ranges['Solar_Panel_Efficiency']['critical_low']:
+        actions.append('Adjust pitch, yaw, roll for sunlight absorption')
+
+    # Signal Strength Actions
+    if row['Signal_Strength'] < attribute_ranges['Signal_Strength']['critical_low']:
+        actions.append('Adjust antenna position or switch frequency')
+
+    # Data Storage Actions
+    if row['Data_Storage_Used'] > attribute_ranges['Data_Storage_Used']['critical_high']:
+        actions.append('Optimize data transmission')
+        actions.append('Delete unnecessary data')
+
+    # CPU/GPU Usage Actions
+    if row['CPU_GPU_Usage'] > attribute_ranges['CPU_GPU_Usage']['critical_high']:
+        actions.append('Redistribute workload, reduce power to affected components')
+
+    # Debris Risk Actions
+    if row['Debris_Risk_Level'] > attribute_ranges['Debris_Risk_Level']['critical_high']:
+        actions.append('Recalibrate position, tweak pitch, roll, yaw')
+
+    return actions
+
+
+def _rule_masks(df):
+    """
+    Boolean mask of every rule of determine_actions, in the order the rules
+    append their action, so a row's Recommended_Actions is the actions of its
+    true masks read left to right.
+    """
+    def column(name):
+        return df[name].to_numpy()
+
+    ranges = attribute_ranges
+    battery_level = column('Battery_Level')
+    temperature = column('Temperature')
+    data_storage = column('Data_Storage_Used') > ranges['Data_Storage_Used']['critical_high']
+    return [
+        ('Initiate Docking sequence to ISS',
+         (column('Battery_Health') < ranges['Battery_Health']['critical_low'])
+         | (column('Component_Health') < ranges['Component_Health']['critical_low'])),
+        ('Disable non-essential systems', battery_level < ranges['Battery_Level']['critical_low']),
+        # critical_low < low, so both branches of the if/elif reroute power
+        ('Reroute power to core functions', battery_level < ranges['Battery_Level']['low']),
+        ('Increase cooling system power', temperature > ranges['Temperature']['high']),
+        ('Adjust orientation for passive cooling',
+         (temperature > ranges['Temperature']['critical_high'])
+         | (temperature < ranges['Temperature']['critical_low'])),
+        ('Adjust pitch, yaw, roll for sunlight absorption',
+         column('Solar_Panel_Efficiency') < ranges['Solar_Panel_Efficiency']['critical_low']),
+        ('Adjust antenna position or switch frequency',
+         column('Signal_Strength') < ranges['Signal_Strength']['critical_low']),
+        ('Optimize data transmission', data_storage),
+        ('Delete unnecessary data', data_storage),
+        ('Redistribute workload, reduce power to affected components',
+         column('CPU_GPU_Usage') > ranges['CPU_GPU_Usage']['critical_high']),
+        ('Recalibrate position, tweak pitch, roll, yaw',
+         column('Debris_Risk_Level') > ranges['Debris_Risk_Level']['critical_high']),
+    ]
+
+
+def label_actions(df):
+    """
+    Vectorized determine_actions over a whole DataFrame.
+
+    Returns the (N, 11) uint8 action matrix in `actions` column order and an
+    object array with each row's Recommended_Actions list.
+    """
+    rules = _rule_masks(df)
+    labels = np.zeros((len(df), len(actions)), dtype=np.uint8)
+    # Rows with the same set of true rules share one list, so the lists are
+    # built once per distinct pattern (at most 2**11 of them) rather than per row
+    pattern = np.zeros(len(df), dtype=np.int32)
+    for bit, (action, mask) in enumerate(rules):
+        labels[:, actions.index(action)] |= mask
+        pattern |= mask.astype(np.int32) << bit
+
+    lists = np.empty(1 << len(rules), dtype=object)
+    for code in np.flatnonzero(np.bincount(pattern, minlength=len(lists))).tolist():
+        lists[code] = [action for bit, (action, _) in enumerate(rules) if code >> bit & 1]
+    return labels, lists[pattern]
+
+
+def check_equivalence(df):
+    """Asserts that label_actions gives the same labels as determine_actions row by row."""
+    labels, recommended = label_actions(df)
+    expected = df.apply(determine_actions, axis=1).tolist()
+    assert recommended.tolist() == expected
+    for row, row_actions in zip(labels, expected):
+        assert {actions[i] for i in np.flatnonzero(row)} == set(row_actions)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check the vectorized labeler against determine_actions")
+    parser.add_argument('--num-samples', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    n = args.num_samples
+    df = pd.DataFrame({
+        'Battery_Level': rng.uniform(0, 100, n),
+        'Battery_Health': rng.uniform(20, 100, n),
+        'Signal_Strength': rng.uniform(0, 100, n),
+        'Power_Consumption_Rate': rng.uniform(0, 100, n),
+        'Component_Health': rng.uniform(40, 100, n),
+        'CPU_GPU_Usage': rng.uniform(0, 100, n),
+        'Solar_Panel_Efficiency': rng.uniform(0, 100, n),
+        'Temperature': rng.uniform(-30, 90, n),
+        'Data_Storage_Used': rng.uniform(0, 100, n),
+        'Debris_Risk_Level': rng.uniform(0, 10, n),
+    })
+    # Include values sitting exactly on every threshold
+    df.iloc[:len(df) // 10] = df.iloc[:len(df) // 10].round(0)
+    check_equivalence(df)
+    print(f"Vectorized labels match determine_actions on {n} rows")
@@ -165,21 +165,22 @@ def generate_satellite_dataset(num_samples=1000, time_span_days=365):
     
     return df
 
-# Generate the dataset
-np.random.seed(42)  # For reproducibility
-satellite_data = generate_satellite_dataset(num_samples=1000)
+if __name__ == '__main__':
+    # Generate the dataset
+    np.random.seed(42)  # For reproducibility
+    satellite_data = generate_satellite_dataset(num_samples=1000)
 
-# Save to CSV
-satellite_data.to_csv('satellite_dataset.csv', index=False)
+    # Save to CSV
+    satellite_data.to_csv('satellite_dataset.csv', index=False)
 
-# Display sample of the dataset
-print(satellite_data.head())
-print("\nDataset shape:", satellite_data.shape)
-print("\nDataset summary statistics:")
-print(satellite_data.describe())
+    # Display sample of the dataset
+    print(satellite_data.head())
+    print("\nDataset shape:", satellite_data.shape)
+    print("\nDataset summary statistics:")
+    print(satellite_data.describe())
 
-# Verify correlations between dependent and independent variables
-print("\nCorrelation between key attributes:")
-corr_matrix = satellite_data[['Solar_Panel_Efficiency', 'Temperature', 'Battery_Level', 
-                             'Power_Consumption_Rate', 'Signal_Strength', 'Component_Health']].corr()
-print(corr_matrix)
\ No newline at end of file
+    # Verify correlations between dependent and independent variables
+    print("\nCorrelation between key attributes:")
+    corr_matrix = satellite_data[['Solar_Panel_Efficiency', 'Temperature', 'Battery_Level', 
+                                 'Power_Consumption_Rate', 'Signal_Strength', 'Component_Health']].corr()
+    print(corr_matrix)
\ No newline at end of file
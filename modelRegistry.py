@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+
+from fastForest import FlatForest
+
+MODEL_PATH = 'model.pkl'
+
+
+def flat_directory(model_path):
+    """Where the flattened arrays of a pickled model are kept: model.pkl -> model_flat/."""
+    return os.path.splitext(model_path)[0] + '_flat'
+
+
+# Name of the pointer file in a flat directory: the version directory in use
+CURRENT = 'CURRENT'
+
+
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_source_hash(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            return json.load(f).get('source_sha256')
+    except (OSError, ValueError):
+        return None
+
+
+def current_export(directory):
+    """The version directory CURRENT points to, None when there is no export yet."""
+    try:
+        with open(os.path.join(directory, CURRENT)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(directory, version) if version else None
+
+
+def export_flat(model_path, directory=None):
+    """
+    Unpickles model_path and writes its FlatForest arrays, tagged with the
+    pickle's hash, to a version directory of `directory`
+    (flat_directory(model_path) by default) named after that hash, then
+    points CURRENT at it.
+
+        model_flat/
+          CURRENT               name of the version in use
+          3f1c0e9a2b7d4c51/     arrays and meta.json of one pickle
+
+    A version is written to a temporary directory and renamed into place,
+    and CURRENT is replaced in one rename, so a process starting at any
+    moment finds either the previous complete export or the new one. The
+    live version is never deleted in place: only versions older than the
+    one CURRENT pointed to before are removed. Returns the version
+    directory, and raises RuntimeError if CURRENT does not end up pointing
+    at an export of this pickle.
+    """
+    directory = directory or flat_directory(model_path)
+    source_hash = _file_hash(model_path)
+    version = source_hash[:16]
+    target = os.path.join(directory, version)
+    os.makedirs(directory, exist_ok=True)
+
+    if _read_source_hash(target) != source_hash:
+        with open(model_path, 'rb') as f:
+            flat = FlatForest.from_model(pickle.load(f))
+        tmp_dir = tempfile.mkdtemp(prefix='.flat-', dir=directory)
+        try:
+            flat.save_arrays(tmp_dir)
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({'source': os.path.basename(model_path), 'source_sha256': source_hash}, f, indent=2)
+            try:
+                os.replace(tmp_dir, target)
+            except OSError as e:
+                # Fine if another process put an export of the same pickle there first
+                if _read_source_hash(target) != source_hash:
+                    raise RuntimeError(f"could not put the export of {model_path} in {target}: {e}") from e
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    previous = current_export(directory)
+    fd, tmp_pointer = tempfile.mkstemp(prefix='.current-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(version)
+        os.replace(tmp_pointer, os.path.join(directory, CURRENT))
+    except OSError as e:
+        os.remove(tmp_pointer)
+        raise RuntimeError(f"could not point {directory} at the export of {model_path}: {e}") from e
+
+    # Processes may still be opening the version CURRENT pointed to a moment ago, keep that one
+    keep = {version, os.path.basename(previous) if previous else None}
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name not in keep and not name.startswith('.') and os.path.isfile(os.path.join(path, 'meta.json')):
+            shutil.rmtree(path, ignore_errors=True)
+
+    current = current_export(directory)
+    if current is None or _read_source_hash(current) != source_hash:
+        raise RuntimeError(f"{directory} does not point at the export of {model_path} (sha256 {source_hash})")
+    return current
+
+
+class ModelRegistry:
+    """
+    The action model, loaded on first use rather than at import.
+
+    The pickle is unpickled and flattened once; after that every process
+    memory-maps the same .npy files from the current version of
+    flat_directory(model_path), which is re-exported when the pickle's hash
+    changes. Stands in for the model itself:
+    `registry.predict(X)` loads it if needed and predicts.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, directory=None):
+        self.model_path = model_path
+        self.directory = directory or flat_directory(model_path)
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self):
+        current = current_export(self.directory)
+        if current is None or _read_source_hash(current) != _file_hash(self.model_path):
+            # Raises if it cannot put an up-to-date export in place
+            current = export_flat(self.model_path, self.directory)
+        return FlatForest.load_arrays(current)
+
+    def predict(self, X):
+        return self.get().predict(X)
+
+    def predict_proba(self, X):
+        return self.get().predict_proba(X)
@@ -0,0 +1,209 @@
+"""
+Monte Carlo estimate of how missions end: many independent satellites,
+each hit by a random event every tick and then repaired by the actions the
+rule engine / model picks, until a battery runs flat or a component fails.
+
+Every trajectory is a row of one (trajectories, 10) state array advanced
+with batchSimulation.apply_events and Fixes.apply_fixes_batch, so a tick of
+the whole block costs a few numpy calls. Blocks run on a pool of processes.
+Each trajectory draws from its own random stream, keyed by its number, so
+its path does not depend on the block it ran in or on its block-mates.
+
+    python monteCarlo.py --trajectories 10000 --ticks 10000 --workers 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batchSimulation import BATTERY_LEVEL, COMPONENT_HEALTH, apply_events, events, initialize_batch
+from fixes import ACTION_EFFECTS, RANDOM_EFFECTS, Fixes
+from modelRegistry import MODEL_PATH, ModelRegistry
+from ruleEngine import BOUNDARY_MARGIN, MODES, RuleEngine
+
+# Ways a trajectory ends, as cause -> (attribute index, value at or below
+# which it has failed), checked right after each tick's event. When several
+# hold on the same tick the first one listed is the cause.
+FAILURES = {
+    'battery_depletion': (BATTERY_LEVEL, 0.0),
+    'component_failure': (COMPONENT_HEALTH, 0.0),
+}
+
+# Chance that a recommended action is actually carried out on a tick. At 1
+# every recommendation succeeds, which keeps the thresholds far enough from
+# 0 that no trajectory can fail; lower values model commands that are lost
+# or arrive too late.
+FIX_SUCCESS = 1.0
+
+# Trajectories advanced together by one task
+BLOCK_SIZE = 2048
+
+# Ticks of random draws taken from each trajectory's stream at once, so the
+# per-trajectory generator calls are paid once every TICKS_PER_DRAW ticks
+TICKS_PER_DRAW = 32
+
+# Draws a trajectory uses per tick: its event, whether each of the actions
+# is carried out, and the amount of every effect with a random amount
+_EVENT = 0
+_FIX_SUCCESS = slice(1, 1 + len(ACTION_EFFECTS))
+_AMOUNTS = slice(_FIX_SUCCESS.stop, _FIX_SUCCESS.stop + len(RANDOM_EFFECTS))
+DRAWS_PER_TICK = _AMOUNTS.stop
+
+
+class MonteCarloResult:
+    """
+    failures[c, t] is the number of trajectories that ended by cause
+    FAILURES[c] on tick t (0-based), out of `trajectories` that were run for
+    `ticks` ticks; the rest survived the whole run.
+    """
+
+    def __init__(self, failures, trajectories):
+        self.failures = failures
+        self.trajectories = trajectories
+        self.causes = list(FAILURES)
+
+    @property
+    def ticks(self):
+        return self.failures.shape[1]
+
+    def _rows(self, cause):
+        if cause is None:
+            return self.failures.sum(axis=0)
+        return self.failures[self.causes.index(cause)]
+
+    def failure_probability(self, cause=None):
+        """Fraction of trajectories that ended within the run, by `cause` or by any."""
+        return self._rows(cause).sum() / self.trajectories
+
+    def survival(self, cause=None):
+        """
+        survival()[t] is the fraction of trajectories still running after tick
+        t. With a cause, only failures of that cause count as deaths.
+        """
+        return 1 - np.cumsum(self._rows(cause)) / self.trajectories
+
+    def histogram(self, bins=50, cause=None):
+        """
+        Failure times in `bins` buckets of about equal width, as (counts, bin
+        edges): counts[i] is the failures on ticks edges[i] .. edges[i + 1] - 1.
+        """
+        edges = np.linspace(0, self.ticks, min(bins, self.ticks) + 1).astype(np.int64)
+        counts = np.add.reduceat(self._rows(cause), edges[:-1])
+        return counts, edges
+
+    def median_failure_tick(self, cause=None):
+        """First tick by which half of the trajectories have failed, None if they never did."""
+        below = np.flatnonzero(self.survival(cause) <= 0.5)
+        return int(below[0]) if len(below) else None
+
+
+def trajectory_rng(entropy, trajectory):
+    """Random stream of one trajectory: child `trajectory` of SeedSequence(entropy)."""
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(trajectory,)))
+
+
+def run_block(entropy, first, trajectories, ticks, mode='hybrid', margin=BOUNDARY_MARGIN, model_path=MODEL_PATH,
+              fix_success=FIX_SUCCESS):
+    """
+    Runs trajectories first .. first + trajectories - 1 for up to `ticks`
+    ticks and returns the (causes, ticks) failure counts. A trajectory
+    leaves the array on the tick it fails, so later ticks only pay for the
+    survivors, and its stream is only drawn from while it is running.
+    """
+    engine = RuleEngine(mode, margin)
+    # Only opened when the mode sends a row to the model
+    model = ModelRegistry(model_path)
+    fixes = Fixes()
+    columns = np.array([attribute for attribute, _ in FAILURES.values()])
+    thresholds = np.array([threshold for _, threshold in FAILURES.values()])
+
+    streams = [trajectory_rng(entropy, trajectory) for trajectory in range(first, first + trajectories)]
+    failures = np.zeros((len(FAILURES), ticks), dtype=np.int64)
+    state = np.concatenate([initialize_batch(1, rng) for rng in streams]) if streams else initialize_batch(0)
+    running = np.arange(trajectories)
+    for tick in range(ticks):
+        if tick % TICKS_PER_DRAW == 0:
+            # Uniforms in [0, 1) for the next ticks, draws[i] those of running[i]
+            draws = np.empty((len(running), min(TICKS_PER_DRAW, ticks - tick), DRAWS_PER_TICK))
+            for row, trajectory in enumerate(running):
+                streams[trajectory].random(out=draws[row])
+            rows = np.arange(len(running))
+        tick_draws = draws[rows, tick % TICKS_PER_DRAW]
+        apply_events(state, (tick_draws[:, _EVENT] * len(events)).astype(np.intp))
+
+        failed_by = state[:, columns] <= thresholds
+        failed = failed_by.any(axis=1)
+        if failed.any():
+            failures[:, tick] = np.bincount(failed_by[failed].argmax(axis=1), minlength=len(FAILURES))
+            state = state[~failed]
+            if not len(state):
+                break
+            running = running[~failed]
+            rows = rows[~failed]
+            tick_draws = tick_draws[~failed]
+
+        actions = engine.combine(state, model)
+        if fix_success < 1:
+            actions &= tick_draws[:, _FIX_SUCCESS] < fix_success
+        fixes.apply_fixes_batch(state, actions, uniforms=tick_draws[:, _AMOUNTS])
+    return failures
+
+
+def run(trajectories, ticks, seed=None, workers=None, mode='hybrid', margin=BOUNDARY_MARGIN,
+        model_path=MODEL_PATH, block_size=BLOCK_SIZE, fix_success=FIX_SUCCESS):
+    """
+    Simulates `trajectories` independent satellites for `ticks` ticks, split
+    into blocks of block_size that run on `workers` processes (all cores by
+    default, 1 runs them in this process). The same seed gives the same
+    result for any block size and number of workers.
+    """
+    entropy = np.random.SeedSequence(seed).entropy
+    firsts = range(0, trajectories, block_size)
+    sizes = [min(block_size, trajectories - first) for first in firsts]
+    if workers == 1:
+        blocks = [run_block(entropy, first, size, ticks, mode, margin, model_path, fix_success)
+                  for first, size in zip(firsts, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_block, entropy, first, size, ticks, mode, margin, model_path,
+                                       fix_success)
+                       for first, size in zip(firsts, sizes)]
+            blocks = [future.result() for future in futures]
+    return MonteCarloResult(sum(blocks, np.zeros((len(FAILURES), ticks), dtype=np.int64)), trajectories)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Monte Carlo estimate of battery depletion and component failure")
+    parser.add_argument('--trajectories', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="processes running blocks in parallel, 1 runs them in this process")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE,
+                        help="trajectories per task, the result does not depend on it")
+    parser.add_argument('--mode', choices=MODES, default='hybrid', help="how actions are chosen, see ruleEngine.py")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--fix-success', type=float, default=FIX_SUCCESS,
+                        help="chance that each recommended action is carried out")
+    parser.add_argument('--output', help="write the failure counts and survival curve to this .npz file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run(args.trajectories, args.ticks, args.seed, args.workers, args.mode, model_path=args.model,
+                 block_size=args.block_size, fix_success=args.fix_success)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.trajectories} trajectories x {args.ticks} ticks in {elapsed:.1f} s "
+          f"({args.trajectories * args.ticks / elapsed:,.0f} trajectory-ticks/s)")
+    for cause in [None] + result.causes:
+        median = result.median_failure_tick(cause)
+        print(f"{cause or 'any failure':<20} P(fail) {result.failure_probability(cause):>7.2%}  "
+              f"median tick {'-' if median is None else median}")
+    survival = result.survival()
+    for tick in np.unique(np.linspace(0, result.ticks - 1, 6).astype(int)):
+        print(f"survival after tick {tick:>6}: {survival[tick]:.2%}")
+    if args.output:
+        np.savez(args.output, causes=result.causes, failures=result.failures, survival=survival)
+        print(f"Wrote {args.output}")
@@ -166,15 +166,16 @@ import SatelliteOrbit from './visualizations/SatelliteOrbit';
 import TelemetryGraphs from './visualizations/TelemetryGraphs';
 import MissionTimeline from './visualizations/MissionTimeline';
 import ResourceHeatmap from './visualizations/ResourceHeatmap';
+import { decodeFrame, openTelemetrySocket } from '../utils/telemetryFrame';
 
 const Dashboard = () => {
   const [systemData, setSystemData] = useState<any>(null);
 
   useEffect(() => {
-    const ws = new WebSocket("ws://127.0.0.1:8000/ws");
+    const ws = openTelemetrySocket("ws://127.0.0.1:8000/ws", 'binary');
 
     ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
+      const data = decodeFrame(event.data);
       setSystemData(data);
     };
 
@@ -0,0 +1,48 @@
+// Decoding of the telemetry frames streamed by the FastAPI /ws endpoint.
+// Binary layout (little-endian, see frames.BINARY_LAYOUT on the server):
+//   uint32 seq | float64 unix timestamp | 10 x float32 attributes
+
+export type TelemetryFormat = 'json' | 'binary';
+
+export const TELEMETRY_ATTRIBUTES = [
+  'Battery_Level',
+  'Battery_Health',
+  'Signal_Strength',
+  'Power_Consumption_Rate',
+  'Component_Health',
+  'CPU_GPU_Usage',
+  'Solar_Panel_Efficiency',
+  'Temperature',
+  'Data_Storage_Used',
+  'Debris_Risk_Level',
+] as const;
+
+export type TelemetryRecord = Record<(typeof TELEMETRY_ATTRIBUTES)[number], number> & {
+  seq?: number;
+  timestamp?: number;
+};
+
+const HEADER_BYTES = 12;
+
+export function decodeBinaryFrame(buffer: ArrayBuffer): TelemetryRecord {
+  const view = new DataView(buffer);
+  const record = {
+    seq: view.getUint32(0, true),
+    timestamp: view.getFloat64(4, true),
+  } as TelemetryRecord;
+  TELEMETRY_ATTRIBUTES.forEach((name, i) => {
+    // float32 on the wire, values are only meaningful to 2 decimals
+    record[name] = Math.round(view.getFloat32(HEADER_BYTES + i * 4, true) * 100) / 100;
+  });
+  return record;
+}
+
+export function decodeFrame(data: string | ArrayBuffer): TelemetryRecord {
+  return typeof data === 'string' ? JSON.parse(data) : decodeBinaryFrame(data);
+}
+
+export function openTelemetrySocket(url: string, format: TelemetryFormat = 'binary'): WebSocket {
+  const ws = new WebSocket(`${url}?format=${format}`);
+  ws.binaryType = 'arraybuffer';
+  return ws;
+}
@@ -0,0 +1,94 @@
+import numpy as np
+
+from batchSimulation import (ATTRIBUTES, BATTERY_LEVEL, BATTERY_HEALTH, SIGNAL_STRENGTH, COMPONENT_HEALTH,
+                             CPU_GPU_USAGE, SOLAR_PANEL_EFFICIENCY, TEMPERATURE, DATA_STORAGE_USED,
+                             DEBRIS_RISK_LEVEL)
+from fixes import ACTION_EFFECTS
+
+# Column order of a prediction row, same as the model outputs
+ACTIONS = list(ACTION_EFFECTS)
+
+MODES = ('rules', 'model', 'hybrid')
+
+# The determine_actions thresholds the model was trained to imitate (see
+# "model Training/ruleLabeler.py"), as (action, attribute index, '<' or '>',
+# threshold). An action is recommended when any of its conditions holds.
+# tests/test_ruleEngine.py checks them against ruleLabeler.label_actions.
+RULES = [
+    ('Initiate Docking sequence to ISS', BATTERY_HEALTH, '<', 30),
+    ('Initiate Docking sequence to ISS', COMPONENT_HEALTH, '<', 50),
+    ('Disable non-essential systems', BATTERY_LEVEL, '<', 20),
+    ('Reroute power to core functions', BATTERY_LEVEL, '<', 40),
+    ('Increase cooling system power', TEMPERATURE, '>', 60),
+    ('Adjust orientation for passive cooling', TEMPERATURE, '>', 80),
+    ('Adjust orientation for passive cooling', TEMPERATURE, '<', -20),
+    ('Adjust pitch, yaw, roll for sunlight absorption', SOLAR_PANEL_EFFICIENCY, '<', 40),
+    ('Adjust antenna position or switch frequency', SIGNAL_STRENGTH, '<', 30),
+    ('Optimize data transmission', DATA_STORAGE_USED, '>', 85),
+    ('Delete unnecessary data', DATA_STORAGE_USED, '>', 85),
+    ('Redistribute workload, reduce power to affected components', CPU_GPU_USAGE, '>', 90),
+    ('Recalibrate position, tweak pitch, roll, yaw', DEBRIS_RISK_LEVEL, '>', 8),
+]
+
+# In 'hybrid' mode a row goes to the model when one of its attributes is
+# within this distance of a threshold, in the attribute's own units
+BOUNDARY_MARGIN = 0.25
+
+
+class RuleEngine:
+    """
+    The threshold rules compiled into arrays, evaluated for a whole batch of
+    (N, 10) state rows with a handful of numpy comparisons.
+
+    mode='rules' answers every row from the rules, mode='model' every row from
+    the model, and mode='hybrid' only consults the model for rows near a
+    threshold, where its learned boundary may differ from the rules.
+    """
+
+    def __init__(self, mode='hybrid', margin=BOUNDARY_MARGIN, rules=RULES):
+        if mode not in MODES:
+            raise ValueError(f"unknown inference mode {mode!r}, expected one of {MODES}")
+        self.mode = mode
+        self.attribute = np.array([attribute for _, attribute, _, _ in rules])
+        self.threshold = np.array([threshold for _, _, _, threshold in rules], dtype=np.float64)
+        self.below = np.array([op == '<' for _, _, op, _ in rules])
+        # Per-rule margin, `margin` may be a scalar or one value per attribute
+        self.margin = np.broadcast_to(np.asarray(margin, dtype=np.float64), (len(ATTRIBUTES),))[self.attribute]
+        # (n_rules, n_actions) 0/1 matrix from each rule to the action it fires
+        self.membership = np.zeros((len(rules), len(ACTIONS)), dtype=np.int64)
+        for i, (action, _, _, _) in enumerate(rules):
+            self.membership[i, ACTIONS.index(action)] = 1
+
+    def predict(self, X):
+        """(N, n_actions) 0/1 array of the actions the rules recommend for each row."""
+        values = np.atleast_2d(X)[:, self.attribute]
+        fired = np.where(self.below, values < self.threshold, values > self.threshold)
+        return np.minimum(fired.astype(np.int64) @ self.membership, 1)
+
+    def needs_model(self, X):
+        """Boolean mask of the rows the model has to answer in this mode."""
+        X = np.atleast_2d(X)
+        if self.mode == 'rules':
+            return np.zeros(len(X), dtype=bool)
+        if self.mode == 'model':
+            return np.ones(len(X), dtype=bool)
+        distance = np.abs(X[:, self.attribute] - self.threshold)
+        return (distance <= self.margin).any(axis=1)
+
+    def combine(self, X, model):
+        """
+        Predictions of the mode for X, calling `model.predict` only on the rows
+        that need it: never in 'rules' mode, and never for an empty batch.
+        """
+        X = np.atleast_2d(X)
+        if not len(X):
+            return np.empty((0, len(ACTIONS)), dtype=np.int64)
+        if self.mode == 'rules':
+            return self.predict(X)
+        needs_model = self.needs_model(X)
+        if needs_model.all():
+            return np.asarray(model.predict(X), dtype=np.int64)
+        predictions = self.predict(X)
+        if needs_model.any():
+            predictions[needs_model] = model.predict(X[needs_model])
+        return predictions
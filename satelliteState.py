@@ -0,0 +1,87 @@
+import warnings
+import numpy as np
+
+from batchSimulation import ATTRIBUTES
+
+_INDEX = {name: i for i, name in enumerate(ATTRIBUTES)}
+
+
+def _field(index):
+    def get(self):
+        return float(self.values[index])
+
+    def set(self, value):
+        self.values[index] = value
+
+    return property(get, set)
+
+
+class SatelliteState:
+    """
+    Telemetry of one satellite as a fixed float64 array of the 10 attributes,
+    in ATTRIBUTES order. Fields can be read and written by attribute
+    (state.Battery_Level) or by name (state['Battery_Level']).
+
+    `values` may be a row view into a batch array from batchSimulation, so a
+    state can be handed out per satellite without copying the fleet.
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values=None):
+        if values is None:
+            values = np.zeros(len(ATTRIBUTES))
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.shape != (len(ATTRIBUTES),):
+            raise ValueError(f"expected {len(ATTRIBUTES)} values, got shape {self.values.shape}")
+
+    Battery_Level = _field(0)
+    Battery_Health = _field(1)
+    Signal_Strength = _field(2)
+    Power_Consumption_Rate = _field(3)
+    Component_Health = _field(4)
+    CPU_GPU_Usage = _field(5)
+    Solar_Panel_Efficiency = _field(6)
+    Temperature = _field(7)
+    Data_Storage_Used = _field(8)
+    Debris_Risk_Level = _field(9)
+
+    @classmethod
+    def from_dict(cls, attributes):
+        return cls([attributes[name] for name in ATTRIBUTES])
+
+    def __getitem__(self, name):
+        return float(self.values[_INDEX[name]])
+
+    def __setitem__(self, name, value):
+        self.values[_INDEX[name]] = value
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value}" for name, value in zip(ATTRIBUTES, self.values.tolist()))
+        return f"SatelliteState({fields})"
+
+    def copy(self):
+        return SatelliteState(self.values.copy())
+
+    def round(self, decimals=2):
+        np.round(self.values, decimals, out=self.values)
+        return self
+
+    def to_dict(self):
+        return dict(zip(ATTRIBUTES, self.values.tolist()))
+
+    def as_row(self):
+        """(1, 10) view for model.predict, no copy."""
+        return self.values.reshape(1, -1)
+
+    def to_frame(self):
+        """One-row DataFrame, for display and other pandas consumers at the edge."""
+        import pandas as pd
+        return pd.DataFrame([self.to_dict()])
+
+
+def predict(model, state):
+    """Runs model.predict on a single state without building a DataFrame."""
+    with warnings.catch_warnings():
+        # The model was fitted on a DataFrame with the same column order
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        return model.predict(state.as_row())
@@ -0,0 +1,144 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from clock import SimulationClock
+from frames import Frame
+
+# Frames buffered per subscriber before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 8
+
+
+class PubSubHub:
+    """Fans every published frame out to all subscribers of a topic."""
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.topics = {}
+
+    def subscribe(self, topic):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.topics.setdefault(topic, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, topic, queue):
+        subscribers = self.topics.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self.topics[topic]
+
+    def subscriber_count(self, topic):
+        return len(self.topics.get(topic, ()))
+
+    def publish(self, topic, frame):
+        for queue in self.topics.get(topic, ()):
+            if queue.full():
+                # Slow viewer, skip its oldest frame rather than holding up the others
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+
+class SimulationSession:
+    """
+    One simulated satellite, advanced by a single background task no matter
+    how many websockets watch it. Every tick is published to the hub under
+    the session id as a Frame, which is serialized once per format.
+    Ticks follow a SimulationClock, `interval` seconds of simulated time
+    apart, played at `speed` times real time (0: as fast as possible).
+    `record(session_id, frame)`, if given, is called with every frame too.
+    """
+
+    def __init__(self, session_id, hub, state, advance, interval=1.0, speed=1.0, frame_type=Frame, record=None):
+        self.session_id = session_id
+        self.hub = hub
+        self.state = state
+        self.advance = advance
+        self.clock = SimulationClock(interval, speed)
+        self.frame_type = frame_type
+        self.record = record
+        self.tick = 0
+        self.frame = None
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        while True:
+            await self.clock.wait()
+            try:
+                self.state = await self.advance(self.state)
+            except Exception as e:
+                print(f"Session {self.session_id} Error: {e}")
+            else:
+                self.tick += 1
+                previous = self.frame.values if self.frame is not None else None
+                self.frame = self.frame_type(self.tick, self.state.values, self.clock.timestamp, previous)
+                self.hub.publish(self.session_id, self.frame)
+                if self.record is not None:
+                    try:
+                        self.record(self.session_id, self.frame)
+                    except Exception as e:
+                        print(f"Session {self.session_id} Record Error: {e}")
+
+
+class SessionManager:
+    """
+    Named simulation sessions. A session starts with its first subscriber and
+    stops when its last subscriber leaves.
+
+    `create_state()` returns the initial state of a new session and
+    `advance(state)` is the coroutine that runs one tick. Ticks are published
+    as `frame_type` (frames.FleetFrame for fleets) and handed to
+    `record(session_id, frame)` when given, e.g. to store them.
+    """
+
+    def __init__(self, hub, create_state, advance, interval=1.0, speed=1.0, frame_type=Frame, record=None):
+        self.hub = hub
+        self.create_state = create_state
+        self.advance = advance
+        self.interval = interval
+        self.speed = speed
+        self.frame_type = frame_type
+        self.record = record
+        SimulationClock(interval, speed)  # reject a bad tick rate now rather than on the first subscriber
+        self.sessions = {}
+
+    @asynccontextmanager
+    async def subscribe(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = SimulationSession(session_id, self.hub, self.create_state(), self.advance,
+                                        self.interval, self.speed, self.frame_type, self.record)
+            self.sessions[session_id] = session
+            session.start()
+
+        queue = self.hub.subscribe(session_id)
+        try:
+            yield queue
+        finally:
+            self.hub.unsubscribe(session_id, queue)
+            if self.hub.subscriber_count(session_id) == 0 and self.sessions.get(session_id) is session:
+                del self.sessions[session_id]
+                await session.stop()
+
+    async def stop_all(self):
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        for session in sessions:
+            await session.stop()
+
+    def snapshot(self):
+        return {
+            session_id: {"tick": session.tick, "subscribers": self.hub.subscriber_count(session_id),
+                         "clock": session.clock.snapshot()}
+            for session_id, session in self.sessions.items()
+        }
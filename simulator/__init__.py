@@ -0,0 +1,54 @@
+"""
+The satellite simulator as one importable package.
+
+    from simulator import initialize_attributes, apply_event, events, Fixes
+
+Importing the package does no work: each name is imported from its module
+on first access, so a consumer that only steps the simulation never loads
+the web server, pandas or sklearn, and the model is only read by
+ModelRegistry on its first prediction.
+
+The modules themselves stay at the repository root, where main.py, the
+benchmarks and the training scripts import them from; this package only
+re-exports them, so the root has to be importable (run from it, or put it
+on sys.path / PYTHONPATH).
+
+    python -m simulator     runs the console simulation
+"""
+import importlib
+
+# Public name -> module it lives in
+_EXPORTS = {
+    'ATTRIBUTES': 'batchSimulation',
+    'initialize_batch': 'batchSimulation',
+    'random_events': 'batchSimulation',
+    'apply_events': 'batchSimulation',
+    'SatelliteState': 'satelliteState',
+    'predict': 'satelliteState',
+    'events': 'mainfuncUsingPandas',
+    'initialize_attributes': 'mainfuncUsingPandas',
+    'apply_event': 'mainfuncUsingPandas',
+    'Fixes': 'fixes',
+    'ACTION_EFFECTS': 'fixes',
+    'DependentSolver': 'dependentAttributes',
+    'recalculate_dependent': 'dependentAttributes',
+    'ModelRegistry': 'modelRegistry',
+    'RuleEngine': 'ruleEngine',
+    'ACTIONS': 'ruleEngine',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cache it, later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,3 @@
+from mainfuncUsingPandas import main
+
+main()
@@ -0,0 +1,334 @@
+"""
+Append-only history of every tick, one stream per satellite, on disk.
+
+    telemetry/
+      sat-default/                  one directory per satellite (URL-quoted id)
+        seg-000000000000.bin        records of ticks 0 .. SEGMENT_RECORDS - 1
+        seg-000000065536.bin        ...
+
+A record is fixed width, RECORD: a float64 unix timestamp then the 10
+attributes as float32 in ATTRIBUTES order, 48 bytes. Record i of a stream
+is its tick i, so a tick range is an offset into the segment files, and a
+sparse index of every INDEX_STRIDE-th timestamp, kept in memory, narrows a
+time range down to one stride of records before a binary search in the file
+itself. Segments are memory-mapped for reads, so a query only touches the
+pages of the records it returns.
+
+Appends only queue the tick: one writer thread puts it in its satellite's
+buffer, and buffers are written FLUSH_RECORDS records at a time, so the
+caller (the event loop, for the simulation sessions) never waits on the
+disk. Queries wait for the appends made before them and flush their
+satellite first, so they always see every append.
+"""
+import os
+import queue
+import threading
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from batchSimulation import ATTRIBUTES
+
+RECORD = np.dtype([('timestamp', '<f8'), ('values', '<f4', (len(ATTRIBUTES),))])
+
+SEGMENT_RECORDS = 1 << 16  # 3 MiB segment files
+INDEX_STRIDE = 1024
+FLUSH_RECORDS = 256
+
+_PREFIX = 'sat-'
+
+
+def _segment_name(first_tick):
+    return f'seg-{first_tick:012d}.bin'
+
+
+class _Stream:
+    """Segments, sparse time index and write buffer of one satellite."""
+
+    def __init__(self, directory, segment_records, index_stride, flush_records):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.index_stride = index_stride
+        self.buffer = np.empty(flush_records, dtype=RECORD)
+        self.pending = 0
+        # Records on disk, the next tick is stored + pending
+        self.stored = 0
+        self.index = []  # timestamps of ticks 0, index_stride, 2 * index_stride, ...
+        self.last_timestamp = -np.inf
+        self._maps = {}  # segment number -> (records, memmap) of a full or partial segment
+        # Held by the writer while it appends and by queries while they flush
+        # and find their segments; records are copied out without it
+        self.lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith('seg-'))
+        for number, name in enumerate(names):
+            path = os.path.join(self.directory, name)
+            records = os.path.getsize(path) // RECORD.itemsize
+            if records * RECORD.itemsize != os.path.getsize(path):
+                # A write that was cut off, the partial record is dropped
+                with open(path, 'r+b') as f:
+                    f.truncate(records * RECORD.itemsize)
+            self.stored = number * self.segment_records + records
+        if self.stored:
+            timestamps = self.read(0, self.stored, step=self.index_stride)['timestamp']
+            self.index = timestamps.tolist()
+            self.last_timestamp = self.read(self.stored - 1, self.stored)['timestamp'][0]
+
+    @property
+    def count(self):
+        return self.stored + self.pending
+
+    def append(self, timestamp, values):
+        # Keeps the time index sorted: a restarted session that plays faster
+        # than real time can start behind the last recorded tick
+        timestamp = max(timestamp, self.last_timestamp)
+        tick = self.count
+        if tick % self.index_stride == 0:
+            self.index.append(timestamp)
+        self.buffer[self.pending] = (timestamp, values)
+        self.pending += 1
+        self.last_timestamp = timestamp
+        if self.pending == len(self.buffer):
+            self.flush()
+        return tick
+
+    def flush(self):
+        written = 0
+        while written < self.pending:
+            number, offset = divmod(self.stored, self.segment_records)
+            n = min(self.pending - written, self.segment_records - offset)
+            with open(os.path.join(self.directory, _segment_name(number * self.segment_records)), 'ab') as f:
+                f.write(self.buffer[written:written + n].tobytes())
+            self._maps.pop(number, None)
+            self.stored += n
+            written += n
+        self.pending = 0
+
+    def _segment(self, number):
+        """Memory map of a segment, reopened while it is still being appended to."""
+        records = min(self.segment_records, self.stored - number * self.segment_records)
+        cached = self._maps.get(number)
+        if cached is None or cached[0] != records:
+            path = os.path.join(self.directory, _segment_name(number * self.segment_records))
+            cached = (records, np.memmap(path, dtype=RECORD, mode='r', shape=(records,)))
+            self._maps[number] = cached
+        return cached[1]
+
+    def _views(self, start, stop, step=1):
+        """Memory-mapped slices of ticks start, start + step, ... below stop, with the lock held."""
+        views = []
+        tick = start
+        while tick < stop:
+            number, offset = divmod(tick, self.segment_records)
+            segment_stop = min(stop - number * self.segment_records, self.segment_records)
+            views.append(self._segment(number)[offset:segment_stop:step])
+            # First tick of the next segment on the same step grid
+            tick += -(-(segment_stop - offset) // step) * step
+        return views
+
+    def read(self, start, stop, step=1, locked=False):
+        """
+        Records of stored ticks start, start + step, ... below stop, copied out
+        of the segments. Takes the lock only to find them unless `locked`.
+        """
+        if step < 1:
+            raise ValueError(f"step must be at least 1, got {step}")
+        if locked:
+            views = self._views(start, stop, step)
+        else:
+            with self.lock:
+                views = self._views(start, stop, step)
+        # Stored records never change, so the copy can run alongside appends
+        if not views:
+            return np.empty(0, dtype=RECORD)
+        return np.concatenate([np.array(view) for view in views])
+
+    def gather(self, ticks):
+        """Records of arbitrary stored ticks (any shape), reading only their pages."""
+        ticks = np.asarray(ticks, dtype=np.int64)
+        records = np.empty(ticks.shape, dtype=RECORD)
+        numbers, offsets = np.divmod(ticks, self.segment_records)
+        unique = np.unique(numbers)
+        with self.lock:
+            segments = [self._segment(int(number)) for number in unique]
+        for number, segment in zip(unique, segments):
+            in_segment = numbers == number
+            records[in_segment] = segment[offsets[in_segment]]
+        return records
+
+    def tick_at(self, timestamp, side='left'):
+        """
+        First tick with timestamp >= `timestamp` ('left') or > `timestamp`
+        ('right'), with the lock held and the buffer flushed.
+        """
+        block = np.searchsorted(self.index, timestamp, side) - 1
+        if block < 0:
+            return 0
+        start = block * self.index_stride
+        stop = min(start + self.index_stride, self.stored)
+        timestamps = self.read(start, stop, locked=True)['timestamp']
+        return start + int(np.searchsorted(timestamps, timestamp, side))
+
+
+class TelemetryStore:
+    """
+    Telemetry history under `directory`, one stream per satellite id (any
+    string, e.g. a session id or 'fleet-17'). Safe to use from several
+    threads; one process should write a directory at a time. close() writes
+    out what is still buffered and stops the writer thread.
+    """
+
+    def __init__(self, directory='telemetry', segment_records=SEGMENT_RECORDS, index_stride=INDEX_STRIDE,
+                 flush_records=FLUSH_RECORDS):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.index_stride = index_stride
+        self.flush_records = flush_records
+        self._streams = {}
+        self._lock = threading.Lock()  # only guards _streams
+        # Appends waiting for the writer thread, numbered in submission order
+        self._queue = queue.SimpleQueue()
+        self._applied = threading.Condition()
+        self._submitted_count = 0
+        self._applied_count = 0
+        self._writer = None
+        os.makedirs(directory, exist_ok=True)
+
+    def satellites(self):
+        names = {unquote(name[len(_PREFIX):]) for name in os.listdir(self.directory) if name.startswith(_PREFIX)}
+        with self._lock:
+            return sorted(names | set(self._streams))
+
+    def _stream(self, satellite, create=False):
+        with self._lock:
+            stream = self._streams.get(satellite)
+            if stream is None:
+                directory = os.path.join(self.directory, _PREFIX + quote(str(satellite), safe=''))
+                if not create and not os.path.isdir(directory):
+                    raise KeyError(satellite)
+                stream = _Stream(directory, self.segment_records, self.index_stride, self.flush_records)
+                self._streams[satellite] = stream
+            return stream
+
+    def _submit(self, item):
+        with self._applied:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write, name='telemetry-writer', daemon=True)
+                self._writer.start()
+            self._submitted_count += 1
+            self._queue.put(item)
+
+    def _write(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            satellites, values, timestamp = item
+            try:
+                for satellite, row in zip(satellites, values):
+                    stream = self._stream(satellite, create=True)
+                    with stream.lock:
+                        stream.append(timestamp, row)
+            except Exception as e:
+                print(f"Telemetry Write Error: {e}")
+            with self._applied:
+                self._applied_count += 1
+                self._applied.notify_all()
+
+    def _wait(self):
+        """Blocks until every append submitted before this call is in its stream."""
+        with self._applied:
+            submitted = self._submitted_count
+            self._applied.wait_for(lambda: self._applied_count >= submitted)
+
+    def append(self, satellite, values, timestamp):
+        """Queues the next tick of `satellite`, stored by the writer thread."""
+        self._submit(([satellite], np.array(values, dtype=np.float32, ndmin=2), timestamp))
+
+    def append_many(self, satellites, values, timestamp):
+        """One tick of many satellites: `values` is (len(satellites), 10), row i for satellites[i]."""
+        self._submit((satellites, np.array(values, dtype=np.float32), timestamp))
+
+    def flush(self):
+        """Writes every append made so far to the segment files."""
+        self._wait()
+        with self._lock:
+            streams = list(self._streams.values())
+        for stream in streams:
+            with stream.lock:
+                stream.flush()
+
+    def close(self):
+        """Flushes and stops the writer thread; a later append starts a new one."""
+        with self._applied:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._queue.put(None)
+        if writer is not None:
+            writer.join()
+        self.flush()
+
+    def _synced(self, satellite):
+        """The stream of `satellite` with every earlier append flushed, KeyError if it has none."""
+        self._wait()
+        stream = self._stream(satellite)
+        with stream.lock:
+            stream.flush()
+        return stream
+
+    def count(self, satellite):
+        """Number of ticks stored for `satellite`, 0 if there are none."""
+        self._wait()
+        try:
+            stream = self._stream(satellite)
+        except KeyError:
+            return 0
+        with stream.lock:
+            return stream.count
+
+    def tick_range(self, satellite, start=None, stop=None, by='tick'):
+        """
+        [first, last) ticks of a window given by tick numbers (by='tick') or
+        by unix timestamps (by='time', start inclusive, stop exclusive).
+        None leaves that side of the window open.
+        """
+        if by not in ('tick', 'time'):
+            raise ValueError(f"unknown window unit {by!r}, expected 'tick' or 'time'")
+        self._wait()
+        stream = self._stream(satellite)
+        with stream.lock:
+            stream.flush()
+            if by == 'time':
+                first = 0 if start is None else stream.tick_at(start)
+                last = stream.count if stop is None else stream.tick_at(stop)
+            else:
+                first = 0 if start is None else max(0, int(start))
+                last = stream.count if stop is None else min(stream.count, int(stop))
+            return first, max(first, last)
+
+    def window(self, satellite, start=None, stop=None, by='tick'):
+        """
+        Every record of a window (see tick_range) as (ticks, RECORD array).
+        Raises KeyError for a satellite with no history.
+        """
+        first, last = self.tick_range(satellite, start, stop, by)
+        return np.arange(first, last), self._stream(satellite).read(first, last)
+
+    def timestamps(self, satellite, ticks):
+        """Timestamps of the given ticks of `satellite`, in the same shape."""
+        return self._synced(satellite).gather(ticks)['timestamp']
+
+    def series(self, satellite, start=None, stop=None, by='tick', points=None):
+        """
+        Like window, but a window of more than `points` records is thinned to
+        every n-th record, and only those are read from disk. Raises
+        ValueError when points is below 1.
+        """
+        if points is not None and points < 1:
+            raise ValueError(f"points must be at least 1, got {points}")
+        first, last = self.tick_range(satellite, start, stop, by)
+        step = 1 if not points or last - first <= points else -(-(last - first) // points)
+        return np.arange(first, last, step), self._stream(satellite).read(first, last, step)
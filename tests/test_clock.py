@@ -0,0 +1,94 @@
+"""
+SimulationClock (clock.py) on a fake monotonic clock: deadlines at start +
+n * interval without drift, overruns and missed ticks counted, speed 0
+never sleeping, and bad arguments rejected.
+"""
+import asyncio
+
+import pytest
+
+import clock
+from clock import MAX_TICK_RATE, SimulationClock
+
+
+class FakeTime:
+    """Stands in for time.monotonic / time.time and asyncio.sleep; `work` advances it like a tick's work."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1700000000.0 + self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(clock.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(clock.time, 'time', fake.time)
+    monkeypatch.setattr(clock.asyncio, 'sleep', fake.sleep)
+    return fake
+
+
+def _run(sim, fake, work):
+    # One wait per entry of `work`, each followed by that much tick work; returns when each tick started
+    async def ticks():
+        started = []
+        for seconds in work:
+            await sim.wait()
+            started.append(fake.now)
+            fake.work(seconds)
+        return started
+    return asyncio.run(ticks())
+
+
+def test_fixed_timestep_does_not_drift(fake):
+    sim = SimulationClock(interval=0.5)
+    started = _run(sim, fake, [0.1, 0.3, 0.0, 0.45, 0.2])
+    assert started == pytest.approx([100.0, 100.5, 101.0, 101.5, 102.0])
+    assert (sim.ticks, sim.overruns, sim.missed) == (5, 0, 0)
+
+
+def test_overrun_skips_missed_deadlines(fake):
+    sim = SimulationClock(interval=1.0)
+    # The second tick works until 103.5: the tick due at 102 starts 1.5 s
+    # late, the one due at 103 is skipped and the next runs on time at 104
+    started = _run(sim, fake, [0.0, 2.5, 0.0, 0.0])
+    assert started == pytest.approx([100.0, 101.0, 103.5, 104.0])
+    assert sim.overruns == 1
+    assert sim.missed == 1
+    assert sim.ticks == 4
+    assert sim.snapshot()["max_lateness_ms"] == pytest.approx(1500)
+
+
+def test_speed_scales_wall_interval(fake):
+    sim = SimulationClock(interval=1.0, speed=10)
+    started = _run(sim, fake, [0.0] * 4)
+    assert started == pytest.approx([100.0, 100.1, 100.2, 100.3])
+    # Timestamps follow simulated time, one interval per tick
+    assert sim.timestamp == pytest.approx(1700000100.0 + 3.0)
+
+
+def test_speed_zero_never_sleeps(fake):
+    sim = SimulationClock(interval=1.0, speed=0)
+    _run(sim, fake, [0.2] * 5)
+    assert fake.sleeps == [0] * 5
+    assert (sim.ticks, sim.overruns, sim.missed) == (5, 0, 0)
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        SimulationClock(interval=0.5 / MAX_TICK_RATE)
+    with pytest.raises(ValueError):
+        SimulationClock(speed=-1)
@@ -0,0 +1,133 @@
+"""
+Downsampling (downsample.py): minmax and lttb against straightforward
+reference versions, Downsampler.extrema through the rollup tiers against a
+brute-force scan of the records, and the points checks of /telemetry.
+"""
+import sys
+
+import numpy as np
+import pytest
+
+from downsample import Downsampler, lttb, minmax
+from telemetryStore import TelemetryStore
+
+
+def reference_lttb(x, y, points):
+    # One column, bucket by bucket, as in the original LTTB description
+    n = len(y)
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(int) + 1
+    edges[-1] = n - 1
+    picked = [0]
+    for i in range(points - 2):
+        a = picked[-1]
+        if i < points - 3:
+            xc, yc = x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            xc, yc = x[-1], y[-1]
+        areas = [abs((x[a] - xc) * (y[b] - y[a]) - (x[a] - x[b]) * (yc - y[a])) for b in range(edges[i], edges[i + 1])]
+        picked.append(edges[i] + int(np.argmax(areas)))
+    return picked + [n - 1]
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 1, (1000, 3))
+    x = np.arange(1000) * 2
+    xs, ys = minmax(x, y, 30)
+    width = -(-1000 // 30)
+    assert xs.shape == ys.shape == (60, 3)
+    for column in range(3):
+        for bucket in range(30):
+            part = y[bucket * width:(bucket + 1) * width, column]
+            pair = ys[2 * bucket:2 * bucket + 2, column]
+            assert sorted(pair) == [part.min(), part.max()]
+        # Real points, in order
+        np.testing.assert_array_equal(y[xs[:, column] // 2, column], ys[:, column])
+        assert (np.diff(xs[:, column]) >= 0).all()
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(1)
+    y = np.cumsum(rng.normal(0, 1, (500, 4)), axis=0)
+    x = np.arange(500)
+    xs, ys = lttb(x, y, 40)
+    assert xs.shape == (40, 4)
+    for column in range(4):
+        picked = reference_lttb(x.astype(float), y[:, column], 40)
+        assert xs[:, column].tolist() == picked
+        np.testing.assert_array_equal(ys[:, column], y[picked, column])
+
+
+def test_short_and_empty_series():
+    y = np.arange(20.0).reshape(10, 2)
+    xs, ys = lttb(np.arange(10), y, 10)
+    np.testing.assert_array_equal(ys, y)
+    for xs, ys in (minmax(np.empty(0), np.empty((0, 2)), 4), lttb(np.empty(0), np.empty((0, 2)), 4)):
+        assert xs.shape == ys.shape == (0, 2)
+    with pytest.raises(ValueError):
+        lttb(np.arange(10), y, 2)
+
+
+@pytest.fixture(scope='module')
+def history(tmp_path_factory):
+    store = TelemetryStore(str(tmp_path_factory.mktemp('history')), segment_records=500, index_stride=64,
+                           flush_records=128)
+    rng = np.random.default_rng(2)
+    # Integer steps, so extremes tie and the first tick of each one counts
+    values = np.cumsum(rng.integers(-3, 4, (3000, 10)), axis=0).astype(np.float32)
+    for tick, row in enumerate(values):
+        store.append('sat', row, 1000.0 + tick)
+    store.flush()
+    yield store, values
+    store.close()
+
+
+@pytest.mark.parametrize('first, last', [(0, 3000), (5, 2999), (777, 2100), (1000, 1003)])
+@pytest.mark.parametrize('width', [3, 16, 64, 128])
+def test_extrema_match_brute_force(history, first, last, width):
+    store, values = history
+    # Small tiers and chunks, so windows cross chunk edges and ragged ends
+    downsampler = Downsampler(store, tiers=(4, 16, 64), chunk=8, cache_chunks=4)
+    for _ in range(2):  # cold, then through the cache
+        at_min, mins, at_max, maxs = downsampler.extrema('sat', first, last, width)
+        buckets = [(max(start, first), min(start + width, last))
+                   for start in range(first // width * width, last, width)]
+        assert len(mins) == len(buckets)
+        for row, (lo, hi) in enumerate(buckets):
+            part = values[lo:hi]
+            np.testing.assert_array_equal(mins[row], part.min(axis=0))
+            np.testing.assert_array_equal(maxs[row], part.max(axis=0))
+            np.testing.assert_array_equal(at_min[row], lo + part.argmin(axis=0))
+            np.testing.assert_array_equal(at_max[row], lo + part.argmax(axis=0))
+
+
+def test_query_keeps_the_window_extremes(history):
+    store, values = history
+    ticks, timestamps, ys = Downsampler(store, tiers=(4, 16, 64), chunk=8).query('sat', 100, 2900, points=50,
+                                                                                  method='minmax')
+    np.testing.assert_array_equal(values[ticks, np.arange(10)], ys)
+    np.testing.assert_array_equal(timestamps, 1000.0 + ticks)
+    np.testing.assert_array_equal(ys.min(axis=0), values[100:2900].min(axis=0))
+    np.testing.assert_array_equal(ys.max(axis=0), values[100:2900].max(axis=0))
+
+
+@pytest.mark.parametrize('method, points, status', [
+    ('stride', -1, 400), ('stride', 0, 400), ('stride', 1, 200),
+    ('minmax', 1, 400), ('minmax', 2, 200),
+    ('lttb', 2, 400), ('lttb', 3, 200),
+])
+def test_endpoint_validates_points_for_every_method(tmp_path, monkeypatch, method, points, status):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setenv('TELEMETRY_DIR', str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'main', raising=False)
+    import main
+    try:
+        for tick in range(20):
+            main.telemetry.append('a', np.full(10, tick), 1000.0 + tick)
+        response = TestClient(main.app).get('/telemetry/a', params={'points': points, 'method': method})
+        assert response.status_code == status
+    finally:
+        main.telemetry.close()
+        main.pool.shutdown()
+        sys.modules.pop('main', None)
@@ -0,0 +1,34 @@
+"""
+FlatForest (fastForest.py) against the sklearn models it is flattened from:
+the same predict_proba to the last bit and the same predict, for one
+forest per action and for a native multi-output forest, also after a
+save_arrays / load_arrays round trip.
+"""
+import numpy as np
+import pytest
+
+from fastForest import FlatForest
+from train import build_model
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 100, (600, 10))
+    # Noisy labels, so leaves hold mixed classes and probabilities tie now and then
+    Y = (X[:, np.arange(11) % 10] + rng.normal(0, 20, (600, 11)) > 50).astype(np.int64)
+    X_test = np.round(rng.uniform(0, 100, (500, 10)), 2)
+    return X, Y, X_test
+
+
+@pytest.mark.parametrize('kind', ['multioutput', 'forest'])
+def test_matches_sklearn(data, kind, tmp_path):
+    X, Y, X_test = data
+    model = build_model(kind, n_estimators=15, tree_jobs=1, seed=1).fit(X, Y)
+    flat = FlatForest.from_model(model)
+    flat.save_arrays(str(tmp_path))
+    for forest in (flat, FlatForest.load_arrays(str(tmp_path))):
+        proba = forest.predict_proba(X_test)
+        for output, expected in enumerate(model.predict_proba(X_test)):
+            np.testing.assert_array_equal(proba[:, output, :expected.shape[1]], expected)
+        np.testing.assert_array_equal(forest.predict(X_test), model.predict(X_test))
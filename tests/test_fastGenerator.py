@@ -0,0 +1,25 @@
+"""
+The vectorized dataset generator ("model Training/fastGenerator.py") against
+the loop it replaced (v5.py): same seed, same rows.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model Training'))
+
+import fastGenerator
+
+
+@pytest.mark.parametrize('seed', [0, 42, 2024])
+def test_matches_v5_for_the_same_seed(seed):
+    fastGenerator.check_equivalence(num_samples=300, seed=seed)
+
+
+def test_seeded_batches_repeat():
+    first = fastGenerator.generate_satellite_dataset(200, rng=np.random.default_rng(7))
+    second = fastGenerator.generate_satellite_dataset(200, rng=np.random.default_rng(7))
+    assert len(first) == 200
+    assert first.equals(second)
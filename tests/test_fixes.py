@@ -0,0 +1,30 @@
+"""
+Fixes.apply_fixes_batch (fixes.py) against the per-session apply_fixes:
+with the same random amounts every row ends up at the same values.
+"""
+import numpy as np
+import pytest
+
+import fixes
+from batchSimulation import ATTRIBUTES
+from fixes import ACTION_EFFECTS, RANDOM_EFFECTS, Fixes
+from satelliteState import SatelliteState
+
+
+@pytest.mark.parametrize('draw', [0.0, 0.37, 0.999])
+def test_batch_matches_apply_fixes(draw, monkeypatch, capsys):
+    rng = np.random.default_rng(1)
+    # Three decimals, so rounding once at the end and after every action
+    # can land on different sides of a tie
+    states = np.round(rng.uniform(-10, 110, (2000, len(ATTRIBUTES))), 3)
+    inputs = (rng.random((2000, len(ACTION_EFFECTS))) < 0.3).astype(np.int64)
+    # Rows no action touches keep their values, as apply_fixes leaves them
+    inputs[::10] = 0
+    # The same amount in both paths: the batch maps a draw u to low + floor(u * (high - low + 1))
+    monkeypatch.setattr(fixes.random, 'randint', lambda low, high: low + int(draw * (high - low + 1)))
+
+    batch = Fixes().apply_fixes_batch(states.copy(), inputs, uniforms=np.full((2000, len(RANDOM_EFFECTS)), draw))
+    for row, (state, actions) in enumerate(zip(states, inputs)):
+        single = Fixes().apply_fixes(SatelliteState(state.copy()), actions[None, :])
+        np.testing.assert_array_equal(batch[row], single.values)
+    capsys.readouterr()
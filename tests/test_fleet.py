@@ -0,0 +1,111 @@
+"""
+/fleet (fleet.py, frames.FleetFrame): binary and json fleet frames decoded
+back for a view's satellites and attributes, the ?reduce=minmax message,
+and the query parameters parsed or rejected.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from batchSimulation import ATTRIBUTES
+from fleet import FleetExtrema, FleetView, _parse_ids, parse_view
+from frames import FLEET_HEADER, FleetFrame, decode_fleet
+
+
+@pytest.fixture
+def frame():
+    values = np.random.default_rng(0).uniform(0, 100, (20, len(ATTRIBUTES)))
+    return FleetFrame(42, values, timestamp=1700000000.5)
+
+
+def test_binary_round_trip_whole_fleet(frame):
+    view = FleetView(format='binary')
+    payload = frame.encode_view(view)
+    assert len(payload) == FLEET_HEADER.size + 20 * 4 + 20 * len(ATTRIBUTES) * 4
+
+    seq, timestamp, ids, rows = decode_fleet(payload)
+    assert (seq, timestamp) == (42, 1700000000.5)
+    assert ids == list(range(20))
+    for i in ids:
+        assert list(rows[i]) == list(ATTRIBUTES)
+        assert list(rows[i].values()) == frame.values[i].astype(np.float32).tolist()
+
+
+def test_binary_round_trip_view(frame):
+    view = parse_view(20, satellites='3,7-9', attributes='Temperature,Battery_Level', format='binary')
+    seq, timestamp, ids, rows = decode_fleet(frame.encode_view(view))
+    assert ids == [3, 7, 8, 9]
+    columns = [ATTRIBUTES.index('Battery_Level'), ATTRIBUTES.index('Temperature')]
+    for i in ids:
+        # Attributes come back in ATTRIBUTES order, whatever order they were asked for in
+        assert list(rows[i]) == [ATTRIBUTES[c] for c in columns]
+        assert list(rows[i].values()) == frame.values[i, columns].astype(np.float32).tolist()
+
+
+def test_json_view(frame):
+    view = parse_view(20, satellites='0-1', attributes='Temperature')
+    message = json.loads(frame.encode_view(view))
+    assert message["seq"] == 42
+    assert message["attributes"] == ['Temperature']
+    assert message["ids"] == [0, 1]
+    assert message["rows"] == frame.values[:2, [ATTRIBUTES.index('Temperature')]].tolist()
+
+
+def test_view_encoded_once_per_frame(frame):
+    first = FleetView([1, 2], [0, 3], 'binary')
+    second = FleetView([1, 2], [0, 3], 'binary')
+    assert frame.encode_view(first) is frame.encode_view(second)
+    assert frame.encode_view(first) != frame.encode_view(FleetView([1, 2], [0, 4], 'binary'))
+
+
+def test_minmax_round_trip():
+    rng = np.random.default_rng(1)
+    view = FleetView([2, 5], [0, 4, 9], 'binary', reduce='minmax')
+    extrema = FleetExtrema()
+    ticks = [rng.uniform(0, 100, (8, len(ATTRIBUTES))) for _ in range(4)]
+    for values in ticks:
+        extrema.add(view.select(values)[1])
+    mins, maxs = extrema.take()
+    assert extrema.take() == (None, None)
+
+    frame = FleetFrame(3, ticks[-1], timestamp=0.0)
+    seq, _, ids, rows = decode_fleet(frame.encode_extrema(view, mins, maxs))
+    assert seq == 3
+    assert ids == [2, 5]
+    stacked = np.stack(ticks)
+    for i in ids:
+        assert list(rows[i]) == [ATTRIBUTES[c] for c in view.columns]
+        for c in view.columns:
+            low, high = rows[i][ATTRIBUTES[c]]
+            assert low == np.float32(stacked[:, i, c].min())
+            assert high == np.float32(stacked[:, i, c].max())
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('5', [5]),
+    ('0-3', [0, 1, 2, 3]),
+    ('7, 1-2,2,9-9', [1, 2, 7, 9]),
+    ('0-99', list(range(100))),
+])
+def test_parse_ids(text, expected):
+    assert _parse_ids(text, 100) == expected
+
+
+@pytest.mark.parametrize('text', ['100', '5-3', '-1', '0-100', 'a', '1-b', '', '0-10000000000000'])
+def test_parse_ids_rejects(text):
+    with pytest.raises(ValueError):
+        _parse_ids(text, 100)
+
+
+def test_parse_view_rejects():
+    with pytest.raises(ValueError, match='bad satellites'):
+        parse_view(10, satellites='0-10')
+    with pytest.raises(ValueError, match='unknown attributes Fuel'):
+        parse_view(10, attributes='Temperature,Fuel')
+    with pytest.raises(ValueError):
+        parse_view(10, format='delta')
+    with pytest.raises(ValueError):
+        parse_view(10, reduce='mean')
+    with pytest.raises(ValueError):
+        parse_view(10, every=0)
@@ -0,0 +1,120 @@
+"""
+Wire formats of frames.py, which the nebula and index.html decoders mirror:
+the 52-byte binary frame packed and read back, and a 'delta' stream with
+its keyframes and gaps decoded back to every tick's values.
+"""
+import numpy as np
+import pytest
+
+from batchSimulation import ATTRIBUTES
+from frames import (BINARY_LAYOUT, DELTA, DELTA_HEADER, KEYFRAME, KEYFRAME_INTERVAL, DeltaStream, Frame,
+                    connection_encoder, decode_binary, decode_delta)
+
+
+def _values(seed=0):
+    return np.random.default_rng(seed).uniform(0, 100, len(ATTRIBUTES))
+
+
+def test_binary_round_trip():
+    values = _values()
+    payload = Frame(7, values, timestamp=1700000000.25).encode('binary')
+    assert isinstance(payload, bytes)
+    assert len(payload) == BINARY_LAYOUT.size == 52
+
+    seq, timestamp, record = decode_binary(payload)
+    assert seq == 7
+    assert timestamp == 1700000000.25
+    assert list(record) == list(ATTRIBUTES)
+    assert list(record.values()) == values.astype(np.float32).tolist()
+
+
+def test_binary_seq_wraps_to_uint32():
+    payload = Frame(2 ** 32 + 5, _values(), timestamp=0.0).encode('binary')
+    assert decode_binary(payload)[0] == 5
+
+
+def test_each_format_encoded_once():
+    frame = Frame(1, _values())
+    assert frame.encode('binary') is frame.encode('binary')
+    assert frame.encode('json') is frame.encode('json')
+    assert connection_encoder('binary')(frame) is frame.encode('binary')
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        Frame(1, _values()).encode('xml')
+    with pytest.raises(ValueError):
+        connection_encoder('xml')
+
+
+def _ticks(count, seed=0):
+    # Each tick changes a few attributes of the one before, like the simulation
+    rng = np.random.default_rng(seed)
+    values = [rng.uniform(0, 100, len(ATTRIBUTES))]
+    for _ in range(count - 1):
+        tick = values[-1].copy()
+        changed = rng.random(len(ATTRIBUTES)) < 0.3
+        tick[changed] += rng.normal(0, 5, changed.sum())
+        values.append(tick)
+    return values
+
+
+def _frames(values):
+    frames, previous = [], None
+    for seq, tick in enumerate(values):
+        frames.append(Frame(seq, tick, timestamp=1000.0 + seq, previous=previous))
+        previous = tick
+    return frames
+
+
+def test_delta_round_trip():
+    values = _ticks(35)
+    stream = DeltaStream()
+    record = None
+    kinds = []
+    for frame, tick in zip(_frames(values), values):
+        payload = stream.encode(frame)
+        kinds.append(DELTA_HEADER.unpack_from(payload)[0])
+        seq, timestamp, record = decode_delta(payload, record)
+        assert (seq, timestamp) == (frame.seq, frame.timestamp)
+        assert list(record.values()) == tick.astype(np.float32).tolist()
+
+    # First frame, then every KEYFRAME_INTERVAL ticks, is a keyframe
+    assert [seq for seq, kind in enumerate(kinds) if kind == KEYFRAME] == list(range(0, 35, KEYFRAME_INTERVAL))
+    assert kinds.count(DELTA) == 35 - 4
+
+
+def test_delta_sends_only_changed_attributes():
+    values = np.arange(len(ATTRIBUTES), dtype=np.float64)
+    changed = values.copy()
+    changed[[1, 4]] += 0.5
+    payload = Frame(1, changed, timestamp=0.0, previous=values).encode('delta')
+    assert len(payload) == DELTA_HEADER.size + 2 + 2 * 4
+
+    _, _, record = decode_delta(payload, dict(zip(ATTRIBUTES, values.tolist())))
+    assert list(record.values()) == changed.tolist()
+
+
+def test_delta_keyframe_after_gap():
+    values = _ticks(8, seed=1)
+    frames = _frames(values)
+    stream = DeltaStream()
+    _, _, record = decode_delta(stream.encode(frames[0]))
+    # Ticks 1-4 dropped for a slow viewer: the next message must stand on its own
+    payload = stream.encode(frames[5])
+    assert DELTA_HEADER.unpack_from(payload)[0] == KEYFRAME
+    _, _, record = decode_delta(payload, record)
+    assert list(record.values()) == values[5].astype(np.float32).tolist()
+    payload = stream.encode(frames[6])
+    assert DELTA_HEADER.unpack_from(payload)[0] == DELTA
+    _, _, record = decode_delta(payload, record)
+    assert list(record.values()) == values[6].astype(np.float32).tolist()
+
+
+def test_delta_shared_between_connections():
+    frames = _frames(_ticks(3))
+    first, second = DeltaStream(), DeltaStream()
+    for frame in frames[:2]:
+        first.encode(frame)
+        second.encode(frame)
+    assert first.encode(frames[2]) is second.encode(frames[2])
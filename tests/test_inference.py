@@ -0,0 +1,55 @@
+"""
+InferenceScheduler (inference.py): a batch closes as soon as max_batch_size
+rows are waiting, and otherwise max_wait after its first row.
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from inference import InferenceScheduler
+
+MAX_WAIT = 1.0
+
+
+class EchoModel:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, X):
+        self.batches.append(len(X))
+        return np.asarray(X)[:, :1].astype(np.int64)
+
+
+async def _predict_all(rows, max_batch_size):
+    model = EchoModel()
+    scheduler = InferenceScheduler(model, max_batch_size=max_batch_size, max_wait=MAX_WAIT)
+    scheduler.start()
+    start = time.perf_counter()
+    try:
+        tasks = []
+        for i in range(rows):
+            tasks.append(asyncio.create_task(scheduler.predict(np.full(10, i, dtype=np.float64))))
+            # Lets the scheduler take the first row before the others arrive
+            await asyncio.sleep(0.01)
+        done, _ = await asyncio.wait(tasks, timeout=MAX_WAIT / 2)
+        elapsed = time.perf_counter() - start
+        results = [task.result() for task in done]
+        await asyncio.gather(*tasks)
+    finally:
+        await scheduler.stop()
+    return model.batches, results, elapsed
+
+
+def test_full_batch_dispatches_without_waiting():
+    batches, results, elapsed = asyncio.run(_predict_all(4, max_batch_size=4))
+    assert batches == [4]
+    assert len(results) == 4
+    assert elapsed < MAX_WAIT / 2
+
+
+def test_rows_beyond_a_full_batch_wait_for_the_next_one():
+    batches, results, _ = asyncio.run(_predict_all(5, max_batch_size=4))
+    # The first four came back before max_wait, the fifth in a batch of its own after it
+    assert batches == [4, 1]
+    assert sorted(int(result[0, 0]) for result in results) == [0, 1, 2, 3]
@@ -0,0 +1,78 @@
+"""
+ModelRegistry / export_flat (modelRegistry.py): versioned flat exports
+behind the CURRENT pointer, re-exported when the pickle changes, with the
+version a starting process may still be opening left in place.
+"""
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import modelRegistry
+from modelRegistry import CURRENT, ModelRegistry, current_export, export_flat
+from train import build_model
+
+
+def fit(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 100, (200, 10))
+    Y = (X[:, np.arange(11) % 10] + rng.normal(0, 20, (200, 11)) > 50).astype(np.int64)
+    return build_model('forest', n_estimators=5, tree_jobs=1, seed=seed).fit(X, Y)
+
+
+def save(model, path):
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+
+
+@pytest.fixture
+def X():
+    return np.random.default_rng(9).uniform(0, 100, (50, 10))
+
+
+def test_registry_exports_and_predicts_like_the_model(tmp_path, X):
+    model_path = str(tmp_path / 'model.pkl')
+    model = fit(0)
+    save(model, model_path)
+    registry = ModelRegistry(model_path)
+    np.testing.assert_array_equal(registry.predict(X), model.predict(X))
+    current = current_export(str(tmp_path / 'model_flat'))
+    assert os.path.isfile(os.path.join(current, 'meta.json'))
+    # A second registry reuses the export instead of writing another one
+    assert ModelRegistry(model_path).get() is not None
+    assert current_export(str(tmp_path / 'model_flat')) == current
+
+
+def test_new_pickle_swaps_the_pointer_and_keeps_the_previous_version(tmp_path, X):
+    model_path = str(tmp_path / 'model.pkl')
+    directory = str(tmp_path / 'model_flat')
+    versions = []
+    for seed in range(3):
+        model = fit(seed)
+        save(model, model_path)
+        versions.append(export_flat(model_path))
+        assert current_export(directory) == versions[-1]
+        np.testing.assert_array_equal(ModelRegistry(model_path).predict(X), model.predict(X))
+    # The first version is gone, the one CURRENT pointed to before the last export is still there
+    assert not os.path.exists(versions[0])
+    assert os.path.isdir(versions[1])
+    assert sorted(os.listdir(directory)) == sorted([CURRENT] + [os.path.basename(v) for v in versions[1:]])
+
+
+def test_raises_instead_of_keeping_a_stale_export(tmp_path, monkeypatch):
+    model_path = str(tmp_path / 'model.pkl')
+    save(fit(0), model_path)
+    export_flat(model_path)
+    save(fit(1), model_path)
+    replace = os.replace
+
+    def failing_replace(source, target):
+        if os.path.basename(target) == CURRENT:
+            raise OSError("read-only")
+        replace(source, target)
+
+    monkeypatch.setattr(modelRegistry.os, 'replace', failing_replace)
+    with pytest.raises(RuntimeError):
+        ModelRegistry(model_path).get()
+    assert not [name for name in os.listdir(tmp_path / 'model_flat') if name.startswith('.')]
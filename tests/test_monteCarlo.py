@@ -0,0 +1,32 @@
+"""
+Monte Carlo runner (monteCarlo.py): a trajectory's path only depends on the
+seed and its number, and the histogram buckets match their edges.
+"""
+import numpy as np
+
+import monteCarlo
+
+
+def test_block_size_does_not_change_the_result():
+    results = [monteCarlo.run(300, 200, seed=7, workers=1, mode='rules', fix_success=0.4, block_size=size)
+               for size in (300, 64, 7)]
+    assert results[0].failures.sum() > 0
+    for result in results[1:]:
+        np.testing.assert_array_equal(result.failures, results[0].failures)
+
+
+def test_trajectory_does_not_depend_on_block_mates():
+    # Ten trajectories run one per block, and all in one block
+    apart = sum(monteCarlo.run_block(1234, first, 1, 300, mode='rules', fix_success=0.3) for first in range(10))
+    together = monteCarlo.run_block(1234, 0, 10, 300, mode='rules', fix_success=0.3)
+    assert apart.sum() > 0
+    np.testing.assert_array_equal(together, apart)
+
+
+def test_histogram_counts_match_integer_edges():
+    result = monteCarlo.run(200, 97, seed=3, workers=1, mode='rules', fix_success=0.3)
+    failures = result._rows(None)
+    counts, edges = result.histogram(bins=10)
+    assert edges.dtype.kind == 'i'
+    assert edges[0] == 0 and edges[-1] == result.ticks
+    assert counts.tolist() == [failures[lo:hi].sum() for lo, hi in zip(edges[:-1], edges[1:])]
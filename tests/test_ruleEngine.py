@@ -0,0 +1,51 @@
+"""
+RuleEngine (ruleEngine.py) against the labeler the model was trained on
+("model Training/ruleLabeler.py"), so the RULES copied into ruleEngine.py
+cannot drift from the labels; and which rows ever reach the model.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batchSimulation import ATTRIBUTES, TEMPERATURE
+from ruleEngine import ACTIONS, RuleEngine
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model Training'))
+
+import ruleLabeler
+
+
+def random_states(n, seed=0):
+    rng = np.random.default_rng(seed)
+    state = rng.uniform(0, 100, (n, len(ATTRIBUTES)))
+    state[:, TEMPERATURE] = rng.uniform(-40, 100, n)
+    state[:, ATTRIBUTES.index('Debris_Risk_Level')] = rng.uniform(0, 10, n)
+    # Values sitting exactly on every threshold
+    state[:n // 4] = state[:n // 4].round(0)
+    return state
+
+
+def test_rules_match_the_training_labels():
+    state = random_states(20000)
+    labels, _ = ruleLabeler.label_actions(pd.DataFrame(state, columns=ATTRIBUTES))
+    expected = labels[:, [ruleLabeler.actions.index(action) for action in ACTIONS]]
+    np.testing.assert_array_equal(RuleEngine('rules').predict(state), expected)
+
+
+class FailingModel:
+    def predict(self, X):
+        raise AssertionError("the model should not have been called")
+
+
+@pytest.mark.parametrize('mode', ['rules', 'model', 'hybrid'])
+def test_empty_batch_never_calls_the_model(mode):
+    assert RuleEngine(mode).combine(np.empty((0, len(ATTRIBUTES))), FailingModel()).shape == (0, len(ACTIONS))
+
+
+def test_rules_mode_never_calls_the_model():
+    state = random_states(100)
+    np.testing.assert_array_equal(RuleEngine('rules').combine(state, FailingModel()),
+                                  RuleEngine('rules').predict(state))
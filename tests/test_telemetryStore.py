@@ -0,0 +1,72 @@
+"""
+TelemetryStore (telemetryStore.py): appends read back by tick and by time,
+across segments and a reopen, and bad window arguments rejected.
+"""
+import sys
+
+import numpy as np
+import pytest
+
+from telemetryStore import TelemetryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(str(tmp_path), segment_records=64, index_stride=8, flush_records=16)
+    for tick in range(101):
+        store.append('a', np.full(10, tick, dtype=np.float32), 1000.0 + tick)
+    yield store
+    store.close()
+
+
+def test_window_by_tick_and_time(store):
+    ticks, records = store.window('a', 60, 70)
+    assert ticks.tolist() == list(range(60, 70))
+    assert records['values'][:, 0].tolist() == list(range(60, 70))
+    ticks, records = store.window('a', 1060.0, 1070.0, by='time')
+    assert ticks.tolist() == list(range(60, 70))
+    assert records['timestamp'].tolist() == [1000.0 + tick for tick in range(60, 70)]
+
+
+def test_series_thins_to_points(store):
+    ticks, records = store.series('a', points=10)
+    assert ticks.tolist() == list(range(0, 101, 11))
+    assert records['values'][:, 0].tolist() == ticks.tolist()
+
+
+@pytest.mark.parametrize('points', [0, -5])
+def test_series_rejects_points_below_one(store, points):
+    with pytest.raises(ValueError):
+        store.series('a', points=points)
+
+
+def test_reopen_keeps_every_tick(store, tmp_path):
+    store.append_many(['b', 'c'], np.ones((2, 10)), 2000.0)
+    store.close()
+    reopened = TelemetryStore(str(tmp_path), segment_records=64, index_stride=8, flush_records=16)
+    assert reopened.count('a') == 101
+    assert reopened.satellites() == ['a', 'b', 'c']
+    assert reopened.timestamps('a', [0, 100]).tolist() == [1000.0, 1100.0]
+
+
+def test_unknown_satellite(store):
+    assert store.count('missing') == 0
+    with pytest.raises(KeyError):
+        store.window('missing')
+
+
+def test_endpoint_rejects_negative_points(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setenv('TELEMETRY_DIR', str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'main', raising=False)
+    import main
+    try:
+        main.telemetry.append('a', np.zeros(10), 1000.0)
+        client = TestClient(main.app)
+        assert client.get('/telemetry/a', params={'points': -5}).status_code == 400
+        assert client.get('/telemetry/a', params={'points': 5}).status_code == 200
+    finally:
+        main.telemetry.close()
+        main.pool.shutdown()
+        sys.modules.pop('main', None)
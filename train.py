@@ -0,0 +1,135 @@
+"""
+Trains the action model, the scripted version of training.ipynb.
+
+    python train.py [--data issDockingadded.csv] [--model-kind multioutput|forest]
+                    [--output-jobs 1] [--tree-jobs -1] [--install]
+
+Every run writes a new versioned artifact, models/v<N>/model.pkl plus
+models/v<N>/metadata.json, and prints a fit-time and throughput report.
+--install also copies the model to model.pkl, the file the server loads.
+"""
+import argparse
+import datetime
+import json
+import os
+import pickle
+import shutil
+import time
+
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.multioutput import MultiOutputClassifier
+
+from datasetCache import file_hash, load_dataset
+
+MODELS_DIR = 'models'
+# multioutput: one forest per action, like training.ipynb
+# forest: a single RandomForestClassifier fitted on all 11 action columns
+MODEL_KINDS = ('multioutput', 'forest')
+
+
+def next_version(models_dir=MODELS_DIR):
+    versions = [int(name[1:]) for name in os.listdir(models_dir) if name.startswith('v') and name[1:].isdigit()] \
+        if os.path.isdir(models_dir) else []
+    return max(versions, default=0) + 1
+
+
+def build_model(kind='multioutput', n_estimators=100, output_jobs=1, tree_jobs=-1, seed=None):
+    """
+    kind='multioutput' is one forest per action: output_jobs fits that many of
+    the 11 forests at once (processes), tree_jobs builds the trees of each
+    forest in parallel (threads). kind='forest' is one forest whose trees
+    predict every action, so only tree_jobs applies.
+    """
+    forest = RandomForestClassifier(n_estimators=n_estimators, n_jobs=tree_jobs, random_state=seed)
+    if kind == 'forest':
+        return forest
+    if kind != 'multioutput':
+        raise ValueError(f"unknown model kind {kind!r}, expected one of {MODEL_KINDS}")
+    return MultiOutputClassifier(forest, n_jobs=output_jobs)
+
+
+def single_threaded(model):
+    """
+    Sets n_jobs back to 1 on a fitted model and the forests inside it, so the
+    saved pickle does not start a thread pool for every predict() it serves
+    (the server already batches rows and spreads them over its workers).
+    """
+    for estimator in [model, getattr(model, 'estimator', None), *getattr(model, 'estimators_', [])]:
+        if estimator is not None and hasattr(estimator, 'n_jobs'):
+            estimator.n_jobs = 1
+    return model
+
+
+def save_artifact(model, metadata, models_dir=MODELS_DIR):
+    model = single_threaded(model)
+    directory = os.path.join(models_dir, f"v{metadata['version']}")
+    os.makedirs(directory)
+    with open(os.path.join(directory, 'model.pkl'), 'wb') as f:
+        pickle.dump(model, f)
+    with open(os.path.join(directory, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return directory
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Train the multi-output action model")
+    parser.add_argument('--data', default='issDockingadded.csv')
+    parser.add_argument('--model-kind', choices=MODEL_KINDS, default='multioutput')
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--output-jobs', type=int, default=1, help="forests (actions) fitted in parallel")
+    parser.add_argument('--tree-jobs', type=int, default=-1, help="trees of one forest built in parallel")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--install', action='store_true', help="also copy the model to model.pkl")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    dataset = load_dataset(args.data)
+    load_seconds = time.perf_counter() - start
+
+    X_train, X_test, Y_train, Y_test = train_test_split(dataset.features_frame(), dataset.labels_frame(),
+                                                        test_size=args.test_size, random_state=args.seed)
+    model = build_model(args.model_kind, args.n_estimators, args.output_jobs, args.tree_jobs, args.seed)
+
+    start = time.perf_counter()
+    model.fit(X_train, Y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+    Y_test = Y_test.to_numpy()
+
+    metadata = {
+        'version': next_version(args.models_dir),
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'feature_names': dataset.feature_names,
+        'action_names': dataset.action_names,
+        'data': os.path.basename(args.data),
+        'data_sha256': file_hash(args.data),
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+        'model_kind': args.model_kind,
+        'n_estimators': args.n_estimators,
+        'output_jobs': args.output_jobs,
+        'tree_jobs': args.tree_jobs,
+        'seed': args.seed,
+        'fit_seconds': round(fit_seconds, 3),
+        'test_exact_match': float((predictions == Y_test).all(axis=1).mean()),
+        'test_action_accuracy': dict(zip(dataset.action_names, (predictions == Y_test).mean(axis=0).tolist())),
+        'sklearn_version': sklearn.__version__,
+    }
+    directory = save_artifact(model, metadata, args.models_dir)
+    if args.install:
+        shutil.copyfile(os.path.join(directory, 'model.pkl'), 'model.pkl')
+
+    trees = args.n_estimators * (len(dataset.action_names) if args.model_kind == 'multioutput' else 1)
+    print(f"Model v{metadata['version']} written to {directory}" + (", installed as model.pkl" if args.install else ""))
+    print(f"{'load':<10}{load_seconds * 1e3:>10.1f} ms  ({len(dataset)} rows)")
+    print(f"{'fit':<10}{fit_seconds:>10.2f} s   {len(X_train) / fit_seconds:>12,.0f} rows/s  "
+          f"{trees / fit_seconds:>8.1f} trees/s  (output_jobs={args.output_jobs}, tree_jobs={args.tree_jobs})")
+    print(f"{'predict':<10}{predict_seconds:>10.2f} s   {len(X_test) / predict_seconds:>12,.0f} rows/s")
+    print(f"{'test':<10}{metadata['test_exact_match']:>10.2%} exact match over {len(dataset.action_names)} actions")